@@ -0,0 +1,66 @@
+"""Benchmark overhead of processing a plug-in
+
+Measures the time taken per call to :func:`pyblish.plugin.process`
+of a plug-in doing nothing, which is dominated by the capture of
+its log records. Hosts typically have many loggers, which may be
+simulated with --loggers.
+
+Usage:
+    $ python benchmarks/capture.py --calls 10000 --loggers 1000
+
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pyblish.api
+import pyblish.plugin
+
+
+class Noop(pyblish.api.ContextPlugin):
+    order = pyblish.api.CollectorOrder
+
+    def process(self, context):
+        pass
+
+
+class Log(pyblish.api.ContextPlugin):
+    order = pyblish.api.CollectorOrder
+
+    def process(self, context):
+        self.log.info("Processing %s" % context)
+
+
+def measure(Plugin, calls):
+    context = pyblish.api.Context()
+    start = time.time()
+
+    for _ in range(calls):
+        pyblish.plugin.produce(Plugin, context)
+
+    return (time.time() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=10000)
+    parser.add_argument("--loggers", type=int, default=1000)
+    args = parser.parse_args()
+
+    # Loggers of other libraries in the host
+    for index in range(args.loggers):
+        logging.getLogger("library%d.module" % index).debug("Initialised")
+
+    print("Calls:      %d" % args.calls)
+    print("Loggers:    %d" % args.loggers)
+    print("No-op:      %.1fus" % (measure(Noop, args.calls) * 10 ** 6))
+    print("Logging:    %.1fus" % (measure(Log, args.calls) * 10 ** 6))
+
+
+if __name__ == "__main__":
+    main()
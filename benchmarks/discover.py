@@ -0,0 +1,116 @@
+"""Benchmark serial versus concurrent discovery
+
+Usage:
+    $ python benchmarks/discover.py --files 1000 --workers 16
+    $ python benchmarks/discover.py --latency 2  # Simulate network storage
+
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pyblish.api
+import pyblish.plugin
+import pyblish.discovery
+
+TEMPLATE = """\
+import pyblish.api
+
+
+class Validate{index}(pyblish.api.InstancePlugin):
+    order = pyblish.api.ValidatorOrder
+    families = ["family{family}"]
+
+    def process(self, instance):
+        assert instance.data.get("value{index}") is None
+"""
+
+
+def make_tree(root, count, per_directory=100):
+    paths = list()
+
+    for index in range(count):
+        directory = os.path.join(root, "dir%03d" % (index // per_directory))
+        if directory not in paths:
+            os.makedirs(directory)
+            paths.append(directory)
+
+        fname = os.path.join(directory, "validate_%04d.py" % index)
+        with open(fname, "w") as f:
+            f.write(TEMPLATE.format(index=index, family=index % 10))
+
+    return paths
+
+
+def simulate_latency(seconds):
+    """Delay calls that would otherwise go across the network"""
+
+    def delayed(func):
+        def wrapper(*args, **kwargs):
+            time.sleep(seconds)
+            return func(*args, **kwargs)
+        return wrapper
+
+    pyblish.discovery.os.stat = delayed(os.stat)
+    pyblish.discovery.os.listdir = delayed(os.listdir)
+    pyblish.discovery._scandir = None
+    pyblish.discovery.open = delayed(open)
+
+
+def measure(paths, workers, repeats):
+    best = None
+
+    for _ in range(repeats):
+        # Compiled code is cached per process, start afresh
+        pyblish.discovery._compiled.clear()
+
+        start = time.time()
+        plugins = pyblish.plugin.discover(paths=paths, workers=workers)
+        duration = time.time() - start
+
+        best = duration if best is None else min(best, duration)
+
+    return best, plugins
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0,
+                        help="Simulated latency per file operation, in ms")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp()
+
+    try:
+        paths = make_tree(root, args.files)
+
+        if args.latency:
+            simulate_latency(args.latency / 1000.0)
+
+        serial, expected = measure(paths, None, args.repeats)
+        concurrent, actual = measure(paths, args.workers, args.repeats)
+
+        assert [p.__name__ for p in expected] == \
+            [p.__name__ for p in actual], "Results differ"
+
+        print("Files:      %d" % args.files)
+        print("Plug-ins:   %d" % len(actual))
+        print("Serial:     %.3fs" % serial)
+        print("Concurrent: %.3fs (%d workers)" % (concurrent, args.workers))
+        print("Speedup:    %.2fx" % (serial / concurrent))
+
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark matching of instances with and without NumPy
+
+Usage:
+    $ python benchmarks/matching.py --instances 100000 --plugins 400
+
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pyblish.api
+import pyblish.logic
+
+
+def make_context(count, families):
+    context = pyblish.api.Context()
+    vocabulary = ["family%d" % index for index in range(families)]
+
+    for index in range(count):
+        context.create_instance(
+            "instance%d" % index,
+            families=random.sample(vocabulary, random.randint(0, 3))
+        )
+
+    return context, vocabulary
+
+
+def make_plugins(count, vocabulary):
+    algorithms = [pyblish.api.Intersection,
+                  pyblish.api.Subset,
+                  pyblish.api.Exact]
+
+    return [
+        type("Plugin%d" % index, (pyblish.api.InstancePlugin,), {
+            "families": random.sample(vocabulary, random.randint(1, 2)),
+            "match": algorithms[index % len(algorithms)],
+        })
+        for index in range(count)
+    ]
+
+
+def measure(context, plugins, index):
+    start = time.time()
+    matches = [index.match(plugin.families, plugin.match)
+               for plugin in plugins]
+    return time.time() - start, matches
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--instances", type=int, default=100000)
+    parser.add_argument("--plugins", type=int, default=400)
+    parser.add_argument("--families", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+
+    context, vocabulary = make_context(args.instances, args.families)
+    plugins = make_plugins(args.plugins, vocabulary)
+
+    start = time.time()
+    index = pyblish.logic.FamilyIndex(context)
+    print("Instances:  %d" % args.instances)
+    print("Plug-ins:   %d" % args.plugins)
+    print("Index:      %.3fs" % (time.time() - start))
+
+    threshold = pyblish.logic.VECTORIZE_THRESHOLD
+    numpy = pyblish.logic._numpy()
+
+    try:
+        pyblish.logic.numpy = None
+        sets, expected = measure(context, plugins, index)
+        print("Sets:       %.3fs" % sets)
+
+        if numpy is None:
+            print("NumPy:      not available")
+            return
+
+        pyblish.logic.numpy = numpy
+        pyblish.logic.VECTORIZE_THRESHOLD = 0
+
+        start = time.time()
+        index.encode()
+        print("Encode:     %.3fs" % (time.time() - start))
+
+        bits, actual = measure(context, plugins, index)
+        print("NumPy:      %.3fs" % bits)
+        print("Speedup:    %.2fx" % (sets / bits))
+
+        assert expected == actual, "Results differ"
+
+    finally:
+        pyblish.logic.numpy = numpy
+        pyblish.logic.VECTORIZE_THRESHOLD = threshold
+
+
+if __name__ == "__main__":
+    main()
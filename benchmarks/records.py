@@ -0,0 +1,107 @@
+"""Benchmark memory held by records of results
+
+Publishes instances whose plug-ins log about large host objects,
+as would e.g. a plug-in passing nodes of a scene along with its
+messages, and compares retaining every record with compact records.
+
+Usage:
+    $ python benchmarks/records.py --instances 20000
+
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pyblish.api
+import pyblish.util
+
+
+class Node(object):
+    """Host object, such as a node in a scene"""
+
+    def __init__(self, name, size):
+        self.name = name
+        self.payload = bytearray(size)
+
+    def __str__(self):
+        return self.name
+
+
+def make_plugins(count, size):
+    class Collect(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            for index in range(count):
+                context.create_instance("instance%d" % index,
+                                        family="node",
+                                        node="node%d" % index)
+
+    class Validate(pyblish.api.InstancePlugin):
+        order = pyblish.api.ValidatorOrder
+        families = ["node"]
+
+        def process(self, instance):
+            node = Node(instance.data["node"], size)
+            self.log.debug("Validating %s", node)
+
+            for attribute in ("translate", "rotate", "scale"):
+                self.log.debug("Checking %s.%s", node, attribute)
+
+            self.log.info("Validated %s", node)
+
+    return [Collect, Validate]
+
+
+def measure(plugins):
+    tracemalloc.start()
+    start = time.time()
+
+    context = pyblish.util.publish(plugins=plugins)
+
+    duration = time.time() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    records = sum(len(r["records"]) for r in context.data["results"])
+    return duration, current, peak, records
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--instances", type=int, default=20000)
+    parser.add_argument("--size", type=int, default=1024,
+                        help="Bytes held by each host object")
+    parser.add_argument("--level", default="INFO")
+    parser.add_argument("--limit", type=int, default=None)
+    args = parser.parse_args()
+
+    plugins = make_plugins(args.instances, args.size)
+    level = getattr(logging, args.level)
+
+    print("Instances:  %d" % args.instances)
+
+    for label, policy in (("Default", {}),
+                          ("Compact", {"compact": True}),
+                          ("%s" % args.level, {"compact": True,
+                                               "level": level,
+                                               "limit": args.limit})):
+        pyblish.api.register_retention(**policy)
+
+        try:
+            duration, current, peak, records = measure(plugins)
+        finally:
+            pyblish.api.deregister_retention()
+
+        print("%-10s  %6.2fs  %8.1f MB held  %8.1f MB peak  %d records" % (
+            label + ":", duration, current / 1e6, peak / 1e6, records))
+
+
+if __name__ == "__main__":
+    main()
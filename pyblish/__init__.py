@@ -17,6 +17,8 @@ _registered_test = dict()
 _registered_hosts = list()
 _registered_targets = list()
 _registered_gui = list()
+_registered_retention = dict()
+_registered_profiling = dict()
 
 
 __all__ = [
@@ -31,4 +33,6 @@ __all__ = [
     "_registered_hosts",
     "_registered_targets",
     "_registered_gui",
+    "_registered_retention",
+    "_registered_profiling",
 ]
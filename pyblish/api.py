@@ -40,6 +40,9 @@ from .plugin import (
     Integrator,
     Collector,
     discover,
+    Discoverer,
+    Registry,
+    manifest,
 
     ContextPlugin,
     InstancePlugin,
@@ -80,6 +83,14 @@ from .plugin import (
     deregister_all_callbacks,
     registered_callbacks,
 
+    register_retention,
+    registered_retention,
+    deregister_retention,
+
+    register_profiling,
+    registered_profiling,
+    deregister_profiling,
+
     sort as sort_plugins,
 
     registered_paths,
@@ -91,6 +102,7 @@ from .lib import (
     log,
     time as __time,
     emit,
+    ResultStore,
     main_package_path as __main_package_path
 )
 
@@ -195,6 +207,9 @@ __all__ = [
 
     # Plug-in utilities
     "discover",
+    "Discoverer",
+    "Registry",
+    "manifest",
 
     "plugin_paths",
     "registered_paths",
@@ -220,6 +235,14 @@ __all__ = [
     "deregister_all_callbacks",
     "registered_callbacks",
 
+    "register_retention",
+    "registered_retention",
+    "deregister_retention",
+
+    "register_profiling",
+    "registered_profiling",
+    "deregister_profiling",
+
     "register_plugin_path",
     "deregister_plugin_path",
     "deregister_all_paths",
@@ -253,6 +276,7 @@ __all__ = [
     # Utilities
     "log",
     "emit",
+    "ResultStore",
 
     # Exceptions
     "PyblishError",
@@ -26,7 +26,7 @@ import tempfile
 import subprocess
 import contextlib
 
-from . import api, lib, util, __version__
+from . import api, lib, util, sinks, discovery, __version__
 from .vendor import click
 
 _ctx = None
@@ -46,6 +46,8 @@ _help = {
         "environment-paths": "Print only paths added via environment",
         "version": "Print the current version of Pyblish",
         "plugins": "List all available plugins",
+        "profile-discovery": "Print the slowest plug-in files to "
+                             "discover, along with skipped files",
         "data": "Initialise context with data. This takes "
                 "two arguments, key and value."
     },
@@ -56,7 +58,9 @@ _help = {
         "file": "Load file in host registered to it's suffix",
         "instance": "Only publish specified instance. "
                     "The default behaviour is to publish "
-                    "all instances. This may be called multiple times."
+                    "all instances. This may be called multiple times.",
+        "results": "Append each result to this file, as a line of JSON",
+        "keep": "Keep only this many of the latest results in memory"
     }
 }
 
@@ -107,6 +111,34 @@ def _format_plugins(plugins):
     return message[:-1]
 
 
+def _format_discovery(report, count=10):
+    """Return the `count` slowest files of discovery `report`"""
+    message = "Slowest files:\n"
+
+    files = sorted(report["files"],
+                   key=lambda timing: timing["total"],
+                   reverse=True)
+
+    for timing in files[:count]:
+        message += "{tab}{total:.4f}s {path}\n".format(tab=TAB, **timing)
+        message += "{tab}{tab}".format(tab=TAB) + ", ".join(
+            "{0} {1:.4f}s".format(phase, timing[phase])
+            for phase in ("stat", "read", "compile", "load", "exec", "filter")
+            if timing[phase]
+        ) + "\n"
+
+    if report["skipped"]:
+        message += "Skipped:\n"
+
+    for skipped in report["skipped"]:
+        message += "{tab}{path}".format(tab=TAB, **skipped)
+        if skipped["plugin"]:
+            message += " ({0})".format(skipped["plugin"])
+        message += ": {0}\n".format(skipped["reason"])
+
+    return message[:-1]
+
+
 def _format_time(start, finish):
     """Return right-aligned time-taken message"""
     message = "Time taken: %.2fs" % (finish - start)
@@ -143,6 +175,8 @@ class CliPlugin(api.ContextPlugin):
 @click.option("--version", is_flag=True, help=_help["main"]["version"])
 @click.option("--paths", is_flag=True, help=_help["main"]["paths"])
 @click.option("--plugins", is_flag=True, help=_help["main"]["plugins"])
+@click.option("--profile-discovery", is_flag=True,
+              help=_help["main"]["profile-discovery"])
 @click.option("--registered-paths", is_flag=True,
               help=_help["main"]["registered-paths"])
 @click.option("--environment-paths", is_flag=True,
@@ -173,6 +207,7 @@ def main(ctx,
          version,
          paths,
          plugins,
+         profile_discovery,
          environment_paths,
          registered_paths,
          plugin_paths,
@@ -224,11 +259,15 @@ def main(ctx,
     plugin_paths += add_plugin_paths
     ctx.obj["plugin_paths"] = plugin_paths
 
-    available_plugins = api.discover(paths=plugin_paths)
+    report = dict() if profile_discovery else None
+    available_plugins = api.discover(paths=plugin_paths, report=report)
 
     if plugins:
         click.echo(_format_plugins(available_plugins))
 
+    if profile_discovery:
+        click.echo(_format_discovery(report))
+
     if verbose:
         click.echo(
             intro_message.format(
@@ -283,11 +322,21 @@ def main(ctx,
               default=None,
               type=float,
               help=_help["publish"]["delay"])
+@click.option("--results",
+              "results_path",
+              default=None,
+              help=_help["publish"]["results"])
+@click.option("--keep",
+              default=None,
+              type=int,
+              help=_help["publish"]["keep"])
 @click.pass_context
 def publish(ctx,
             path,
             instances,
-            delay):
+            delay,
+            results_path,
+            keep):
     """Publish instances of path.
 
     \b
@@ -300,6 +349,7 @@ def publish(ctx,
     Usage:
         $ pyblish publish my_file.txt --instance=Message01
         $ pyblish publish my_file.txt --all
+        $ pyblish publish my_file.txt --results=results.jsonl --keep=100
 
     """
 
@@ -315,16 +365,28 @@ def publish(ctx,
         context.data["current_file"] = path  # backwards compatibility
         context.data["currentFile"] = path
 
-    # Begin processing
-    plugins = api.discover(paths=ctx.obj["plugin_paths"])
-    context = util.publish(context=context, plugins=plugins)
+    # Errors are reported from a summary of every result,
+    # as results kept in memory may be limited by --keep
+    summary = sinks.Summary()
+    destinations = [summary]
+
+    if results_path:
+        destinations.append(sinks.JsonLines(results_path))
 
-    if any(result["error"] for result in context.data.get("results", [])):
+    # Begin processing, with plug-ins discovered by main()
+    plugins = api.discover(paths=ctx.obj["plugin_paths"], cached=True)
+    context = util.publish(
+        context=context,
+        plugins=plugins,
+        sinks=destinations,
+        results=sinks.Ring(keep) if keep is not None else None
+    )
+
+    if summary.errors:
         click.echo("There were errors.")
 
-        for result in context.data["results"]:
-            if result["error"] is not None:
-                click.echo(result["error"])
+        for error in summary.errors:
+            click.echo(error)
 
     _end = time.time()
 
@@ -365,5 +427,25 @@ def gui(ctx, package):
         sys.exit(process.returncode)
 
 
+@click.command()
+@click.argument("directory")
+@click.argument("output")
+def pack(directory, output):
+    """Pack plug-ins of directory into a single bundle.
+
+    The resulting bundle may be used in place of the directory,
+    e.g. via PYBLISHPLUGINPATH.
+
+    \b
+    Usage:
+        $ pyblish pack /server/plugins /server/plugins.zip
+
+    """
+
+    for fname in discovery.pack(directory, output):
+        click.echo(fname)
+
+
 main.add_command(publish)
 main.add_command(gui)
+main.add_command(pack)
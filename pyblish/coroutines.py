@@ -0,0 +1,209 @@
+"""Publishing on an event loop
+
+Plug-ins whose `process` is a coroutine, i.e. `async def process`, are
+awaited on the running event loop such that instances waiting on e.g.
+a database or storage are processed alongside each other. Remaining
+plug-ins are processed on an executor. Records are captured per task.
+
+Requires Python 3.5 or above, see :func:`pyblish.util.publish_async`.
+
+"""
+
+import asyncio
+import inspect
+import logging
+
+from . import lib, logic, plugin
+
+log = logging.getLogger("pyblish.coroutines")
+
+
+async def publish(context=None,
+                  plugins=None,
+                  targets=None,
+                  registry=None,
+                  concurrency=None,
+                  executor=None,
+                  sinks=None,
+                  results=None):
+    """Publish everything, on the running event loop
+
+    Equivalent to :func:`pyblish.util.publish`, except instances of each
+    plug-in are processed concurrently. Plug-ins are still processed one
+    after another, with results committed in order of instances.
+
+    Arguments:
+        context (Context, optional): Context, defaults to
+            creating a new context
+        plugins (list, optional): Plug-ins to include,
+            defaults to results of discover()
+        targets (list, optional): Targets to include for publish session.
+        registry (Registry, optional): Snapshot of registrations,
+            providing plug-ins in place of discover() along with
+            targets in addition to `targets`
+        concurrency (int, dict, optional): Maximum number of instances
+            processed at once, or a maximum per order, such as
+            {api.IntegratorOrder: 4}. Defaults to no limit.
+        executor (Executor, optional): Executor on which to process
+            plug-ins that are not coroutines, defaults to that of the loop
+        sinks (list, optional): Destinations to which to write each
+            result as it is produced, see :func:`pyblish.util.publish`
+        results (object, optional): Container in which to keep results
+            in memory, see :func:`pyblish.util.publish`
+
+    Usage:
+        >> context = asyncio.get_event_loop().run_until_complete(
+        ..     publish_async())
+
+    """
+
+    # Imported here, as pyblish.util imports this module
+    from .util import _Session
+
+    with _Session(context, plugins, targets, registry,
+                  sinks, results) as session:
+        context = session.context
+
+        # First pass, collection
+        batches = logic.batches(session.collectors, context,
+                                registry=session.registry,
+                                targets=session.compatible)
+        for Plugin, instances in batches:
+            for result in await _process(Plugin, instances, context,
+                                         concurrency, executor):
+                pass
+
+        # Exclude plug-ins that do not have at
+        # least one compatible instance.
+        steps = session.plan()
+
+        # Second pass, the remainder
+        batches = logic.batches(steps, context, session.state)
+        for Plugin, instances in batches:
+            for result in await _process(Plugin, instances, context,
+                                         concurrency, executor):
+                session.note(result)
+
+    return context
+
+
+async def _process(Plugin, instances, context, concurrency=None,
+                   executor=None):
+    """Return committed results of `Plugin`, one per instance
+
+    Instances are produced concurrently, and committed
+    in order once all of them have been processed.
+
+    """
+
+    semaphore = _semaphore(concurrency, Plugin.order)
+
+    if instances is None:
+        produced = [
+            await _bounded(semaphore, produce(Plugin, context,
+                                              executor=executor))
+        ]
+
+    else:
+        produced = await asyncio.gather(*(
+            _bounded(semaphore, produce(Plugin, context, instance,
+                                        executor=executor))
+            for instance in instances
+            if instance.data.get("publish") is not False
+        ))
+
+    return [plugin.commit(result, context) for result in produced]
+
+
+def _semaphore(concurrency, order):
+    """Return semaphore limiting concurrency at `order`, if any"""
+    if isinstance(concurrency, dict):
+        concurrency = next((
+            maximum for base, maximum in concurrency.items()
+            if lib.inrange(number=order, base=base)
+        ), None)
+
+    if concurrency is None:
+        return None
+
+    return asyncio.Semaphore(concurrency)
+
+
+async def _bounded(semaphore, coroutine):
+    if semaphore is None:
+        return await coroutine
+
+    async with semaphore:
+        return await coroutine
+
+
+def is_coroutine(Plugin):
+    """Return whether `Plugin` processes by way of a coroutine"""
+    return issubclass(Plugin, (plugin.ContextPlugin, plugin.InstancePlugin)) \
+        and inspect.iscoroutinefunction(Plugin.process)
+
+
+async def produce(Plugin, context, instance=None, executor=None):
+    """Produce a single result from a Plug-in, without committing it
+
+    Coroutines are awaited on the running loop, whereas any other
+    plug-in is processed on `executor`, see :func:`pyblish.plugin.produce`
+
+    Arguments:
+        Plugin (Plugin): Uninstantiated plug-in class
+        context (Context): The current Context
+        instance (Instance, optional): Instance to process
+        executor (Executor, optional): Executor on which to process
+            plug-ins that are not coroutines, defaults to that of the loop
+
+    Returns:
+        Dictionary of result
+
+    """
+
+    if not is_coroutine(Plugin):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            executor, _produce, Plugin, context, instance)
+
+    if issubclass(Plugin, plugin.InstancePlugin) and instance is None:
+        raise AssertionError("Cannot process an InstancePlugin without an "
+                             "instance. This is a bug")
+
+    result = {
+        "success": False,
+        "plugin": Plugin,
+        "instance": instance,
+        "action": None,
+        "error": None,
+        "records": list(),
+        "duration": None,
+    }
+
+    records = plugin._records()
+
+    # Coroutines are processed alongside one another
+    __meter = plugin._Meter(memory=False)
+
+    try:
+        with plugin._capture(records):
+            if issubclass(Plugin, plugin.ContextPlugin):
+                await Plugin().process(context)
+            else:
+                await Plugin().process(instance)
+
+            result["success"] = True
+    except Exception as error:
+        lib.extract_traceback(error)
+        result["error"] = error
+
+    result["records"].extend(records)
+
+    __meter.stop(result)
+
+    return result
+
+
+def _produce(Plugin, context, instance):
+    with plugin._isolated():
+        return plugin.produce(Plugin, context, instance)
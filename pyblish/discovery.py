@@ -0,0 +1,732 @@
+"""Discovery caches
+
+Plug-in discovery reads and executes every file on every call to
+:func:`pyblish.plugin.discover`. The objects in this module help
+avoid redundant work across calls and across processes.
+
+Plug-ins may also be packed into a single bundle, see :func:`pack`,
+which is then registered in place of a directory.
+
+Attributes:
+    CACHE_ENV: Environment variable pointing to a directory in which
+        to store the persistent discovery cache and compiled plug-ins.
+        Persistent caching is disabled when this variable is unset.
+    PATH_TIMEOUT: Seconds to wait for the listing of a plug-in path
+        before considering it unavailable, or None to wait forever.
+        Paths are listed concurrently, so a single stale network mount
+        delays discovery by no more than this.
+    UNAVAILABLE_TIMEOUT: Seconds during which an unavailable path
+        is skipped, before it is tried again.
+
+"""
+
+import os
+import sys
+import errno
+import json
+import time
+import stat
+import marshal
+import hashlib
+import timeit
+import logging
+import zipfile
+import binascii
+import tempfile
+import threading
+import multiprocessing.pool
+
+try:
+    from importlib.util import MAGIC_NUMBER
+except ImportError:
+    # Python 2
+    import imp
+    MAGIC_NUMBER = imp.get_magic()
+
+try:
+    _scandir = os.scandir
+except AttributeError:
+    # Python 3.4 and below
+    _scandir = None
+
+from . import __version__, lib
+
+log = logging.getLogger("pyblish.discovery")
+
+# Unaffected by changes to the system clock, where available
+_monotonic = getattr(time, "monotonic", time.time)
+
+CACHE_ENV = "PYBLISH_CACHE"
+PATH_TIMEOUT = 10.0
+UNAVAILABLE_TIMEOUT = 60.0
+
+# Code objects of plug-in files, compiled during this process
+_compiled = dict()
+
+# Plug-in files found per directory, as of the last scan
+_scanned = dict()
+
+# Code objects of bundles, as of the last scan
+_bundles = dict()
+
+# Paths that recently failed to list, and when to retry them
+_unavailable = dict()
+
+# Guards the above, modified by threads of scans and of Discoverer
+_lock = threading.Lock()
+
+# Version of the bundle format, see pack()
+BUNDLE_VERSION = 1
+
+
+def cache_path():
+    """Return directory of the persistent discovery cache, or None"""
+    return os.environ.get(CACHE_ENV) or None
+
+
+def stamp(stat_result):
+    """Return a comparable stamp of a file from its `os.stat` result
+
+    Files are considered unchanged for as long as their
+    modification time and size remain the same.
+
+    Arguments:
+        stat_result (os.stat_result): Stat of file
+
+    """
+
+    mtime = getattr(stat_result, "st_mtime_ns", None)
+    if mtime is None:
+        mtime = stat_result.st_mtime
+
+    return [mtime, stat_result.st_size]
+
+
+def is_file(stat_result):
+    """Return whether `stat_result` represents a regular file"""
+    return stat.S_ISREG(stat_result.st_mode)
+
+
+class Manifest(object):
+    """Persistent plug-in metadata, per file
+
+    Each entry is keyed on the absolute path of a plug-in file and
+    holds the stamp of the file at the time it was last executed
+    along with the metadata of each plug-in found within it.
+
+    The manifest as a whole is invalidated on any change to the
+    version of Pyblish.
+
+    Arguments:
+        directory (str): Absolute path to cache directory
+
+    Example:
+        >>> import tempfile
+        >>> manifest = Manifest(tempfile.mkdtemp())
+        >>> manifest.set("/plugins/a.py", [1, 2], [{"name": "A"}])
+        >>> manifest.get("/plugins/a.py", [1, 2])
+        [{'name': 'A'}]
+        >>> manifest.get("/plugins/a.py", [1, 3]) is None
+        True
+
+    """
+
+    fname = "manifest.json"
+
+    def __init__(self, directory):
+        self.path = os.path.join(directory, self.fname)
+        self._entries = dict()
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return
+
+        if not isinstance(data, dict) or data.get("version") != __version__:
+            log.debug("Discarding outdated manifest: %s", self.path)
+            self._dirty = True
+            return
+
+        self._entries = data.get("files", {})
+
+    def get(self, abspath, stamp):
+        """Return plug-in metadata for `abspath`, unless outdated"""
+        entry = self._entries.get(abspath)
+
+        if entry is None or entry["stamp"] != stamp:
+            return None
+
+        return entry["plugins"]
+
+    def set(self, abspath, stamp, plugins):
+        """Store plug-in metadata `plugins` for file `abspath`"""
+        self._entries[abspath] = {
+            "stamp": stamp,
+            "plugins": plugins,
+        }
+        self._dirty = True
+
+    def discard(self, abspath):
+        """Forget about `abspath`"""
+        if self._entries.pop(abspath, None) is not None:
+            self._dirty = True
+
+    def files(self):
+        """Return all files in manifest"""
+        return list(self._entries)
+
+    def save(self):
+        """Write manifest to disk, if changed
+
+        The file is written to a temporary location first and
+        then moved into place, such that concurrent processes
+        never see a partially written manifest.
+
+        """
+
+        if not self._dirty:
+            return
+
+        directory = os.path.dirname(self.path)
+
+        try:
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+
+            fd, temp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump({"version": __version__,
+                           "files": self._entries}, f)
+
+            try:
+                os.rename(temp, self.path)
+            except OSError:
+                # Windows refuses to rename over existing files
+                os.remove(self.path)
+                os.rename(temp, self.path)
+
+        except (IOError, OSError) as e:
+            log.warning("Could not write discovery cache: %s", e)
+            return
+
+        self._dirty = False
+
+
+def scan(paths, workers=None, timings=None):
+    """Return plug-in files of `paths`
+
+    Files are returned in the order of `paths`, sorted by name within
+    each path. The result is identical whether or not directories are
+    scanned concurrently.
+
+    Arguments:
+        paths (list): Absolute paths to directories
+        workers (int, optional): Number of threads with which to
+            stat files. Directories are always listed concurrently,
+            see :attr:`PATH_TIMEOUT`.
+        timings (dict, optional): Record time spent on "stat" here,
+            per file, as a dictionary of phase to seconds.
+
+    Returns:
+        List of (abspath, stamp) pairs
+
+    """
+
+    paths = [os.path.normpath(path) for path in paths]
+
+    files = list()
+    for directory in _scan_directories(paths):
+        files.extend(directory)
+
+    if timings is None:
+        stat_file = _stat
+
+    else:
+        for abspath, _ in files:
+            timings.setdefault(abspath, {})
+
+        def stat_file(file):
+            start = timeit.default_timer()
+            try:
+                return _stat(file)
+            finally:
+                timings[file[0]]["stat"] = timeit.default_timer() - start
+
+    # Stat files of all directories at once, as a
+    # single directory may hold most of them.
+    stats = _map(stat_file, files, workers)
+
+    return [(abspath, stamp(stat_result))
+            for (abspath, _), stat_result in zip(files, stats)
+            if stat_result is not None and is_file(stat_result)]
+
+
+def release(paths, files, manifest=None):
+    """Release resources held for files removed from `paths`
+
+    Modules, compiled code and cached metadata of files that were
+    present in a previous scan of `paths` but are absent from `files`
+    are released, such that long-lived sessions do not accumulate one
+    module per file ever discovered.
+
+    Arguments:
+        paths (list): Directories that were scanned
+        files (list): Result of :func:`scan` of `paths`
+        manifest (Manifest, optional): Persistent cache to update
+
+    """
+
+    found = dict((os.path.normpath(path), set()) for path in paths)
+    for abspath, _ in files:
+        found[os.path.dirname(abspath)].add(abspath)
+
+    for path, current in found.items():
+        with _lock:
+            if path in _unavailable:
+                # Absent files may yet return along with their path
+                continue
+
+            removed = _scanned.get(path, set()) - current
+            _scanned[path] = current
+
+        for abspath in removed:
+            log.debug("Releasing removed plug-in file: %s", abspath)
+            sys.modules.pop(abspath, None)
+            _compiled.pop(abspath, None)
+
+            if manifest is not None:
+                manifest.discard(abspath)
+
+
+def _scan_directories(paths):
+    """Scan `paths` concurrently, bounded by :attr:`PATH_TIMEOUT`
+
+    Paths that fail to list, either in time or for any other reason
+    such as an I/O error, are reported as unavailable along with that
+    reason and skipped until :attr:`UNAVAILABLE_TIMEOUT` has passed.
+    Paths that do not exist are not reported.
+
+    Returns:
+        List of results of :func:`_scan_directory` per path
+
+    """
+
+    now = _monotonic()
+    results = dict()
+    errors = dict()
+    threads = list()
+
+    for path in paths:
+        with _lock:
+            skip = _unavailable.get(path, 0) > now
+
+        if skip:
+            log.debug("Skipping unavailable path: %s", path)
+            continue
+
+        def scan(path=path):
+            try:
+                results[path] = _scan_directory(path)
+            except Exception as e:
+                errors[path] = e
+
+        # Threads listing a dead mount may never return,
+        # and must not prevent the process from exiting.
+        thread = threading.Thread(target=scan, name="Scan %s" % path)
+        thread.daemon = True
+        thread.start()
+        threads.append((path, thread))
+
+    for path, thread in threads:
+        if PATH_TIMEOUT is None:
+            thread.join()
+        else:
+            thread.join(max(0, now + PATH_TIMEOUT - _monotonic()))
+
+        if path in results:
+            with _lock:
+                _unavailable.pop(path, None)
+            continue
+
+        if path in errors:
+            reason = "failed: %s" % errors[path]
+        else:
+            reason = "timed out after %.1fs" % PATH_TIMEOUT
+
+        with _lock:
+            _unavailable[path] = _monotonic() + UNAVAILABLE_TIMEOUT
+
+        log.warning("Plug-in path unavailable: %s (%s)", path, reason)
+        lib.emit("pluginPathUnavailable", path=path, reason=reason)
+
+    return [results.get(path, []) for path in paths]
+
+
+def _scan_directory(path):
+    """Return potential plug-ins of directory `path`
+
+    Returns:
+        List of (abspath, entry) pairs, where `entry` is the
+            `os.DirEntry` of `abspath` where available, such that
+            platforms that provide stat along with the listing
+            need not stat each file again.
+
+    """
+
+    try:
+        if _scandir is not None:
+            entries = dict((entry.name, entry) for entry in _scandir(path))
+        else:
+            entries = dict.fromkeys(os.listdir(path))
+    except OSError as e:
+        if os.path.isfile(path):
+            return _scan_bundle(path)
+
+        # Any other failure, such as of a network mount,
+        # is reported by the caller.
+        if e.errno not in (errno.ENOENT, errno.ENOTDIR):
+            raise
+
+        with _lock:
+            _bundles.pop(path, None)
+
+        return []
+
+    files = list()
+    for fname in sorted(entries):
+        if fname.startswith("_"):
+            continue
+
+        if not fname.endswith(".py"):
+            continue
+
+        files.append((os.path.join(path, fname), entries[fname]))
+
+    return files
+
+
+def _scan_bundle(path):
+    """Return plug-ins of bundle `path`, see :func:`_scan_directory`
+
+    The bundle is read in its entirety, such that each of its
+    plug-ins may be loaded without further access to storage.
+
+    """
+
+    try:
+        stat_result = os.stat(path)
+        fnames, codes = _read_bundle(path, os.path.normpath(path))
+    except Exception as e:
+        log.warning("Could not read plug-in bundle %s: %s", path, e)
+
+        with _lock:
+            _bundles.pop(path, None)
+
+        return []
+
+    with _lock:
+        _bundles[path] = (stamp(stat_result), codes)
+
+    member = _BundleMember(stat_result)
+
+    return [(os.path.join(path, fname), member) for fname in fnames]
+
+
+class _BundleMember(object):
+    """Stand-in for the `os.DirEntry` of a file within a bundle"""
+
+    def __init__(self, stat_result):
+        self._stat = stat_result
+
+    def stat(self):
+        return self._stat
+
+
+def _read_bundle(path, location):
+    archive = zipfile.ZipFile(path)
+
+    try:
+        manifest = json.loads(archive.read("manifest.json").decode("utf-8"))
+
+        if manifest["bundle"] != BUNDLE_VERSION:
+            raise ValueError("Unsupported bundle version: %s"
+                             % manifest["bundle"])
+
+        # Compiled code is only usable by the interpreter that
+        # compiled it, others fall back to the included source.
+        compiled = manifest["magic"] == _magic()
+
+        # Names are unicode on Python 2, by way of json, whereas
+        # modules must be named by str.
+        fnames = list(str(fname) for fname in manifest["files"])
+
+        codes = dict()
+        for fname in fnames:
+            try:
+                if compiled:
+                    code = marshal.loads(archive.read("code/%sc" % fname))
+                else:
+                    code = compile(archive.read("source/%s" % fname),
+                                   os.path.join(location, fname),
+                                   "exec", 0, True)
+            except Exception as e:
+                code = e
+
+            codes[fname] = code
+
+        return fnames, codes
+
+    finally:
+        archive.close()
+
+
+def _magic():
+    return binascii.hexlify(MAGIC_NUMBER).decode("ascii")
+
+
+def pack(directory, output):
+    """Pack plug-ins of `directory` into a single bundle at `output`
+
+    A bundle holds the source and compiled code of each plug-in
+    and is registered like any directory of plug-ins. Loading a
+    bundle involves a single file, which is useful when plug-ins
+    reside on high-latency network storage.
+
+    Plug-ins are discovered from a bundle in the same order, and
+    with the same precedence, as from the directory it was packed
+    from. Discovered plug-ins are associated with the bundle, e.g.
+    the `__module__` of a plug-in packed from "validate_a.py" into
+    "/plugins.zip" is "/plugins.zip/validate_a.py".
+
+    Compiled code is used by interpreters of the same version as
+    the one that created the bundle, other versions compile the
+    included source.
+
+    Arguments:
+        directory (str): Absolute path to directory of plug-ins
+        output (str): Absolute path to resulting bundle
+
+    Raises:
+        SyntaxError if any plug-in fails to compile
+
+    Returns:
+        List of packed plug-in files
+
+    """
+
+    location = os.path.normpath(output)
+
+    fnames = list()
+    for abspath, _ in _scan_directory(os.path.normpath(directory)):
+        if os.path.isfile(abspath):
+            fnames.append(os.path.basename(abspath))
+
+    archive = zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED)
+
+    try:
+        for fname in fnames:
+            with open(os.path.join(directory, fname), "rb") as f:
+                source = f.read()
+
+            code = compile(source, os.path.join(location, fname),
+                           "exec", 0, True)
+
+            archive.writestr("source/%s" % fname, source)
+            archive.writestr("code/%sc" % fname, marshal.dumps(code))
+
+        archive.writestr("manifest.json", json.dumps({
+            "bundle": BUNDLE_VERSION,
+            "pyblish": __version__,
+            "magic": _magic(),
+            "files": fnames,
+        }))
+
+    finally:
+        archive.close()
+
+    return fnames
+
+
+def _stat(file):
+    abspath, entry = file
+
+    try:
+        if entry is not None:
+            return entry.stat()
+        return os.stat(abspath)
+    except OSError:
+        return None
+
+
+def _map(func, items, workers=None):
+    """Map `func` onto `items`, optionally using a pool of threads"""
+    if not workers or len(items) < 2:
+        return [func(item) for item in items]
+
+    pool = multiprocessing.pool.ThreadPool(min(workers, len(items)))
+
+    try:
+        return pool.map(func, items)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def compile_files(files, workers=None, timings=None):
+    """Compile `files`, optionally using a pool of threads
+
+    Arguments:
+        files (list): List of (abspath, stamp) pairs
+        workers (int, optional): Number of threads with which
+            to read and compile files.
+        timings (dict, optional): See :func:`compile_file`
+
+    Returns:
+        List of code objects, in the order of `files`. Files that
+            fail to compile are represented by their exception.
+
+    """
+
+    if timings is not None:
+        for abspath, _ in files:
+            timings.setdefault(abspath, {})
+
+    def _compile(args):
+        abspath, stamp = args
+        timing = timings[abspath] if timings is not None else None
+
+        try:
+            return compile_file(abspath, stamp, timing)
+        except Exception as e:
+            return e
+
+    return _map(_compile, files, workers)
+
+
+def compile_file(abspath, stamp, timings=None):
+    """Return code object of Python source file `abspath`
+
+    Source is compiled once per process and, given a cache directory,
+    once per change to the file. Compiled code is stored away from
+    the plug-in directory, as plug-in directories are typically
+    read-only to their users.
+
+    Arguments:
+        abspath (str): Absolute path to Python source file
+        stamp (list): Current stamp of `abspath`, see :func:`stamp`
+        timings (dict, optional): Record time spent on either "read"
+            and "compile" of source, or "load" of compiled code, here.
+
+    Raises:
+        SyntaxError on invalid source
+
+    """
+
+    cached = _compiled.get(abspath)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    with _lock:
+        bundle = _bundles.get(os.path.dirname(abspath))
+
+    if bundle is not None and bundle[0] == stamp:
+        code = bundle[1][os.path.basename(abspath)]
+
+        if isinstance(code, Exception):
+            raise code
+
+        return code
+
+    cache = cache_path()
+    bytecode = None
+
+    if cache is not None:
+        # Paths are already bytes on Python 2, unless given as unicode
+        key = abspath if isinstance(abspath, bytes) \
+            else abspath.encode("utf-8")
+
+        bytecode = os.path.join(
+            cache, "bytecode", hashlib.sha1(key).hexdigest() + ".pyc")
+
+        start = timeit.default_timer()
+        code = _read_bytecode(bytecode, stamp)
+
+        if code is not None:
+            if timings is not None:
+                timings["load"] = timeit.default_timer() - start
+
+            _compiled[abspath] = (stamp, code)
+            return code
+
+    start = timeit.default_timer()
+
+    with open(abspath) as f:
+        source = f.read()
+
+    read = timeit.default_timer()
+    code = compile(source, abspath, "exec", 0, True)
+
+    if timings is not None:
+        timings["read"] = read - start
+        timings["compile"] = timeit.default_timer() - read
+
+    if bytecode is not None:
+        _write_bytecode(bytecode, stamp, code)
+
+    _compiled[abspath] = (stamp, code)
+    return code
+
+
+def digest(abspath):
+    """Return hash of the contents of file `abspath`"""
+    with _lock:
+        bundle = _bundles.get(os.path.dirname(abspath))
+
+    # Members of a bundle change along with their bundle
+    if bundle is not None:
+        return hashlib.sha1(repr(bundle[0]).encode("ascii")).hexdigest()
+
+    with open(abspath, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _read_bytecode(path, stamp):
+    try:
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC_NUMBER)) != MAGIC_NUMBER:
+                return None
+
+            if marshal.load(f) != stamp:
+                return None
+
+            return marshal.load(f)
+
+    except (IOError, OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def _write_bytecode(path, stamp, code):
+    directory = os.path.dirname(path)
+
+    try:
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        fd, temp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC_NUMBER)
+            marshal.dump(stamp, f)
+            marshal.dump(code, f)
+
+        try:
+            os.rename(temp, path)
+        except OSError:
+            os.remove(path)
+            os.rename(temp, path)
+
+    except (IOError, OSError) as e:
+        log.warning("Could not write compiled plug-in: %s", e)
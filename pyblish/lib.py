@@ -1,12 +1,14 @@
 import os
+import re
 import sys
+import fnmatch
 import logging
 import datetime
 import warnings
 import traceback
 import functools
 
-from . import _registered_callbacks
+from . import _registered_callbacks, _registered_retention
 from .vendor import six
 
 
@@ -53,13 +55,215 @@ class MessageHandler(logging.Handler):
             self.records.append(record)
 
 
-def extract_traceback(exception):
-    """Inject current traceback and store in exception"""
+class CompactRecord(logging.LogRecord):
+    """Formatted log record, free of references to its arguments
+
+    Its message is formatted as it is made, and its exception formatted
+    as text, such that none of the objects passed along with either is
+    kept alive, but is otherwise a :class:`logging.LogRecord`, and may
+    be formatted and handled like one.
+
+    Example:
+        >>> record = logging.makeLogRecord({"msg": "%s of %d",
+        ...                                 "args": ("One", 2),
+        ...                                 "levelname": "INFO"})
+        >>> compact = CompactRecord.compact(record)
+        >>> compact.getMessage()
+        'One of 2'
+        >>> compact.args is None
+        True
+        >>> logging.Formatter("%(levelname)s %(message)s").format(compact)
+        'INFO One of 2'
+
+    """
+
+    @classmethod
+    def compact(cls, record):
+        """Return compact equivalent of `record`"""
+        try:
+            msg = record.getMessage()
+        except Exception:
+            msg = "%s %% %r" % (record.msg, record.args)
+
+        exc_text = record.exc_text
+        if record.exc_info and not exc_text:
+            exc_text = _formatter.formatException(record.exc_info)
+
+        compact = cls.__new__(cls)
+        compact.__dict__.update(record.__dict__)
+        compact.msg = msg
+        compact.args = None
+        compact.exc_info = None
+        compact.exc_text = exc_text
+
+        return compact
+
+
+_formatter = logging.Formatter()
+
+_matchers = dict()
+_patterned = dict()
+
+
+def is_pattern(name):
+    """Return whether `name` is a wildcard pattern
+
+    A bare "*" is not considered a pattern; it is
+    handled separately as matching everything.
+
+    Usage:
+        >>> is_pattern("model.*")
+        True
+        >>> is_pattern("*Mesh")
+        True
+        >>> is_pattern("model")
+        False
+        >>> is_pattern("*")
+        False
+
+    """
+
+    return (isinstance(name, six.string_types) and
+            name != "*" and
+            any(char in name for char in "*?["))
+
+
+def has_patterns(names):
+    """Return whether any of `names` is a wildcard pattern
+
+    The result is cached per combination of names.
+
+    Usage:
+        >>> has_patterns(["model", "*Mesh"])
+        True
+        >>> has_patterns(["model", "*"])
+        False
+
+    """
+
+    key = tuple(names)
+
+    try:
+        return _patterned[key]
+    except KeyError:
+        result = _patterned[key] = any(is_pattern(name) for name in key)
+        return result
+
+
+def matches_any(name, names):
+    """Return whether `name` is in `names`, or matches a pattern therein
+
+    Usage:
+        >>> matches_any("maya", ["houdini", "may*"])
+        True
+        >>> matches_any("mayapy", ["maya"])
+        False
+        >>> matches_any("mayapy", ["*"])
+        True
+
+    """
+
+    if name in names or "*" in names:
+        return True
+
+    return pattern_matcher(names)(name)
+
+
+def pattern_matcher(names):
+    """Return function matching a name against patterns of `names`
+
+    Every pattern of `names` is compiled into a single expression,
+    once per combination of names. Names other than patterns are
+    not considered.
+
+    Usage:
+        >>> match = pattern_matcher(["model.*", "*Mesh", "rig"])
+        >>> match("model.high")
+        True
+        >>> match("rig")
+        False
+
+    """
+
+    key = tuple(names)
+
+    try:
+        return _matchers[key]
+    except KeyError:
+        pass
+
+    patterns = list(name for name in key if is_pattern(name))
+
+    if patterns:
+        expression = re.compile("|".join(
+            "(?:%s)" % fnmatch.translate(pattern) for pattern in patterns
+        ))
+
+        def matcher(name):
+            return (isinstance(name, six.string_types) and
+                    expression.match(name) is not None)
+
+    else:
+        def matcher(name):
+            return False
+
+    _matchers[key] = matcher
+    return matcher
+
+
+def extract_traceback(exception, depth=None, debug=None):
+    """Inject current traceback and store in exception
+
+    The last frame is stored in `traceback`, and the formatted stack of
+    at most `depth` of the innermost frames in `stack`, followed by the
+    exceptions it was raised from. Unless `debug`, the exception then
+    lets go of its traceback, and thereby every frame and their locals.
+    Both default to the registered policy of retention, see
+    :func:`pyblish.plugin.register_retention`.
+
+    Arguments:
+        exception (Exception): Exception currently being handled
+        depth (int, optional): Maximum number of frames in `stack`
+        debug (bool, optional): Whether to keep live frames
+
+    """
+
+    if depth is None:
+        depth = _registered_retention.get("depth", 10)
+
+    if debug is None:
+        debug = _registered_retention.get("debug", False)
+
     exc_type, exc_value, exc_traceback = sys.exc_info()
-    exception.traceback = traceback.extract_tb(exc_traceback)[-1]
+    extracted = traceback.extract_tb(exc_traceback)
+    exception.traceback = extracted[-1]
+    exception.stack = traceback.format_list(extracted[-depth:]) \
+        if depth else []
+
+    cause = _cause(exception)
+    while cause is not None:
+        exception.stack.append("Raised from %s: %s\n" % (
+            type(cause).__name__, cause))
+        cause = _cause(cause)
+
+    if not debug:
+        exception.__traceback__ = None
+        exception.__context__ = None
+        exception.__cause__ = None
+
     del(exc_type, exc_value, exc_traceback)
 
 
+def _cause(exception):
+    """Return exception `exception` was raised from, if any"""
+    cause = getattr(exception, "__cause__", None)
+
+    if cause is None and not getattr(exception, "__suppress_context__", 0):
+        cause = getattr(exception, "__context__", None)
+
+    return cause
+
+
 def time():
     """Return ISO formatted string representation of current UTC time."""
     return '%sZ' % datetime.datetime.utcnow().isoformat()
@@ -114,6 +318,259 @@ class ItemList(list):
             return default
 
 
+class ResultStore(list):
+    """List of results, indexed as they are appended
+
+    Read and written like the list of context.data["results"], whilst
+    answering which results belong to a plug-in, instance or order, and
+    which failed, without looking at every result. Changes other than
+    appending rebuild the indexes on the next such question.
+
+    Results of actions are kept apart from those of their plug-in,
+    see :meth:`actions`, such that a failing action neither fails
+    its plug-in nor counts towards :meth:`has_failed`.
+
+    Example:
+        >>> Plugin = type("Plugin", (object,), {"id": "1", "order": 0})
+        >>> results = ResultStore()
+        >>> results.append({"plugin": Plugin, "instance": None,
+        ...                 "success": False, "error": None})
+        >>> len(results.by_plugin(Plugin))
+        1
+        >>> results.state(Plugin)["failed"]
+        1
+        >>> results.has_failed()
+        True
+
+    """
+
+    def __init__(self, results=()):
+        super(ResultStore, self).__init__(results)
+        self._rebuild()
+
+    def _rebuild(self):
+        self._plugins = dict()
+        self._actions = dict()
+        self._instances = dict()
+        self._orders = dict()
+        self._failed = list()
+        self._states = dict()
+        self._dirty = False
+
+        for result in self:
+            self._add(result)
+
+    def _add(self, result):
+        plugin = result["plugin"]
+        instance = result["instance"]
+        failed = not result["success"]
+
+        self._instances.setdefault(
+            getattr(instance, "id", None), []).append(result)
+        self._orders.setdefault(
+            getattr(plugin, "order", None), []).append(result)
+
+        if result.get("action") is not None:
+            self._actions.setdefault(plugin.id, []).append(result)
+            return
+
+        self._plugins.setdefault(plugin.id, []).append(result)
+
+        state = self._states.setdefault(plugin.id, {
+            "processed": 0,
+            "failed": 0,
+            "succeeded": 0,
+        })
+
+        state["processed"] += 1
+
+        if failed:
+            self._failed.append(result)
+            state["failed"] += 1
+        else:
+            state["succeeded"] += 1
+
+    def _indexed(self):
+        if self._dirty:
+            self._rebuild()
+        return self
+
+    def by_plugin(self, plugin):
+        """Return results of `plugin`, or of a plug-in of id `plugin`"""
+        plugin = getattr(plugin, "id", plugin)
+        return list(self._indexed()._plugins.get(plugin, []))
+
+    def actions(self, plugin):
+        """Return results of actions of `plugin`, or of a plug-in of id"""
+        plugin = getattr(plugin, "id", plugin)
+        return list(self._indexed()._actions.get(plugin, []))
+
+    def by_instance(self, instance):
+        """Return results of `instance`, or of an instance of id `instance`
+
+        Results of plug-ins processing the context are those of None.
+
+        """
+
+        instance = getattr(instance, "id", instance)
+        return list(self._indexed()._instances.get(instance, []))
+
+    def by_order(self, order):
+        """Return results of plug-ins of `order`"""
+        return list(self._indexed()._orders.get(order, []))
+
+    def failed(self):
+        """Return results of plug-ins that failed, excluding actions"""
+        return list(self._indexed()._failed)
+
+    def has_failed(self, plugin=None):
+        """Return whether any result, or any result of `plugin`, failed"""
+        if plugin is None:
+            return bool(self._indexed()._failed)
+        return self.state(plugin)["failed"] > 0
+
+    def state(self, plugin):
+        """Return number of processed, failed and succeeded of `plugin`"""
+        plugin = getattr(plugin, "id", plugin)
+        state = self._indexed()._states.get(plugin)
+
+        if state is None:
+            return {"processed": 0, "failed": 0, "succeeded": 0}
+
+        return dict(state)
+
+    def usage(self, plugin):
+        """Return resources used by `plugin`, over all of its results
+
+        Durations are totals in milliseconds, whereas memory is
+        the largest growth in peak memory of any one result, in bytes.
+        See :class:`pyblish.plugin._Meter`.
+
+        """
+
+        usage = {
+            "duration": 0.0,
+            "processTime": 0.0,
+            "threadTime": 0.0,
+            "memory": 0,
+        }
+
+        for result in self.by_plugin(plugin):
+            for key in ("duration", "processTime", "threadTime"):
+                usage[key] += result.get(key) or 0.0
+
+            usage["memory"] = max(usage["memory"], result.get("memory") or 0)
+
+        return usage
+
+    def usages(self):
+        """Return resources used by each plug-in, heaviest first
+
+        Returns:
+            List of pairs of plug-in and its usage, ordered by duration
+
+        """
+
+        plugins = list(
+            results[0]["plugin"]
+            for results in self._indexed()._plugins.values()
+        )
+
+        return sorted(
+            ((plugin, self.usage(plugin)) for plugin in plugins),
+            key=lambda pair: pair[1]["duration"],
+            reverse=True
+        )
+
+    def is_available(self, action, plugin):
+        """Return whether `action` of `plugin` is available, as per its `on`
+
+        Example:
+            >>> Plugin = type("Plugin", (object,), {"id": "1", "order": 0})
+            >>> Action = type("Action", (object,), {"on": "failed"})
+            >>> results = ResultStore()
+            >>> results.is_available(Action, Plugin)
+            False
+            >>> results.append({"plugin": Plugin, "instance": None,
+            ...                 "success": False, "error": None})
+            >>> results.is_available(Action, Plugin)
+            True
+
+        """
+
+        state = self.state(plugin)
+
+        return {
+            "all": True,
+            "notProcessed": not state["processed"],
+            "processed": state["processed"] > 0,
+            "failed": state["failed"] > 0,
+            "succeeded": state["processed"] > 0 and not state["failed"],
+        }.get(action.on, False)
+
+    # Changes
+
+    def append(self, result):
+        super(ResultStore, self).append(result)
+
+        if not self._dirty:
+            self._add(result)
+
+    def extend(self, results):
+        for result in results:
+            self.append(result)
+
+    def __iadd__(self, results):
+        self.extend(results)
+        return self
+
+    def insert(self, index, result):
+        super(ResultStore, self).insert(index, result)
+        self._dirty = True
+
+    def pop(self, *args):
+        result = super(ResultStore, self).pop(*args)
+        self._dirty = True
+        return result
+
+    def remove(self, result):
+        super(ResultStore, self).remove(result)
+        self._dirty = True
+
+    def clear(self):
+        del self[:]
+
+    def sort(self, *args, **kwargs):
+        super(ResultStore, self).sort(*args, **kwargs)
+        self._dirty = True
+
+    def reverse(self):
+        super(ResultStore, self).reverse()
+        self._dirty = True
+
+    def __setitem__(self, index, result):
+        super(ResultStore, self).__setitem__(index, result)
+        self._dirty = True
+
+    def __delitem__(self, index):
+        super(ResultStore, self).__delitem__(index)
+        self._dirty = True
+
+    def __imul__(self, count):
+        super(ResultStore, self).__imul__(count)
+        self._dirty = True
+        return self
+
+    # Python 2 only, slices otherwise go through __setitem__/__delitem__
+    def __setslice__(self, i, j, results):
+        super(ResultStore, self).__setslice__(i, j, results)
+        self._dirty = True
+
+    def __delslice__(self, i, j):
+        super(ResultStore, self).__delslice__(i, j)
+        self._dirty = True
+
+
 class classproperty(object):
     def __init__(self, getter):
         self.getter = getter
@@ -8,13 +8,16 @@ import traceback
 from . import _registered_test, _registered_gui, lib
 from .plugin import (
     Validator,
+    AbstractEntity,
 
     # Matchin algorithms
     Intersection,
     Subset,
     Exact,
 
-    registered_targets
+    registered_targets,
+
+    _family_changes,
 )
 
 _algorithms = {
@@ -25,6 +28,42 @@ _algorithms = {
 
 log = logging.getLogger("pyblish.logic")
 
+try:
+    _intern = sys.intern
+except AttributeError:
+    _intern = intern  # noqa, Python 2
+
+# NumPy, imported once first needed, see _numpy()
+numpy = None
+_numpy_imported = False
+
+# Number of instances from which matching is vectorised, if NumPy is available
+VECTORIZE_THRESHOLD = 10000
+
+
+def _numpy():
+    """Return NumPy, or None if unavailable
+
+    Imported on first use rather than along with this module, as
+    hosts shipping with NumPy would otherwise pay for importing it
+    whether or not any index is large enough to make use of it.
+
+    """
+
+    global numpy, _numpy_imported
+
+    if not _numpy_imported:
+        _numpy_imported = True
+
+        try:
+            import numpy as module
+        except ImportError:
+            module = None
+
+        numpy = module
+
+    return numpy
+
 
 class TestFailed(Exception):
     def __init__(self, msg, vars):
@@ -154,6 +193,9 @@ def deregister_gui(package):
 def plugins_by_families(plugins, families):
     """Same as :func:`plugins_by_family` except it takes multiple families
 
+    Families of a plug-in may be wildcard patterns, such as "model.*"
+    or "*Mesh", each of which is satisfied by any matching family.
+
     Arguments:
         plugins (list): List of plugins
         families (list): Families with which to compare against
@@ -164,6 +206,7 @@ def plugins_by_families(plugins, families):
     """
 
     compatible = list()
+    families = frozenset(families)
 
     for plugin in plugins:
 
@@ -176,12 +219,36 @@ def plugins_by_families(plugins, families):
         assert algorithm, ("Plug-in did not provide "
                            "valid matching algorithm: %s" % plugin.match)
 
-        if algorithm(plugin.families, families):
+        if lib.has_patterns(plugin.families):
+            if _match_patterns(plugin.families, families, plugin.match):
+                compatible.append(plugin)
+
+        elif algorithm(plugin.families, families):
             compatible.append(plugin)
 
     return compatible
 
 
+def _match_patterns(patterns, families, algorithm):
+    """Equivalent of `_algorithms` for families including patterns"""
+    matched = list(
+        set(family for family in families
+            if family == pattern or lib.pattern_matcher([pattern])(family))
+        for pattern in set(patterns)
+    )
+
+    if algorithm == Intersection:
+        return any(matched)
+
+    if not all(matched):
+        return False
+
+    if algorithm == Exact:
+        return set(families).issubset(set().union(*matched))
+
+    return True
+
+
 def plugins_by_family(plugins, family):
     """Convenience function to :func:`plugins_by_families`
 
@@ -219,6 +286,8 @@ def plugins_by_instance(plugins, instance):
 def plugins_by_host(plugins, host):
     """Return compatible plugins `plugins` to host `host`
 
+    Hosts of a plug-in may be wildcard patterns, such as "maya*".
+
     Arguments:
         plugins (list): List of plugins
         host (str): Host with which compatible plugins are returned
@@ -231,8 +300,7 @@ def plugins_by_host(plugins, host):
     compatible = list()
 
     for plugin in plugins:
-        # TODO(marcus): Expand to take partial wildcards e.g. "*Mesh"
-        if any(x in getattr(plugin, "hosts", None) for x in (host, "*")):
+        if lib.matches_any(host, getattr(plugin, "hosts", None)):
             compatible.append(plugin)
 
     return compatible
@@ -274,6 +342,11 @@ def instances_by_plugin(instances, plugin):
     When `match == Subset`, families of an instance must be a
     subset of families supported by a plug-in.
 
+    When `instances` is a :class:`Context`, matching is resolved
+    through an index of family to instance kept alongside it and
+    rebuilt only once either membership or the families of any
+    instance changes, including in-place.
+
     Arguments:
         instances (list): List of instances
         plugin (Plugin): Plugin with which to compare against
@@ -286,27 +359,279 @@ def instances_by_plugin(instances, plugin):
 
     """
 
+    if not len(instances):
+        return list()
+
+    if "*" in plugin.families:
+        return list(instances)
+
+    if isinstance(instances, AbstractEntity):
+        index = _index_of(instances)
+    else:
+        index = FamilyIndex(instances)
+
+    return _by_index(index, plugin)
+
+
+def _by_index(index, plugin):
+    """Return instances of `index` compatible with `plugin`"""
+    if "*" in plugin.families:
+        return list(index.instances)
+
     algorithm = _algorithms.get(plugin.match)
 
-    compatible = list()
+    assert algorithm, ("Plug-in did not provide "
+                       "valid matching algorithm: %s" % plugin.match)
 
-    for instance in instances:
+    return index.match(plugin.families, plugin.match)
 
-        if "*" in plugin.families:
-            compatible.append(instance)
-            continue
 
-        assert algorithm, ("Plug-in did not provide "
-                           "valid matching algorithm: %s" % plugin.match)
+def _families_of(instance):
+    """Return all families of `instance`, interned"""
+    family = instance.data.get("family")
+    families = [family] if family else []
+    families += instance.data.get("families") or []
+
+    return frozenset(
+        _intern(family) if type(family) is str else family
+        for family in families
+    )
 
-        family = instance.data.get("family")
-        families = [family] if family else []
-        families += instance.data.get("families", [])
 
-        if algorithm(plugin.families, families):
-            compatible.append(instance)
+def _changes_of(entity):
+    """Return a key that differs once members of `entity` may have changed
 
-    return compatible
+    Returns None for anything other than an :class:`AbstractEntity`,
+    whose members cannot be followed.
+
+    """
+
+    if not isinstance(entity, AbstractEntity):
+        return None
+
+    return entity._changes, _family_changes[0]
+
+
+def _index_of(entity):
+    """Return up-to-date index of the members of `entity`
+
+    Changes to membership discard the index, see
+    :class:`pyblish.plugin.AbstractEntity`, as does any change to
+    "family" or "families" of any instance, including in-place.
+
+    """
+
+    changes = _changes_of(entity)
+    index = entity._index
+
+    if index is None or index.changes != changes:
+        index = FamilyIndex(entity)
+        index.changes = changes
+        entity._index = index
+
+    return index
+
+
+class FamilyIndex(object):
+    """Inverted index of family to the instances carrying it
+
+    Instances are referenced by position, such that results
+    are returned in their original order. Beyond
+    :data:`VECTORIZE_THRESHOLD` instances, and with NumPy available,
+    families are additionally encoded as packed rows of bits, one
+    row per family, and all instances are matched at once.
+
+    Wildcard patterns, such as "model.*", are resolved against the
+    families known to the index rather than against each instance.
+
+    Arguments:
+        instances (list): Instances to index
+
+    Example:
+        >>> from pyblish import api
+        >>> context = api.Context()
+        >>> _ = context.create_instance("A", families=["a"])
+        >>> _ = context.create_instance("B", families=["a", "b"])
+        >>> index = FamilyIndex(context)
+        >>> [i.name for i in index.match(["b"], api.Intersection)]
+        ['B']
+        >>> [i.name for i in index.match(["a", "default"], api.Subset)]
+        ['A', 'B']
+
+    """
+
+    def __init__(self, instances):
+        self.changes = None
+        self.instances = list(instances)
+        self.families = list()
+        self.members = dict()
+        self.patterns = dict()
+        self.columns = None
+        self.counts = None
+        self.bits = None
+
+        for position, instance in enumerate(self.instances):
+            families = _families_of(instance)
+            self.families.append(families)
+
+            for family in families:
+                try:
+                    self.members[family].add(position)
+                except KeyError:
+                    self.members[family] = set([position])
+
+    def match(self, families, algorithm):
+        """Return instances compatible with `families` under `algorithm`"""
+        if lib.has_patterns(families):
+            positions = self.match_patterns(families, algorithm)
+            return [self.instances[position] for position in positions]
+
+        families = set(families)
+
+        if len(self.instances) >= VECTORIZE_THRESHOLD and \
+                _numpy() is not None:
+            positions = self.match_bits(families, algorithm)
+            return [self.instances[position] for position in positions]
+
+        if algorithm == Intersection:
+            positions = set()
+            for family in families:
+                positions.update(self.members.get(family, ()))
+
+        else:
+            members = sorted(
+                (self.members.get(family, set()) for family in families),
+                key=len
+            )
+
+            if not members:
+                positions = range(len(self.instances))
+            else:
+                positions = members[0].intersection(*members[1:])
+
+            if algorithm == Exact:
+                positions = [
+                    position for position in positions
+                    if len(self.families[position]) == len(families)
+                ]
+
+        return [self.instances[position] for position in sorted(positions)]
+
+    def match_patterns(self, families, algorithm):
+        """Return positions of compatible instances, given patterns
+
+        Each pattern is expanded into the known families it matches,
+        once per index, and every family of a plug-in is satisfied
+        by any instance carrying one of its expansions.
+
+        """
+
+        groups = list()
+        for family in set(families):
+            members = set()
+            for known in self.expand(family):
+                members.update(self.members[known])
+            groups.append(members)
+
+        if algorithm == Intersection:
+            positions = set().union(*groups)
+
+        else:
+            groups.sort(key=len)
+            positions = groups[0].intersection(*groups[1:])
+
+            if algorithm == Exact:
+                known = set()
+                for family in families:
+                    known.update(self.expand(family))
+
+                positions = [
+                    position for position in positions
+                    if self.families[position].issubset(known)
+                ]
+
+        return sorted(positions)
+
+    def expand(self, family):
+        """Return known families matching `family`, which may be a pattern"""
+        if not lib.is_pattern(family):
+            return (family,) if family in self.members else ()
+
+        try:
+            return self.patterns[family]
+        except KeyError:
+            match = lib.pattern_matcher([family])
+            expanded = self.patterns[family] = tuple(
+                known for known in self.members if match(known))
+            return expanded
+
+    def match_bits(self, families, algorithm):
+        """Return positions of compatible instances, by way of NumPy
+
+        Equivalent to :meth:`match`, but evaluated for every instance
+        at once over packed rows of bits; one row per family and one
+        bit per instance.
+
+        """
+
+        numpy = _numpy()
+        bits = self.encode()
+        rows = [self.columns.get(family) for family in families]
+
+        if None in rows:
+            if algorithm != Intersection:
+                # No instance carries this family
+                return []
+
+            rows = [row for row in rows if row is not None]
+
+        if not rows:
+            if algorithm == Intersection:
+                return []
+            mask = numpy.full(bits.shape[1], 0xff, dtype=numpy.uint8)
+
+        elif algorithm == Intersection:
+            mask = numpy.bitwise_or.reduce(bits[rows], axis=0)
+
+        else:
+            mask = numpy.bitwise_and.reduce(bits[rows], axis=0)
+
+        if algorithm == Exact:
+            mask = mask & self.encode_count(len(families))
+
+        mask = numpy.unpackbits(mask)[:len(self.instances)]
+        return numpy.flatnonzero(mask).tolist()
+
+    def encode(self):
+        """Return instances of each family as packed rows of bits"""
+        if self.bits is None:
+            numpy = _numpy()
+            self.columns = dict(
+                (family, row)
+                for row, family in enumerate(self.members)
+            )
+
+            matrix = numpy.zeros((len(self.columns), len(self.instances)),
+                                 dtype=bool)
+
+            for family, positions in self.members.items():
+                matrix[self.columns[family], list(positions)] = True
+
+            self.bits = numpy.packbits(matrix, axis=1)
+            self.counts = dict()
+
+        return self.bits
+
+    def encode_count(self, count):
+        """Return instances with exactly `count` families as packed bits"""
+        try:
+            return self.counts[count]
+        except KeyError:
+            numpy = _numpy()
+            mask = numpy.array([len(families) == count
+                                for families in self.families], dtype=bool)
+            mask = self.counts[count] = numpy.packbits(mask)
+            return mask
 
 
 def _extract_traceback(exception):
@@ -334,17 +659,256 @@ def _extract_traceback(exception):
         del(exc_type, exc_value, exc_traceback)
 
 
-def Iterator(plugins, context, state=None):
+def plan(plugins, context, registry=None, targets=None):
+    """Compile steps of processing `plugins` against `context`
+
+    Each step pairs a plug-in with its compatible instances, or with
+    None for plug-ins processing the context. Plug-ins incompatible
+    with current targets, inactive plug-ins and plug-ins without any
+    compatible instance are excluded up-front.
+
+    Instances are matched once, at the time of planning, which is
+    why a plan is typically compiled following collection. Should
+    instances be added, removed or have their families changed once
+    planned, such as by an extractor, instances are matched anew as
+    each plug-in is reached, including plug-ins excluded up-front.
+    Whether to continue, and whether an instance is to be published,
+    is likewise determined as each step is processed, see
+    :func:`Iterator`.
+
+    Arguments:
+        plugins (list): Plug-ins to consider
+        context (Context): Instances to consider
+        registry (Registry, optional): Snapshot from which to take
+            targets, in place of those currently registered
+        targets (list, optional): Targets with which plug-ins must be
+            compatible, in place of those of `registry` or those
+            currently registered
+
+    Returns:
+        Plan of steps
+
+    Example:
+        >>> from pyblish import api
+        >>> class Collect(api.ContextPlugin):
+        ...     order = api.CollectorOrder
+        >>> class Validate(api.InstancePlugin):
+        ...     order = api.ValidatorOrder
+        ...     families = ["model"]
+        >>> class Extract(api.InstancePlugin):
+        ...     order = api.ExtractorOrder
+        ...     families = ["rig"]
+        >>> context = api.Context()
+        >>> _ = context.create_instance("A", family="model")
+        >>> steps = plan([Collect, Validate, Extract], context)
+        >>> [step["plugin"].__name__ for step in steps]
+        ['Collect', 'Validate']
+        >>> steps.size()
+        2
+
+    """
+
+    steps = Plan(plugins=[], changes=_changes_of(context))
+    previous = None
+
+    # Compared against families once, rather than once per plug-in
+    if isinstance(context, AbstractEntity):
+        index = _index_of(context)
+    else:
+        index = FamilyIndex(context)
+
+    for plugin, instances in _steps(plugins, context, registry, index,
+                                    targets):
+        if not plugin.active:
+            continue
+
+        steps.plugins.append(plugin)
+
+        if instances is not None and not instances:
+            continue
+
+        steps.append({
+            "plugin": plugin,
+            "instances": instances,
+            "order": plugin.order,
+            "boundary": plugin.order != previous,
+        })
+
+        previous = plugin.order
+
+    return steps
+
+
+class Plan(list):
+    """Ordered steps of processing, as compiled by :func:`plan`
+
+    Each step is a dictionary of `plugin`, `instances` (or None
+    for plug-ins processing the context), `order` and `boundary`,
+    the latter being True for the first step of each order.
+
+    Arguments:
+        steps (list, optional): Steps of plan
+        plugins (list, optional): Plug-ins considered, including
+            those excluded for want of instances, defaults to the
+            plug-ins of `steps`
+        changes (object, optional): Changes to instances as of
+            planning, see :meth:`is_current`
+
+    """
+
+    def __init__(self, steps=(), plugins=None, changes=None):
+        super(Plan, self).__init__(steps)
+        self.plugins = list(
+            step["plugin"] for step in self
+        ) if plugins is None else plugins
+        self.changes = changes
+
+    def is_current(self, context):
+        """Return whether instances of `context` are as planned"""
+        return self.changes is not None and \
+            self.changes == _changes_of(context)
+
+    def matched(self, context):
+        """Yield each plug-in along with its instances, as it is reached
+
+        Instances are those planned, unless instances of `context`
+        have changed since, whereupon they are matched anew and
+        plug-ins without any are skipped.
+
+        """
+
+        planned = dict((step["plugin"], step["instances"]) for step in self)
+
+        for plugin in self.plugins:
+            if plugin.__instanceEnabled__ and not self.is_current(context):
+                instances = instances_by_plugin(context, plugin)
+
+                if not instances:
+                    continue
+
+            elif plugin in planned:
+                instances = planned[plugin]
+
+            else:
+                continue
+
+            yield plugin, instances
+
+    def size(self):
+        """Return the number of processes expected of this plan"""
+        return sum(
+            1 if step["instances"] is None else sum(
+                1 for instance in step["instances"]
+                if instance.data.get("publish") is not False
+            )
+            for step in self
+        )
+
+    def serialize(self):
+        """Return plan as JSON-compatible list of steps"""
+        return [
+            {
+                "plugin": {
+                    "id": step["plugin"].id,
+                    "name": step["plugin"].__name__,
+                    "label": step["plugin"].label,
+                },
+                "instances": None if step["instances"] is None else [
+                    {"id": instance.id, "name": instance.name}
+                    for instance in step["instances"]
+                ],
+                "order": step["order"],
+                "boundary": step["boundary"],
+            }
+            for step in self
+        ]
+
+
+def _by_targets(plugins, registry=None, targets=None):
+    """Return `plugins` compatible with `targets`, or current targets"""
+
+    # We'll add "default" target if no targets are registered. This happens
+    # when running the Iterator directly without registering any targets.
+    if registry is None:
+        targets = targets or registered_targets() or ["default"]
+        return plugins_by_targets(plugins, targets)
+    else:
+        targets = targets or registry.targets or ["default"]
+        return registry.plugins_by_targets(plugins, targets)
+
+
+def _steps(plugins, context, registry=None, index=None, targets=None):
+    """Yield each compatible plug-in and its instances, as it is reached
+
+    Instances are matched against `index` when given, whereas
+    otherwise against `context` as it is when each plug-in is reached.
+
+    """
+
+    for plugin in _by_targets(plugins, registry, targets):
+        if not plugin.__instanceEnabled__:
+            yield plugin, None
+        elif index is not None:
+            yield plugin, _by_index(index, plugin)
+        else:
+            yield plugin, instances_by_plugin(context, plugin)
+
+
+def Iterator(plugins, context, state=None, registry=None, targets=None):
     """Primary iterator
 
     This is the brains of publishing. It handles logic related
     to which plug-in to process with which Instance or Context,
     in addition to stopping when necessary.
 
+    Instances are matched to each plug-in as it is reached, unless
+    `plugins` is a :class:`Plan`, whose instances were matched when
+    it was compiled, see :meth:`Plan.matched`.
+
     Arguments:
-        plugins (list): Plug-ins to consider
+        plugins (list, Plan): Plug-ins to consider
+        context (list): Instances to consider
+        state (dict): Mutable state
+        registry (Registry, optional): Snapshot from which to take
+            targets, in place of those currently registered
+        targets (list, optional): Targets with which plug-ins must be
+            compatible, in place of those of `registry` or those
+            currently registered
+
+    """
+
+    for plugin, instances in batches(plugins, context, state, registry,
+                                     targets):
+        if instances is not None:
+            for instance in instances:
+                if instance.data.get("publish") is False:
+                    log.debug("%s was inactive, skipping.." % instance)
+                    continue
+
+                yield plugin, instance
+
+        else:
+            yield plugin, None
+
+
+def batches(plugins, context, state=None, registry=None, targets=None):
+    """Yield each plug-in along with all of its instances at once
+
+    Equivalent to :func:`Iterator`, except instances are yielded
+    as a list per plug-in, or None for plug-ins processing the context,
+    and whether an instance is to be published is left to the caller.
+    The test is evaluated ahead of each plug-in, and so every instance
+    of a plug-in should be processed before requesting the next.
+
+    Arguments:
+        plugins (list, Plan): Plug-ins to consider
         context (list): Instances to consider
         state (dict): Mutable state
+        registry (Registry, optional): Snapshot from which to take
+            targets, in place of those currently registered
+        targets (list, optional): Targets with which plug-ins must be
+            compatible, in place of those of `registry` or those
+            currently registered
 
     """
 
@@ -354,31 +918,23 @@ def Iterator(plugins, context, state=None):
         "ordersWithError": set()
     }
 
-    # We'll add "default" target if no targets are registered. This happens
-    # when running the Iterator directly without registering any targets.
-    targets = registered_targets() or ["default"]
+    if isinstance(plugins, Plan):
+        steps = plugins.matched(context)
+    else:
+        steps = _steps(plugins, context, registry, targets=targets)
 
-    plugins = plugins_by_targets(plugins, targets)
-
-    for plugin in plugins:
+    for plugin, instances in steps:
         if not plugin.active:
             log.debug("%s was inactive, skipping.." % plugin)
             continue
 
         state["nextOrder"] = plugin.order
 
+        # Returning rather than raising StopIteration,
+        # which is an error from within generators as of PEP 479
         message = test(**state)
         if message:
-            raise StopIteration("Stopped due to %s" % message)
+            log.debug("Stopped due to %s" % message)
+            return
 
-        instances = instances_by_plugin(context, plugin)
-        if plugin.__instanceEnabled__:
-            for instance in instances:
-                if instance.data.get("publish") is False:
-                    log.debug("%s was inactive, skipping.." % instance)
-                    continue
-
-                yield plugin, instance
-
-        else:
-            yield plugin, None
+        yield plugin, instances
@@ -15,11 +15,16 @@ import os
 import sys
 import time
 import types
+import timeit
 import logging
 import inspect
+import functools
 import warnings
+import threading
 import contextlib
+import collections
 import uuid
+import weakref
 
 # Local library
 from . import (
@@ -31,9 +36,11 @@ from . import (
     _registered_hosts,
     _registered_paths,
     _registered_targets,
+    _registered_retention,
+    _registered_profiling,
 )
 
-from . import lib
+from . import lib, discovery
 from .vendor import iscompatible, six
 
 log = logging.getLogger("pyblish.plugin")
@@ -45,6 +52,15 @@ Intersection = 1 << 0
 Subset = 1 << 1
 Exact = 1 << 2
 
+# Incremented on changes to registrations, see generation()
+_generation = 0
+
+# Incremented on changes to registered targets, see target_generation()
+_target_generation = 0
+
+# Memoized results of discover(), per generation
+_discovered = dict()
+
 
 class Provider():
     """Dependency provider
@@ -162,12 +178,22 @@ def append_logger(plugin):
     # Package name appended, for filtering of LogRecord instances
     logname = "pyblish.%s" % name
     plugin.log = logging.getLogger(logname)
-    plugin.log.setLevel(logging.DEBUG)
+    plugin.log.setLevel(_retained_level())
+    _appended.add(logname)
 
     # All messages are handled by root-logger
     plugin.log.propagate = True
 
 
+# Names of loggers appended to plug-ins and actions
+_appended = set()
+
+
+def _retained_level():
+    """Return level of records retained, no lower than DEBUG"""
+    return max(_registered_retention.get("level", 0), logging.DEBUG)
+
+
 class MetaPlugin(type):
     """Rewrite plug-ins written prior to 1.1
 
@@ -221,6 +247,20 @@ class Plugin():
             Intersection -> set(a).intersection(b)
             Subset       -> set(a).issubset(b)
             Exact        -> a == b
+        parallel: Whether instances may be processed concurrently;
+            True for threads, or "process" for a pool of processes,
+            see :func:`pyblish.util.publish`
+        reads: Optional names of members of `data` read by this plug-in,
+            of both context and instances
+        writes: Optional names of members of `data` written by this
+            plug-in, including "instances" when creating instances or
+            altering their families. Plug-ins declaring what they read
+            and write may be processed alongside each other, see
+            :mod:`pyblish.scheduler`
+
+    `process` may be a coroutine, i.e. `async def process`, processed
+    alongside other coroutines by :func:`pyblish.util.publish_async`
+    and otherwise run to completion on an event loop of its own.
 
     """
 
@@ -236,6 +276,9 @@ class Plugin():
     actions = []
     id = None  # Defined by metaclass
     match = Intersection  # Default matching algorithm
+    parallel = False
+    reads = None
+    writes = None
 
     def __str__(self):
         return self.label or type(self).__name__
@@ -343,6 +386,8 @@ class MetaAction(type):
     """Inject additional metadata into Action"""
 
     def __init__(cls, *args, **kwargs):
+        append_logger(cls)
+
         cls._id = str(uuid.uuid4())
         cls.id = lib.classproperty(lambda self: cls._id)
 
@@ -413,9 +458,155 @@ def Category(label):
                                         "__type__": "category"})
 
 
+try:
+    # Python 3.7+
+    import contextvars
+except ImportError:
+    contextvars = None
+
+if contextvars is not None:
+    _capturing = contextvars.ContextVar("pyblish.capturing", default=None)
+else:
+    _capturing = None
+
+_local = threading.local()
+
+# Records of asyncio tasks, in place of contextvars prior to Python 3.7
+_tasks = weakref.WeakKeyDictionary()
+
+# Records of threads without a capture of their own
+_ambient = [None]
+
+
+class _Router(logging.Handler):
+    """Route records of pyblish loggers to the capture of their origin
+
+    Records are appended to the capture of the thread, or task, in which
+    they were made, or otherwise to that of the plug-in currently being
+    processed outside of :func:`_isolated`.
+
+    """
+
+    def emit(self, record):
+        records = _current()
+
+        if records is None:
+            records = _ambient[0]
+
+        if records is None:
+            return
+
+        record = _retain(record)
+
+        if record is not None:
+            records.append(record)
+
+
+def _retain(record):
+    """Return `record` as retained, or None if it is not to be"""
+    if record.levelno < _registered_retention["level"]:
+        return None
+
+    if _registered_retention["compact"]:
+        return lib.CompactRecord.compact(record)
+
+    return record
+
+
+def _records():
+    """Return container of records, bound to the number retained"""
+    return collections.deque(maxlen=_registered_retention["limit"])
+
+
+_router = _Router()
+
+
+def _current_task():
+    """Return asyncio task running in the current thread, if any
+
+    Only needed prior to Python 3.7, as tasks otherwise
+    have a context of their own, see `contextvars`.
+
+    """
+
+    asyncio = sys.modules.get("asyncio")
+    running = getattr(asyncio, "_get_running_loop", None)
+
+    if running is None:
+        return None
+
+    loop = running()
+    if loop is None:
+        return None
+
+    return asyncio.Task.current_task(loop)
+
+
+def _current():
+    """Return records captured in the current thread, or task"""
+    if _capturing is not None:
+        return _capturing.get()
+
+    task = _current_task()
+    if task is not None:
+        return _tasks.get(task)
+
+    return getattr(_local, "records", None)
+
+
+@contextlib.contextmanager
+def _capture(records, ambient=False):
+    """Append records of pyblish loggers to `records`
+
+    Only records made within the current thread, or asyncio task,
+    are captured, along with records of threads without a capture of
+    their own when `ambient`. Levels of loggers are left untouched;
+    plug-ins log at DEBUG by default, see `append_logger`.
+
+    """
+
+    task = None
+
+    # Handlers of the logger may have been cleared, e.g. by setup_log()
+    log = logging.getLogger("pyblish")
+    if _router not in log.handlers:
+        log.addHandler(_router)
+
+    if _capturing is not None:
+        token = _capturing.set(records)
+    else:
+        task = _current_task()
+
+        if task is not None:
+            token = _tasks.get(task)
+            _tasks[task] = records
+        else:
+            token = getattr(_local, "records", None)
+            _local.records = records
+
+    if ambient:
+        previous, _ambient[0] = _ambient[0], records
+
+    try:
+        yield
+    finally:
+        if ambient:
+            _ambient[0] = previous
+
+        if _capturing is not None:
+            _capturing.reset(token)
+        elif task is not None:
+            if token is None:
+                _tasks.pop(task, None)
+            else:
+                _tasks[task] = token
+        else:
+            _local.records = token
+
+
 @contextlib.contextmanager
 def logger(handler):
-    """Listen in on the global logger
+    """Listen in on pyblish loggers
 
     Arguments:
         handler (Handler): Custom handler with which to use
@@ -423,17 +614,13 @@ def logger(handler):
 
     """
 
-    logger = logging.getLogger()
-    old_level = logger.level
-
+    logger = logging.getLogger("pyblish")
     logger.addHandler(handler)
-    logger.setLevel(logging.DEBUG)
 
     try:
         yield
     finally:
         logger.removeHandler(handler)
-        logger.setLevel(old_level)
 
 
 def process(plugin, context, instance=None, action=None):
@@ -450,10 +637,58 @@ def process(plugin, context, instance=None, action=None):
 
     """
 
+    result = produce(plugin, context, instance, action)
+    return commit(result, context)
+
+
+def produce(plugin, context, instance=None, action=None):
+    """Produce a single result from a Plug-in, without committing it
+
+    Unlike :func:`process`, the result is neither added to the
+    context nor announced, see :func:`commit`. Results may thereby
+    be produced concurrently, yet committed in a predictable order.
+
+    Arguments:
+        plugin(Plugin): Uninstantiated plug-in class
+        context(Context): The current Context
+        instance(Instance, optional): Instance to process
+        action(str): Id of action to process, in place of plug-in.
+
+    Returns:
+        Dictionary of result
+
+    """
+
     if issubclass(plugin, (ContextPlugin, InstancePlugin)):
-        result = __explicit_process(plugin, context, instance, action)
+        return __explicit_process(plugin, context, instance, action)
     else:
-        result = __implicit_process(plugin, context, instance, action)
+        return __implicit_process(plugin, context, instance, action)
+
+
+def commit(result, context):
+    """Add `result` to `context`, and emit its events
+
+    The result is also written to each of the sinks of `context`,
+    see :attr:`Context.sinks`.
+
+    Arguments:
+        result (dict): Result, as returned by :func:`produce`
+        context(Context): The current Context
+
+    Returns:
+        Dictionary of result
+
+    """
+
+    if result["error"] is not None:
+        lib.emit("pluginFailed", plugin=result["plugin"], context=context,
+                 instance=result["instance"], error=result["error"])
+
+    if "results" not in context.data:
+        context.data["results"] = lib.ResultStore()
+
+    context.data["results"].append(result)
+    _write(result, context)
 
     lib.emit("pluginProcessed", result=result)
     return result
@@ -494,35 +729,30 @@ def __explicit_process(plugin, context, instance=None, action=None):
         args = (context, plugin)
         runner = action().process
 
-    records = list()
-    handler = lib.MessageHandler(records)
+    records = _records()
+    ambient = not _is_isolated(plugin)
 
-    __start = time.time()
+    __meter = _Meter(memory=ambient)
 
     try:
-        with logger(handler):
-            runner(*args)
+        with _capture(records, ambient):
+            returned = runner(*args)
+
+            # Coroutine, i.e. `async def process`
+            if hasattr(returned, "__await__"):
+                _complete(returned)
+
             result["success"] = True
     except Exception as error:
-        # FIXME: This is apparently not very healthy,
-        # as it creates a circular reference.
+        # Lets go of the traceback, which would otherwise create a
+        # circular reference and keep every frame alive with the result.
         # http://stackoverflow.com/a/11417308/478949
-        lib.emit("pluginFailed", plugin=plugin, context=context,
-                 instance=instance, error=error)
         lib.extract_traceback(error)
         result["error"] = error
 
-    __end = time.time()
+    result["records"].extend(records)
 
-    for record in records:
-        result["records"].append(record)
-
-    result["duration"] = (__end - __start) * 1000  # ms
-
-    if "results" not in context.data:
-        context.data["results"] = list()
-
-    context.data["results"].append(result)
+    __meter.stop(result)
 
     return result
 
@@ -557,37 +787,27 @@ def __implicit_process(plugin, context, instance=None, action=None):
         action = actions[action]
         runner = action().process
 
-    records = list()
-    handler = lib.MessageHandler(records)
+    records = _records()
+    ambient = not _is_isolated(plugin)
 
     provider = Provider()
     provider.inject("plugin", plugin)
     provider.inject("context", context)
     provider.inject("instance", instance)
 
-    __start = time.time()
+    __meter = _Meter(memory=ambient)
 
     try:
-        with logger(handler):
+        with _capture(records, ambient):
             provider.invoke(runner)
             result["success"] = True
     except Exception as error:
-        lib.emit("pluginFailed", plugin=plugin, context=context,
-                 instance=instance, error=error)
         lib.extract_traceback(error)
         result["error"] = error
 
-    __end = time.time()
-
-    for record in records:
-        result["records"].append(record)
-
-    result["duration"] = (__end - __start) * 1000  # ms
-
-    if "results" not in context.data:
-        context.data["results"] = list()
+    result["records"].extend(records)
 
-    context.data["results"].append(result)
+    __meter.stop(result)
 
     # Backwards compatibility
     result["asset"] = instance  # Deprecated key
@@ -595,13 +815,157 @@ def __implicit_process(plugin, context, instance=None, action=None):
     return result
 
 
+def _unavailable():
+    return None
+
+
+_perf_counter = getattr(time, "perf_counter", timeit.default_timer)
+_process_time = getattr(time, "process_time", _unavailable)
+_thread_time = getattr(time, "thread_time", _unavailable)
+
+try:
+    # Python 3.4+
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+
+class _Meter(object):
+    """Measure resources used from creation until :meth:`stop`
+
+    Wall time is measured with a monotonic clock, along with time spent
+    computing by the process and by the current thread, where available.
+    The latter excludes time spent waiting, such as on I/O.
+
+    Growth in peak memory is measured once registered, see
+    :func:`register_profiling`, whilst tracemalloc is tracing on
+    Python 3.9+. Measuring resets the peak of tracemalloc, and
+    includes that of threads running alongside, and so is not taken
+    of results produced alongside one another.
+
+    Arguments:
+        memory (bool, optional): Whether memory may be measured
+
+    """
+
+    def __init__(self, memory=True):
+        self.tracing = memory and \
+            _registered_profiling.get("memory", False) and \
+            tracemalloc is not None and \
+            hasattr(tracemalloc, "reset_peak") and \
+            tracemalloc.is_tracing()
+
+        if self.tracing:
+            self.memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+
+        # Wall time encloses time spent computing
+        self.start = _perf_counter()
+        self.process = _process_time()
+        self.thread = _thread_time()
+
+    def stop(self, result):
+        """Store resources used in `result`, in milliseconds and bytes"""
+        result["threadTime"] = _elapsed(self.thread, _thread_time())
+        result["processTime"] = _elapsed(self.process, _process_time())
+        result["duration"] = (_perf_counter() - self.start) * 1000  # ms
+        result["memory"] = None
+
+        if self.tracing and tracemalloc.is_tracing():
+            peak = tracemalloc.get_traced_memory()[1]
+            result["memory"] = max(peak - self.memory, 0)
+
+
+def _elapsed(start, end):
+    if start is None or end is None:
+        return None
+    return (end - start) * 1000  # ms
+
+
+def _complete(awaitable):
+    """Run `awaitable` to completion on an event loop of its own
+
+    Loops do not nest, and so from within a running loop, such as
+    that of a host using asyncio, `awaitable` is run on a thread of
+    its own whilst this thread waits.
+
+    """
+
+    import asyncio
+
+    # Python 3.5.3+
+    running = getattr(asyncio, "_get_running_loop", lambda: None)()
+
+    if running is None:
+        return _run_until_complete(awaitable)
+
+    outcome = dict()
+
+    def run():
+        try:
+            outcome["value"] = _run_until_complete(awaitable)
+        except BaseException as error:
+            outcome["error"] = error
+
+    # Records are captured by context, where available
+    if contextvars is not None:
+        target = functools.partial(contextvars.copy_context().run, run)
+    else:
+        target = run
+
+    thread = threading.Thread(target=target, name="pyblish.complete")
+    thread.start()
+    thread.join()
+
+    if "error" in outcome:
+        raise outcome["error"]
+
+    return outcome["value"]
+
+
+def _run_until_complete(awaitable):
+    import asyncio
+
+    loop = asyncio.new_event_loop()
+
+    try:
+        return loop.run_until_complete(awaitable)
+    finally:
+        loop.close()
+
+
+_isolation = threading.local()
+
+
+@contextlib.contextmanager
+def _isolated():
+    """Capture only records of the current thread, whilst processing"""
+    _isolation.active = True
+
+    try:
+        yield
+    finally:
+        _isolation.active = False
+
+
+def _is_isolated(plugin):
+    """Return whether to capture only records of the current thread
+
+    Parallel plug-ins may be processed alongside one another, and
+    capture only the records of their own thread, as do plug-ins
+    processed from within :func:`_isolated`.
+
+    """
+
+    return bool(getattr(plugin, "parallel", False) or
+                getattr(_isolation, "active", False))
+
+
 def repair(plugin, context, instance=None):
     """Produce single result from repairing"""
 
-    import time
-
     if "results" not in context.data:
-        context.data["results"] = list()
+        context.data["results"] = lib.ResultStore()
 
     result = {
         "success": False,
@@ -614,35 +978,97 @@ def repair(plugin, context, instance=None):
 
     plugin = plugin()
 
-    records = list()
-    handler = lib.MessageHandler(records)
+    records = _records()
 
     provider = Provider()
     provider.inject("context", context)
     provider.inject("instance", instance)
 
-    __start = time.time()
+    __meter = _Meter()
 
     try:
-        with logger(handler):
+        with _capture(records, ambient=True):
             provider.invoke(plugin.repair)
             result["success"] = True
     except Exception as error:
         lib.extract_traceback(error)
         result["error"] = error
 
-    __end = time.time()
-
-    for record in records:
-        result["records"].append(record)
+    result["records"].extend(records)
 
-    result["duration"] = (__end - __start) * 1000  # ms
+    __meter.stop(result)
 
     context.data["results"].append(result)
+    _write(result, context)
 
     return result
 
 
+def _write(result, context):
+    """Write `result` to each sink of `context`"""
+    for sink in getattr(context, "sinks", ()):
+        try:
+            sink.write(result)
+        except Exception:
+            log.warning("Could not write result to %s" % sink,
+                        exc_info=True)
+
+
+# Incremented on every change to "family" or "families" of any
+# instance, including in-place, for the index of :mod:`pyblish.logic`
+_family_changes = [0]
+
+
+def _changes_families(method):
+    """Increment :data:`_family_changes` on calling list `method`"""
+
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        _family_changes[0] += 1
+        return result
+
+    return wrapper
+
+
+class _Families(list):
+    """List of families, noting changes made to it in-place
+
+    Lists assigned to "families" of data are stored as a copy of
+    this type, such that plug-ins appending a family to an instance
+    are noticed without comparing the families of every instance.
+    Changes to the original list, rather than to the one stored,
+    go unnoticed.
+
+    """
+
+    append = _changes_families(list.append)
+    extend = _changes_families(list.extend)
+    insert = _changes_families(list.insert)
+    pop = _changes_families(list.pop)
+    remove = _changes_families(list.remove)
+    sort = _changes_families(list.sort)
+    reverse = _changes_families(list.reverse)
+    __setitem__ = _changes_families(list.__setitem__)
+    __delitem__ = _changes_families(list.__delitem__)
+    __iadd__ = _changes_families(list.__iadd__)
+    __imul__ = _changes_families(list.__imul__)
+
+    if hasattr(list, "clear"):
+        clear = _changes_families(list.clear)
+
+    # Python 2 only, slices otherwise go through __setitem__/__delitem__
+    if hasattr(list, "__setslice__"):
+        __setslice__ = _changes_families(list.__setslice__)
+        __delslice__ = _changes_families(list.__delslice__)
+
+
+def _tracked(key, value):
+    """Return `value` of `key` such that changes to it are noticed"""
+    if key == "families" and type(value) is list:
+        return _Families(value)
+    return value
+
+
 class _Dict(dict):
     """Temporary object during transition from set_data to data dictionary"""
 
@@ -658,6 +1084,47 @@ class _Dict(dict):
 
         return self.get(key, default)
 
+    def __setitem__(self, key, value):
+        super(_Dict, self).__setitem__(key, _tracked(key, value))
+        if key in ("family", "families"):
+            _family_changes[0] += 1
+
+    def __delitem__(self, key):
+        super(_Dict, self).__delitem__(key)
+        if key in ("family", "families"):
+            _family_changes[0] += 1
+
+    def pop(self, key, *args):
+        value = super(_Dict, self).pop(key, *args)
+        if key in ("family", "families"):
+            _family_changes[0] += 1
+        return value
+
+    def popitem(self):
+        key, value = super(_Dict, self).popitem()
+        if key in ("family", "families"):
+            _family_changes[0] += 1
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key in ("family", "families") and key not in self:
+            default = _tracked(key, default)
+            _family_changes[0] += 1
+        return super(_Dict, self).setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        other = dict(*args, **kwargs)
+        if "families" in other:
+            other["families"] = _tracked("families", other["families"])
+        super(_Dict, self).update(other)
+        if "family" in other or "families" in other:
+            _family_changes[0] += 1
+
+    def clear(self):
+        if "family" in self or "families" in self:
+            _family_changes[0] += 1
+        super(_Dict, self).clear()
+
 
 class AbstractEntity(list):
     """Superclass for Context and Instance
@@ -699,12 +1166,87 @@ class AbstractEntity(list):
     def data(self):
         return self._data
 
+    # Family index
+    #
+    # Matching of plug-ins against the members of an entity is
+    # resolved through an index built by :mod:`pyblish.logic`. Any
+    # change to membership or order discards it.
+
+    _index = None
+    _changes = 0
+
+    def _invalidate_index(self):
+        self._changes += 1
+        self._index = None
+
+    def append(self, other):
+        super(AbstractEntity, self).append(other)
+        self._invalidate_index()
+
+    def extend(self, others):
+        super(AbstractEntity, self).extend(others)
+        self._invalidate_index()
+
+    def insert(self, index, other):
+        super(AbstractEntity, self).insert(index, other)
+        self._invalidate_index()
+
+    def pop(self, *args):
+        other = super(AbstractEntity, self).pop(*args)
+        self._invalidate_index()
+        return other
+
+    def remove(self, other):
+        super(AbstractEntity, self).remove(other)
+        self._invalidate_index()
+
+    def clear(self):
+        del self[:]
+
+    def sort(self, *args, **kwargs):
+        super(AbstractEntity, self).sort(*args, **kwargs)
+        self._invalidate_index()
+
+    def reverse(self):
+        super(AbstractEntity, self).reverse()
+        self._invalidate_index()
+
+    def __setitem__(self, index, other):
+        super(AbstractEntity, self).__setitem__(index, other)
+        self._invalidate_index()
+
+    def __delitem__(self, index):
+        super(AbstractEntity, self).__delitem__(index)
+        self._invalidate_index()
+
+    # Python 2 only, slices otherwise go through __setitem__/__delitem__
+    def __setslice__(self, i, j, others):
+        super(AbstractEntity, self).__setslice__(i, j, others)
+        self._invalidate_index()
+
+    def __delslice__(self, i, j):
+        super(AbstractEntity, self).__delslice__(i, j)
+        self._invalidate_index()
+
+    def __iadd__(self, others):
+        result = super(AbstractEntity, self).__iadd__(others)
+        self._invalidate_index()
+        return result
+
 
 class Context(AbstractEntity):
-    """Maintain a collection of Instances"""
+    """Maintain a collection of Instances
+
+    Attributes:
+        sinks (list): Destinations to which each result is written as
+            it is committed, in addition to data["results"],
+            see :mod:`pyblish.sinks`
+
+    """
 
     def __init__(self, name="Context", parent=None):
         super(Context, self).__init__(name, parent)
+        self.sinks = list()
 
     def __contains__(self, key):
         """Support both Instance objects and `id` strings
@@ -849,6 +1391,148 @@ def current_host():
     return _registered_hosts[-1] if _registered_hosts else "unknown"
 
 
+def generation():
+    """Return the current generation of registrations
+
+    The generation increments on every change to registered paths,
+    plug-ins and hosts, and may be used to determine whether
+    anything affecting discovery has changed since last checked.
+    Targets do not affect discovery, see :func:`target_generation`.
+
+    Example:
+        >>> before = generation()
+        >>> register_host("My Host")
+        >>> generation() > before
+        True
+
+    """
+
+    return _generation
+
+
+def target_generation():
+    """Return the current generation of registered targets
+
+    Incremented on every change to registered targets, which
+    happens on every publish, independently of :func:`generation`.
+
+    Example:
+        >>> before = target_generation()
+        >>> register_target("My Target")
+        >>> target_generation() > before
+        True
+        >>> deregister_target("My Target")
+
+    """
+
+    return _target_generation
+
+
+def _invalidate():
+    """Increment generation, invalidating memoized discoveries"""
+    global _generation
+    _generation += 1
+    _discovered.clear()
+
+
+def _invalidate_targets():
+    """Increment generation of targets, leaving discoveries as-is"""
+    global _target_generation
+    _target_generation += 1
+
+
+def register_retention(level=logging.NOTSET,
+                       limit=None,
+                       compact=False,
+                       depth=10,
+                       debug=False):
+    """Register policy by which records and errors are retained in results
+
+    Records below `level` are not retained, and loggers of plug-ins
+    and actions no longer make them. Of the remaining records, only
+    the last `limit` of each result are retained. Compact records are
+    formatted as they are made, keeping none of their arguments, see
+    :class:`pyblish.lib.CompactRecord`.
+
+    Errors keep their formatted stack of at most `depth` frames, and
+    let go of their traceback along with every frame and its locals,
+    unless in `debug`, see :func:`pyblish.lib.extract_traceback`.
+
+    Arguments:
+        level (int, optional): Minimum level of retained records
+        limit (int, optional): Maximum number of records per result,
+            defaults to no limit
+        compact (bool, optional): Whether to retain compact records
+        depth (int, optional): Maximum number of frames in the stack
+            of errors
+        debug (bool, optional): Whether errors keep their traceback,
+            for inspection in a debugger
+
+    Example:
+        >>> import logging
+        >>> register_retention(logging.INFO, limit=100, compact=True)
+        >>> registered_retention()["limit"]
+        100
+        >>> deregister_retention()
+
+    """
+
+    _registered_retention.update({
+        "level": level,
+        "limit": limit,
+        "compact": compact,
+        "depth": depth,
+        "debug": debug,
+    })
+
+    level = _retained_level()
+    for name in _appended:
+        logging.getLogger(name).setLevel(level)
+
+
+def registered_retention():
+    """Return currently registered policy of retention of records"""
+    return dict(_registered_retention)
+
+
+def deregister_retention():
+    """Restore default policy, retaining every record"""
+    register_retention()
+
+
+def register_profiling(memory=False):
+    """Register which resources to measure of each result
+
+    Results keep the growth in peak memory during processing, with
+    `memory` and whilst tracemalloc is tracing, see :class:`_Meter`.
+    Time is always measured.
+
+    Arguments:
+        memory (bool, optional): Whether to measure memory of results
+
+    Example:
+        >>> register_profiling(memory=True)
+        >>> registered_profiling()["memory"]
+        True
+        >>> deregister_profiling()
+
+    """
+
+    _registered_profiling.update({
+        "memory": memory,
+    })
+
+
+def registered_profiling():
+    """Return currently registered resources to measure"""
+    return dict(_registered_profiling)
+
+
+def deregister_profiling():
+    """Restore default, measuring time alone"""
+    register_profiling()
+
+
 def register_callback(signal, callback):
     """Register a new callback
 
@@ -938,6 +1622,7 @@ or register a new host using `pyblish.api.register_host("%s")`
         raise TypeError(err)
 
     _registered_plugins[plugin.__name__] = plugin
+    _invalidate()
 
 
 def deregister_plugin(plugin):
@@ -949,11 +1634,13 @@ def deregister_plugin(plugin):
     """
 
     _registered_plugins.pop(plugin.__name__)
+    _invalidate()
 
 
 def deregister_all_plugins():
     """De-register all plug-ins"""
     _registered_plugins.clear()
+    _invalidate()
 
 
 @lib.deprecated
@@ -1020,6 +1707,7 @@ def register_plugin_path(path):
         return log.warning("Path already registered: {0}".format(path))
 
     _registered_paths.append(path)
+    _invalidate()
 
     return path
 
@@ -1033,11 +1721,13 @@ def deregister_plugin_path(path):
     """
 
     _registered_paths.remove(path)
+    _invalidate()
 
 
 def deregister_all_paths():
     """Mainly used in tests"""
     _registered_paths[:] = []
+    _invalidate()
 
 
 def registered_paths():
@@ -1086,6 +1776,7 @@ def register_host(host):
 
     if host not in _registered_hosts:
         _registered_hosts.append(host)
+        _invalidate()
 
 
 def deregister_host(host, quiet=False):
@@ -1104,10 +1795,13 @@ def deregister_host(host, quiet=False):
     except Exception as e:
         if not quiet:
             raise e
+    else:
+        _invalidate()
 
 
 def deregister_all_hosts():
     _registered_hosts[:] = []
+    _invalidate()
 
 
 def registered_hosts():
@@ -1138,6 +1832,7 @@ def register_target(target):
         _registered_targets.pop(idx)
 
     _registered_targets.append(target)
+    _invalidate_targets()
 
 
 def deregister_target(target, quiet=False):
@@ -1156,10 +1851,13 @@ def deregister_target(target, quiet=False):
     except Exception as e:
         if not quiet:
             raise e
+    else:
+        _invalidate_targets()
 
 
 def deregister_all_targets():
     _registered_targets[:] = []
+    _invalidate_targets()
 
 
 def registered_targets():
@@ -1206,7 +1904,12 @@ def plugin_paths():
     return paths
 
 
-def discover(type=None, regex=None, paths=None):
+def discover(type=None,
+             regex=None,
+             paths=None,
+             workers=None,
+             cached=False,
+             report=None):
     """Find and return available plug-ins
 
     This function looks for files within paths registered via
@@ -1228,6 +1931,22 @@ def discover(type=None, regex=None, paths=None):
             multiple plugins.
         paths (list, optional): Paths to discover plug-ins from.
             If no paths are provided, all paths are searched.
+        workers (int, optional): Number of threads with which to
+            scan and read files concurrently, useful on high-latency
+            network storage. Plug-ins are executed serially and in
+            order regardless. Defaults to scanning serially.
+        cached (bool, optional): Return the result of a previous
+            discovery of the same paths, unless registrations have
+            changed since, see :func:`generation`. Changes to files
+            are not picked up, and the plug-ins returned are shared
+            with other callers. Any call without `cached` updates
+            the result returned to subsequent cached calls.
+        report (dict, optional): Profile discovery and store the
+            results here. "files" holds the time spent in seconds on
+            each file, per phase; "stat", "read", "compile", "load"
+            (of cached compiled code), "exec" and "filter" along
+            with their "total". "skipped" holds files and plug-ins
+            that were skipped, along with the reason why.
 
     """
 
@@ -1238,66 +1957,449 @@ def discover(type=None, regex=None, paths=None):
         warnings.warn("discover(): regex argument "
                       "has been deprecated and does nothing")
 
+    paths = list(paths or plugin_paths())
+    key = tuple(paths)
+
+    if cached and key in _discovered:
+        return list(_discovered[key])
+
     plugins = dict()
+    timings = dict() if report is not None else None
+    skipped = list()
+
+    def skip(abspath, reason, plugin=None):
+        log.debug("Skipped: \"%s\" (%s)", plugin or abspath, reason)
+
+        if report is not None:
+            skipped.append({
+                "path": abspath,
+                "plugin": plugin,
+                "reason": str(reason),
+            })
+
+    # Persistent metadata of previously discovered files
+    cache = discovery.cache_path()
+    manifest = discovery.Manifest(cache) if cache else None
 
     # Include plug-ins from registered paths
-    for path in paths or plugin_paths():
-        path = os.path.normpath(path)
-        if not os.path.isdir(path):
+    files = discovery.scan(paths, workers, timings)
+    discovery.release(paths, files, manifest)
+
+    candidates = list()
+    for abspath, stamp in files:
+        if manifest is not None:
+            metadata = manifest.get(abspath, stamp)
+
+            # Files known not to provide any compatible plug-ins
+            # need not be executed until either they change or
+            # another host is registered.
+            if metadata is not None and not any(
+                    _metadata_is_compatible(data) for data in metadata):
+                skip(abspath, "no compatible plug-ins (cached)")
+                continue
+
+        candidates.append((abspath, stamp))
+
+    # Compile ahead of execution, such that reads may overlap
+    codes = discovery.compile_files(candidates, workers, timings)
+
+    # Execution is serial and in order, for deterministic results
+    for (abspath, stamp), code in zip(candidates, codes):
+        start = timeit.default_timer()
+
+        try:
+            module = _module_from_code(abspath, code)
+        except Exception as err:
+            # Failing files are often the slowest, e.g. due to a timeout
+            if timings is not None:
+                timings[abspath]["exec"] = timeit.default_timer() - start
+
+            skip(abspath, err)
             continue
 
-        for fname in os.listdir(path):
-            if fname.startswith("_"):
+        executed = timeit.default_timer()
+
+        if manifest is not None:
+            manifest.set(abspath, stamp, metadata_from_module(module))
+
+        found = _plugins_from_file(module)
+
+        if timings is not None:
+            timings[abspath]["exec"] = executed - start
+            timings[abspath]["filter"] = timeit.default_timer() - executed
+
+        if not found:
+            skip(abspath, "no compatible plug-ins")
+
+        for plugin in found:
+            if plugin.__name__ in plugins:
+                skip(abspath, "duplicate", plugin.__name__)
                 continue
 
-            abspath = os.path.join(path, fname)
+            plugins[plugin.__name__] = plugin
+
+    # Include plug-ins from registration.
+    # Directly registered plug-ins take precedence.
+    _include_plugins(plugins, registered_plugins())
+
+    if manifest is not None:
+        manifest.save()
+
+    plugins = list(plugins.values())
+    sort(plugins)  # In-place
+
+    _discovered[key] = list(plugins)
+
+    if report is not None:
+        phases = ("stat", "read", "compile", "load", "exec", "filter")
+        report["files"] = list()
+
+        for abspath, _ in files:
+            timing = dict((phase, timings[abspath].get(phase, 0.0))
+                          for phase in phases)
+            timing["total"] = sum(timing.values())
+            timing["path"] = abspath
+            report["files"].append(timing)
+
+        report["skipped"] = skipped
+
+    return plugins
+
+
+def _module_from_code(abspath, code):
+    """Execute compiled `code` of file `abspath` into a new module
+
+    Raises:
+        Any exception raised by `code`, or `code` itself
+            in case of it being an exception.
+
+    """
+
+    if isinstance(code, Exception):
+        raise code
+
+    mod_name = os.path.splitext(os.path.basename(abspath))[0]
+    module = types.ModuleType(mod_name)
+    module.__file__ = abspath
+
+    six.exec_(code, module.__dict__)
 
-            if not os.path.isfile(abspath):
+    # Store reference to original module, to avoid
+    # garbage collection from collecting it's global
+    # imports, such as `import os`.
+    sys.modules[abspath] = module
+
+    return module
+
+
+def _plugins_from_file(module):
+    """Return plug-ins from `module`, executed from a file"""
+    plugins = plugins_from_module(module)
+
+    for plugin in plugins:
+        plugin.__module__ = module.__file__
+
+    return plugins
+
+
+def _include_plugins(plugins, candidates):
+    """Add `candidates` to dictionary `plugins`, unless already there"""
+    for plugin in candidates:
+        if plugin.__name__ in plugins:
+            log.debug("Duplicate plug-in found: %s", plugin)
+            continue
+
+        plugins[plugin.__name__] = plugin
+
+
+class Discoverer(object):
+    """Incremental discovery, for long-lived sessions
+
+    Keeps track of each discovered file, such that subsequent
+    calls to :meth:`discover` only execute files that have been
+    added or changed since the last call. Files are considered
+    changed once their contents change; merely touching a file
+    does not cause it to be executed again.
+
+    Differences between calls are emitted as "pluginsChanged",
+    along with the added, changed and removed plug-ins.
+
+    Arguments:
+        paths (list, optional): Paths to discover plug-ins from,
+            defaults to :func:`plugin_paths` at the time of discovery.
+        workers (int, optional): See :func:`discover`
+
+    Example:
+        >>> discoverer = Discoverer()
+        >>> plugins = discoverer.discover()
+        >>> # Nothing has changed, nothing is executed
+        >>> [p.id for p in plugins] == [p.id for p in discoverer.discover()]
+        True
+
+    """
+
+    def __init__(self, paths=None, workers=None):
+        self.paths = paths
+        self.workers = workers
+
+        # abspath -> (stamp, digest, module)
+        self._files = dict()
+        self._plugins = dict()
+
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def discover(self):
+        """Return available plug-ins, executing only what has changed"""
+
+        with self._lock:
+            return self._discover()
+
+    def _discover(self):
+        paths = self.paths or plugin_paths()
+        scanned = discovery.scan(paths, self.workers)
+        discovery.release(paths, scanned)
+
+        files = dict()
+        order = list()
+        changed = list()
+
+        for abspath, stamp in scanned:
+            order.append(abspath)
+            previous = self._files.get(abspath)
+
+            if previous is not None and previous[0] == stamp:
+                files[abspath] = previous
                 continue
 
-            mod_name, mod_ext = os.path.splitext(fname)
+            try:
+                digest = discovery.digest(abspath)
+            except (IOError, OSError):
+                order.remove(abspath)
+                continue
 
-            if not mod_ext == ".py":
+            if previous is not None and previous[1] == digest:
+                files[abspath] = (stamp, digest, previous[2])
                 continue
 
-            module = types.ModuleType(mod_name)
-            module.__file__ = abspath
+            files[abspath] = (stamp, digest, None)
+            changed.append((abspath, stamp))
+
+        codes = discovery.compile_files(changed, self.workers)
 
+        for (abspath, stamp), code in zip(changed, codes):
             try:
-                with open(abspath) as f:
-                    six.exec_(f.read(), module.__dict__)
+                module = _module_from_code(abspath, code)
+            except Exception as err:
+                log.debug("Skipped: \"%s\" (%s)", abspath, err)
+                continue
+
+            files[abspath] = files[abspath][:2] + (module,)
+
+        self._files = files
+
+        plugins = dict()
+        for abspath in order:
+            module = files[abspath][2]
+            if module is not None:
+                _include_plugins(plugins, _plugins_from_file(module))
+
+        _include_plugins(plugins, registered_plugins())
+
+        previous, self._plugins = self._plugins, plugins
+
+        added = list()
+        changed = list()
+        for name, plugin in plugins.items():
+            if name not in previous:
+                added.append(plugin)
+            elif previous[name].id != plugin.id:
+                changed.append(plugin)
+
+        removed = list(plugin for name, plugin in previous.items()
+                       if name not in plugins)
 
-                # Store reference to original module, to avoid
-                # garbage collection from collecting it's global
-                # imports, such as `import os`.
-                sys.modules[abspath] = module
+        if added or changed or removed:
+            lib.emit("pluginsChanged",
+                     added=sort(added),
+                     changed=sort(changed),
+                     removed=sort(removed))
 
+        plugins = list(plugins.values())
+        sort(plugins)  # In-place
+
+        return plugins
+
+    def start(self, interval=2.0):
+        """Discover every `interval` seconds in a background thread
+
+        Polling works on any file system, including network storage,
+        without additional dependencies. Note that "pluginsChanged"
+        is then emitted from the polling thread.
+
+        """
+        self.stop()
+        self._stopped.clear()
+
+        def poll():
+            while not self._stopped.is_set():
+                try:
+                    self.discover()
+                except Exception:
+                    log.exception("Discovery failed")
+
+                self._stopped.wait(interval)
+
+        self._thread = threading.Thread(target=poll, name="Discoverer")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stop polling, if started"""
+        if self._thread is None:
+            return
+
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+
+
+def plugin_metadata(plugin):
+    """Return serialisable metadata of plug-in `plugin`
+
+    Metadata is stored in the persistent discovery cache and
+    allows plug-ins to be assessed without executing the
+    module in which they are defined.
+
+    Arguments:
+        plugin (Plugin): Plug-in to describe
+
+    """
+
+    valid = plugin_is_valid(plugin) and version_is_compatible(plugin)
+
+    metadata = {
+        "name": plugin.__name__,
+        "valid": valid,
+    }
+
+    if valid:
+        metadata.update({
+            "order": plugin.order,
+            "families": list(plugin.families),
+            "hosts": list(plugin.hosts),
+            "targets": list(plugin.targets),
+            "requires": plugin.requires,
+        })
+
+    return metadata
+
+
+def _metadata_is_compatible(metadata):
+    """Equivalent of :func:`plugins_from_module` for plug-in metadata"""
+    if not metadata["valid"]:
+        return False
+
+    if "*" in metadata["hosts"]:
+        return True
+
+    return any(lib.matches_any(host, metadata["hosts"])
+               for host in registered_hosts())
+
+
+def manifest(paths=None):
+    """Return metadata of available plug-ins, without importing them
+
+    Plug-ins are described as per :func:`plugin_metadata`, along
+    with the "file" from which they originate. Only files that have
+    changed since they were last discovered are executed, making
+    this a cheap alternative to :func:`discover` for when plug-ins
+    need only be listed, as opposed to processed.
+
+    Plug-ins are filtered by host, like :func:`discover`, but not by
+    target; targets are included for the caller to filter by.
+
+    Without a persistent cache, see :mod:`pyblish.discovery`, every
+    file is executed like in :func:`discover`.
+
+    Arguments:
+        paths (list, optional): Paths to discover plug-ins from.
+            If no paths are provided, all paths are searched.
+
+    Returns:
+        List of metadata, sorted by order
+
+    """
+
+    cache = discovery.cache_path()
+    persistent = discovery.Manifest(cache) if cache else None
+
+    plugins = dict()
+
+    for abspath, stamp in discovery.scan(paths or plugin_paths()):
+        metadata = None
+        if persistent is not None:
+            metadata = persistent.get(abspath, stamp)
+
+        if metadata is None:
+            try:
+                code = discovery.compile_file(abspath, stamp)
+                module = _module_from_code(abspath, code)
             except Exception as err:
-                log.debug("Skipped: \"%s\" (%s)", mod_name, err)
+                log.debug("Skipped: \"%s\" (%s)", abspath, err)
                 continue
 
-            for plugin in plugins_from_module(module):
-                if plugin.__name__ in plugins:
-                    log.debug("Duplicate plug-in found: %s", plugin)
-                    continue
+            metadata = metadata_from_module(module)
 
-                plugin.__module__ = module.__file__
-                plugins[plugin.__name__] = plugin
+            if persistent is not None:
+                persistent.set(abspath, stamp, metadata)
 
-    # Include plug-ins from registration.
-    # Directly registered plug-ins take precedence.
-    for plugin in registered_plugins():
-        if plugin.__name__ in plugins:
-            log.debug("Duplicate plug-in found: %s", plugin)
-            continue
-        plugins[plugin.__name__] = plugin
+        for data in metadata:
+            if not _metadata_is_compatible(data):
+                continue
+
+            if data["name"] in plugins:
+                log.debug("Duplicate plug-in found: %s", data["name"])
+                continue
+
+            data = dict(data, file=abspath)
+            plugins[data["name"]] = data
+
+    if persistent is not None:
+        persistent.save()
 
     plugins = list(plugins.values())
-    sort(plugins)  # In-place
+    plugins.sort(key=lambda data: data["order"])
 
     return plugins
 
 
+def metadata_from_module(module):
+    """Return metadata of all plug-ins defined in `module`
+
+    Unlike :func:`plugins_from_module`, this includes
+    invalid and incompatible plug-ins.
+
+    Arguments:
+        module (types.ModuleType): Executed module
+
+    """
+
+    metadata = list()
+
+    for name in dir(module):
+        if name.startswith("_"):
+            continue
+
+        obj = getattr(module, name)
+
+        if inspect.isclass(obj) and issubclass(obj, Plugin):
+            metadata.append(plugin_metadata(obj))
+
+    return metadata
+
+
 def plugins_from_module(module):
     """Return plug-ins from module
 
@@ -1410,7 +2512,8 @@ def version_is_compatible(plugin):
 def host_is_compatible(plugin):
     """Determine whether plug-in `plugin` is compatible with the current host
 
-    Available hosts are determined by :func:`registered_hosts`.
+    Available hosts are determined by :func:`registered_hosts`, and
+    may be matched by wildcard patterns of a plug-in, e.g. "maya*".
 
     Arguments:
         plugin (Plugin): Plug-in to assess.
@@ -1420,7 +2523,169 @@ def host_is_compatible(plugin):
     if "*" in plugin.hosts:
         return True
 
-    return any(host in plugin.hosts for host in registered_hosts())
+    return any(lib.matches_any(host, plugin.hosts)
+               for host in registered_hosts())
+
+
+class Registry(object):
+    """Immutable snapshot of registrations and the plug-ins they yield
+
+    Plug-ins are indexed by order, hosts and targets of the snapshot
+    on creation, and by any other host or combination of targets
+    on first query, such that repeated queries during publishing
+    need not consult the registered globals. A snapshot is never
+    modified after creation, other than by filling these caches
+    under a lock, and may be shared between threads.
+
+    Arguments:
+        plugins (list, optional): Plug-ins of snapshot, defaults
+            to the result of :func:`discover`
+        hosts (list, optional): Defaults to :func:`registered_hosts`
+        targets (list, optional): Defaults to :func:`registered_targets`
+
+    Attributes:
+        version (int): :func:`generation` at the time of the snapshot
+
+    Example:
+        >>> class MyPlugin(ContextPlugin):
+        ...     hosts = ["maya"]
+        ...     targets = ["studio"]
+        ...
+        >>> registry = Registry([MyPlugin], hosts=["maya"], targets=[])
+        >>> registry.plugins_by_host("maya") == [MyPlugin]
+        True
+        >>> registry.plugins_by_targets(targets=["default"])
+        []
+        >>> registry.plugins_by_targets(targets=["studio"]) == [MyPlugin]
+        True
+
+    """
+
+    def __init__(self, plugins=None, hosts=None, targets=None):
+        # Read-only properties
+        self._version = generation()
+        self._paths = tuple(plugin_paths())
+        self._hosts = tuple(registered_hosts() if hosts is None else hosts)
+        self._targets = tuple(
+            registered_targets() if targets is None else targets)
+        self._plugins = tuple(discover() if plugins is None else plugins)
+
+        self._members = frozenset(self._plugins)
+        self._compatible = dict()
+        self._by_host = dict()
+        self._lock = threading.Lock()
+
+        by_order = dict()
+
+        for plugin in self._plugins:
+            by_order.setdefault(plugin.order, list()).append(plugin)
+
+        for host in self._hosts:
+            self.plugins_by_host(host)
+
+        self.plugins_by_targets()
+
+        self._by_order = tuple(
+            (order, tuple(by_order[order]))
+            for order in sorted(by_order)
+        )
+
+    def __repr__(self):
+        return "%s(version=%d, plugins=%d)" % (
+            type(self).__name__, self._version, len(self._plugins))
+
+    @property
+    def version(self):
+        return self._version
+
+    @property
+    def paths(self):
+        return self._paths
+
+    @property
+    def hosts(self):
+        return self._hosts
+
+    @property
+    def targets(self):
+        return self._targets
+
+    @property
+    def plugins(self):
+        return self._plugins
+
+    def is_current(self):
+        """Return whether nothing has been (de)registered since snapshot
+
+        Targets are not considered, as they are registered on every
+        publish, and those of a snapshot are fixed on creation.
+
+        """
+
+        return self._version == generation()
+
+    def by_order(self):
+        """Return plug-ins grouped by order, as (order, plug-ins) pairs"""
+        return self._by_order
+
+    def plugins_by_host(self, host):
+        """Return plug-ins of snapshot compatible with `host`"""
+        try:
+            plugins = self._by_host[host]
+        except KeyError:
+            plugins = tuple(
+                plugin for plugin in self._plugins
+                if lib.matches_any(host, plugin.hosts)
+            )
+
+            with self._lock:
+                plugins = self._by_host.setdefault(host, plugins)
+
+        return list(plugins)
+
+    def host_is_compatible(self, plugin):
+        """Return whether `plugin` supports a host of this snapshot"""
+        return "*" in plugin.hosts or any(
+            lib.matches_any(host, plugin.hosts) for host in self._hosts)
+
+    def plugins_by_targets(self, plugins=None, targets=None):
+        """Return `plugins` compatible with `targets`
+
+        Equivalent to :func:`pyblish.logic.plugins_by_targets`, with
+        compatibility computed once per combination of targets.
+
+        Arguments:
+            plugins (list, optional): Plug-ins to filter, defaults to
+                the plug-ins of this snapshot
+            targets (list, optional): Targets to filter by, defaults
+                to the targets of this snapshot
+
+        """
+
+        # Imported here, as pyblish.logic imports this module
+        from . import logic
+
+        plugins = self._plugins if plugins is None else plugins
+        targets = self._targets if targets is None else targets
+        key = tuple(targets)
+
+        try:
+            compatible = self._compatible[key]
+        except KeyError:
+            compatible = frozenset(
+                logic.plugins_by_targets(self._plugins, targets))
+
+            with self._lock:
+                compatible = self._compatible.setdefault(key, compatible)
+
+        # Plug-ins from outside of this snapshot are matched as-is
+        foreign = frozenset(logic.plugins_by_targets(
+            list(p for p in plugins if p not in self._members), targets))
+
+        return [
+            plugin for plugin in plugins
+            if plugin in compatible or plugin in foreign
+        ]
 
 
 def sort(plugins):
@@ -1446,3 +2711,8 @@ def sort(plugins):
 
     plugins.sort(key=lambda p: p.order)
     return plugins
+
+
+# Retain every record by default
+deregister_retention()
+deregister_profiling()
@@ -0,0 +1,378 @@
+"""Process pool for CPU-bound plug-ins
+
+Instances of plug-ins with `parallel = "process"` may be processed in
+a pool of worker processes, see :func:`pyblish.util.publish`. Pools are
+kept alive and reused across publishes.
+
+Plug-ins are shipped by reference - the name or path of their module
+along with their class name - and resolved anew within each worker.
+Data of each instance and its context is shipped along, and any change
+made to it by the plug-in is merged back into the parent Context.
+Members of data that cannot be pickled are not available to workers.
+
+Members left equal to what was shipped are not merged, and so keep
+their identity. A member of context data changed differently by more
+than one instance is not merged at all, and fails each of them.
+
+"""
+
+import os
+import sys
+import atexit
+import pickle
+import logging
+import threading
+import multiprocessing
+
+from . import plugin, discovery, lib
+
+log = logging.getLogger("pyblish.processes")
+
+_pools = dict()
+_lock = threading.Lock()
+
+# Modules resolved within a worker, by path
+_modules = dict()
+
+# Members of context data never shipped to workers
+_private = ("results",)
+
+
+def get_pool(workers):
+    """Return pool of `workers` processes, starting it if necessary"""
+    with _lock:
+        try:
+            return _pools[workers]
+        except KeyError:
+            pool = _pools[workers] = multiprocessing.Pool(workers)
+            return pool
+
+
+def shutdown():
+    """Terminate all pools"""
+    with _lock:
+        for pool in _pools.values():
+            pool.terminate()
+            pool.join()
+
+        _pools.clear()
+
+
+atexit.register(shutdown)
+
+
+def reference(Plugin):
+    """Return picklable reference to `Plugin`, or None
+
+    Plug-ins defined in functions or in __main__ cannot be resolved
+    from another process, and neither can plug-ins whose module has
+    no file. Copies of a plug-in, as made by
+    :func:`pyblish.plugin.registered_plugins`, refer to their original.
+
+    """
+
+    candidates = [Plugin] + [
+        base for base in Plugin.__bases__
+        if base.__name__ == Plugin.__name__
+    ]
+
+    for candidate in candidates:
+        module = sys.modules.get(candidate.__module__)
+
+        if candidate.__module__ == "__main__":
+            continue
+
+        if not getattr(module, "__file__", None):
+            continue
+
+        if getattr(module, candidate.__name__, None) is not candidate:
+            continue
+
+        return candidate.__module__, candidate.__name__
+
+
+def produce(Plugin, context, instances, workers):
+    """Produce a result per instance of `instances`, in a pool of processes
+
+    Results are returned in the order of `instances` with changes to
+    data already merged, but are yet to be committed, see
+    :func:`pyblish.plugin.commit`.
+
+    Arguments:
+        Plugin (Plugin): Plug-in to process
+        context (Context): The current Context
+        instances (list): Instances to process
+        workers (int): Number of processes in pool
+
+    """
+
+    ref = reference(Plugin)
+
+    if ref is None:
+        log.warning("%s could not be shipped to another process, "
+                    "processing in this process instead." % Plugin)
+        return [plugin.produce(Plugin, context, instance)
+                for instance in instances]
+
+    shipped = _ship(context.data, exclude=_private)
+
+    tasks = [
+        (ref, shipped, instance.name, _ship(instance.data))
+        for instance in instances
+    ]
+
+    outcomes = get_pool(workers).map(_produce, tasks)
+    conflicts = _conflicts(outcomes)
+
+    results = list()
+    for instance, outcome in zip(instances, outcomes):
+        if outcome is None:
+            log.warning("%s could not be resolved in another process, "
+                        "processing in this process instead." % Plugin)
+            results.append(plugin.produce(Plugin, context, instance))
+        else:
+            results.append(
+                _merge(Plugin, context, instance, outcome, conflicts))
+
+    return results
+
+
+def _ship(data, exclude=()):
+    """Return members of `data` pickled individually, where possible"""
+    shipped = dict()
+
+    for key, value in data.items():
+        if key in exclude:
+            continue
+
+        try:
+            shipped[key] = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            log.debug("Could not ship \"%s\" to another process" % key)
+
+    return shipped
+
+
+def _unship(shipped):
+    return dict(
+        (key, pickle.loads(value))
+        for key, value in shipped.items()
+    )
+
+
+def _equal(a, b):
+    try:
+        return bool(a == b)
+    except Exception:
+        return False
+
+
+def _unchanged(value, shipped):
+    """Return whether `value` is equal to what was `shipped`
+
+    Pickles of equal values may still differ, such as of sets whose
+    order depends on the seed of hashes of each process, and so values
+    are compared as-is first and by their pickle otherwise.
+
+    """
+
+    try:
+        if _equal(value, pickle.loads(shipped)):
+            return True
+
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL) == shipped
+
+    except Exception:
+        return False
+
+
+def _changes(data, shipped, exclude=()):
+    """Return members of `data` changed since shipped, and those removed"""
+    changed = dict()
+
+    for key, value in data.items():
+        if key in exclude:
+            continue
+
+        if key in shipped and _unchanged(value, shipped[key]):
+            continue
+
+        try:
+            value = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            log.warning("Could not ship \"%s\" from another process" % key)
+            continue
+
+        changed[key] = value
+
+    removed = list(key for key in shipped if key not in data)
+
+    return changed, removed
+
+
+_removed = object()
+
+
+def _conflicts(outcomes):
+    """Return members of context data changed differently by outcomes"""
+    written = dict()
+    conflicts = set()
+
+    for outcome in outcomes:
+        if outcome is None:
+            continue
+
+        changed, removed = outcome["context"]
+        writes = [(key, pickle.loads(value))
+                  for key, value in changed.items()]
+        writes += [(key, _removed) for key in removed]
+
+        for key, value in writes:
+            if key not in written:
+                written[key] = value
+            elif not _equal(written[key], value):
+                conflicts.add(key)
+
+    return conflicts
+
+
+def _merge(Plugin, context, instance, outcome, conflicts=()):
+    """Apply `outcome` of a worker to `context` and `instance`
+
+    Members of context data in `conflicts` are left untouched, and
+    fail the result of each instance that changed them.
+
+    """
+
+    error = outcome["error"]
+    conflicting = list()
+
+    for entity, (changed, removed) in ((context, outcome["context"]),
+                                       (instance, outcome["instance"])):
+        for key, value in changed.items():
+            if entity is context and key in conflicts:
+                conflicting.append(key)
+                continue
+
+            entity.data[key] = pickle.loads(value)
+
+        for key in removed:
+            if entity is context and key in conflicts:
+                conflicting.append(key)
+                continue
+
+            entity.data.pop(key, None)
+
+    if conflicting and error is None:
+        try:
+            raise ValueError("Context data changed by more than one "
+                             "instance: %s" % ", ".join(sorted(conflicting)))
+        except ValueError as e:
+            lib.extract_traceback(e)
+            error = e
+
+    # Retained as per the policy of this process
+    records = plugin._records()
+    for record in outcome["records"]:
+        record = plugin._retain(logging.makeLogRecord(record))
+        if record is not None:
+            records.append(record)
+
+    return {
+        "success": outcome["success"] and not conflicting,
+        "plugin": Plugin,
+        "instance": instance,
+        "action": None,
+        "error": error,
+        "records": list(records),
+        "duration": outcome["duration"],
+        "processTime": outcome["processTime"],
+        "threadTime": outcome["threadTime"],
+        "memory": outcome["memory"],
+    }
+
+
+# Worker
+#
+# The below members run within worker processes.
+
+
+def _resolve(ref):
+    """Return plug-in of reference `ref`, as made by :func:`reference`"""
+    module, name = ref
+
+    if os.path.isfile(module):
+        stamp = discovery.stamp(os.stat(module))
+
+        try:
+            previous, resolved = _modules[module]
+            assert previous == stamp
+        except (KeyError, AssertionError):
+            code = discovery.compile_file(module, stamp)
+            resolved = plugin._module_from_code(module, code)
+            _modules[module] = (stamp, resolved)
+
+    else:
+        # importlib is unavailable on Python 2.6
+        __import__(module)
+        resolved = sys.modules[module]
+
+    return getattr(resolved, name)
+
+
+def _produce(task):
+    ref, context_data, name, instance_data = task
+
+    try:
+        Plugin = _resolve(ref)
+        context_data_ = _unship(context_data)
+        instance_data_ = _unship(instance_data)
+    except Exception:
+        return None
+
+    context = plugin.Context()
+    context.data.update(context_data_)
+
+    instance = context.create_instance(name)
+    instance.data.clear()
+    instance.data.update(instance_data_)
+
+    result = plugin.produce(Plugin, context, instance)
+
+    return {
+        "success": result["success"],
+        "error": _portable_error(result["error"]),
+        "records": [_portable_record(record)
+                    for record in result["records"]],
+        "duration": result["duration"],
+        "processTime": result["processTime"],
+        "threadTime": result["threadTime"],
+        "memory": result["memory"],
+        "context": _changes(context.data, context_data, exclude=_private),
+        "instance": _changes(instance.data, instance_data),
+    }
+
+
+def _portable_error(error):
+    """Return `error`, or an equivalent that survives pickling"""
+    if error is None:
+        return None
+
+    try:
+        pickle.loads(pickle.dumps(error, pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        portable = Exception("%s: %s" % (type(error).__name__, error))
+        portable.traceback = getattr(error, "traceback", None)
+        portable.stack = getattr(error, "stack", None)
+        return portable
+
+    return error
+
+
+def _portable_record(record):
+    """Return attributes of `record`, free of unpicklable arguments"""
+    attributes = dict(record.__dict__)
+    attributes["msg"] = record.getMessage()
+    attributes["args"] = None
+    attributes["exc_info"] = None
+    return attributes
@@ -0,0 +1,290 @@
+"""Dependency-aware scheduling of plug-ins
+
+Plug-ins are otherwise processed one at a time, in order. Plug-ins
+declaring the members of `data` they read and write, see
+:attr:`pyblish.plugin.Plugin.reads`, may instead be processed alongside
+any other plug-in they do not share data with, regardless of order.
+
+A plug-in depends on every plug-in preceding it that either writes
+what it reads or writes, or reads what it writes. Plug-ins without
+declarations depend on, and are depended upon by, every other plug-in,
+such that without declarations processing happens strictly in order,
+on the calling thread. Instance plug-ins implicitly read "instances".
+
+The registered test is evaluated ahead of each plug-in as though every
+preceding plug-in still being processed had failed. Should the test
+fail, the plug-in waits for those to finish, whereupon the test is
+evaluated anew. Results are committed in the order they would have
+been without scheduling, and results of plug-ins that finished ahead
+of a test stopping the publish are discarded.
+
+"""
+
+import logging
+from multiprocessing.pool import ThreadPool
+
+from .vendor.six.moves import queue
+
+from . import plugin, logic
+
+log = logging.getLogger("pyblish.scheduler")
+
+
+def declarations(Plugin):
+    """Return names of data read and written by `Plugin`, or None
+
+    Arguments:
+        Plugin (Plugin): Plug-in whose declarations to return
+
+    Returns:
+        Pair of sets of names, or None without declarations
+
+    """
+
+    if Plugin.reads is None and Plugin.writes is None:
+        return None
+
+    reads = set(Plugin.reads or [])
+    writes = set(Plugin.writes or [])
+
+    if Plugin.__instanceEnabled__:
+        reads.add("instances")
+
+    return reads, writes
+
+
+def is_declared(Plugin):
+    """Return whether `Plugin` declares the data it reads or writes"""
+    return declarations(Plugin) is not None
+
+
+def dependencies(plugins):
+    """Return indices of preceding plug-ins each of `plugins` depends upon
+
+    Example:
+        >>> from pyblish import api
+        >>> class CollectA(api.ContextPlugin):
+        ...     writes = ["a"]
+        >>> class CollectB(api.ContextPlugin):
+        ...     writes = ["b"]
+        >>> class Validate(api.ContextPlugin):
+        ...     reads = ["a"]
+        >>> class Undeclared(api.ContextPlugin):
+        ...     pass
+        >>> plugins = [CollectA, CollectB, Validate, Undeclared]
+        >>> [sorted(required) for required in dependencies(plugins)]
+        [[], [], [0], [0, 1, 2]]
+
+    """
+
+    declared = list(declarations(Plugin) for Plugin in plugins)
+    required = list()
+
+    for index, current in enumerate(declared):
+        preceding = set()
+
+        for earlier in range(index):
+            other = declared[earlier]
+
+            if current is None or other is None:
+                preceding.add(earlier)
+                continue
+
+            reads, writes = current
+            other_reads, other_writes = other
+
+            if other_writes & (reads | writes) or other_reads & writes:
+                preceding.add(earlier)
+
+        required.append(preceding)
+
+    return required
+
+
+def run(plugins, context, pool, state=None, registry=None, workers=None,
+        targets=None):
+    """Process `plugins` on `pool`, alongside each other where possible
+
+    Yields results in the order they would have been produced when
+    processing one plug-in at a time, as each becomes available.
+    Instances of parallel plug-ins are processed concurrently, as
+    they would be by :func:`pyblish.util.publish`.
+
+    Arguments:
+        plugins (list, Plan): Plug-ins to process, or a plan of
+            steps as compiled by :func:`pyblish.logic.plan`
+        context (Context): The current Context
+        pool (ThreadPool): Threads on which to process plug-ins
+        state (dict, optional): Mutable state, see
+            :func:`pyblish.logic.Iterator`
+        registry (Registry, optional): Snapshot from which to take
+            targets, in place of those currently registered
+        workers (int, optional): Number of threads, or processes, with
+            which to process instances of parallel plug-ins
+        targets (list, optional): Targets with which plug-ins must be
+            compatible, in place of those of `registry` or those
+            currently registered
+
+    """
+
+    # Imported here, as pyblish.util imports this module
+    from . import util
+
+    test = logic.registered_test()
+    state = state or {
+        "nextOrder": None,
+        "ordersWithError": set()
+    }
+
+    if isinstance(plugins, logic.Plan):
+        plan = plugins
+        planned = dict((step["plugin"], step["instances"]) for step in plan)
+        steps = list(
+            (Plugin, planned.get(Plugin)) for Plugin in plan.plugins
+        )
+    else:
+        plan = None
+        steps = list(
+            (Plugin, None)
+            for Plugin in logic._by_targets(plugins, registry, targets)
+        )
+
+    steps = list(step for step in steps if step[0].active)
+    required = dependencies(list(Plugin for Plugin, _ in steps))
+
+    pending = list(range(len(steps)))
+    running = set()
+    finished = dict()  # index: results
+    completed = queue.Queue()
+    committed = 0
+    limit = len(steps)
+
+    # Instances are processed on threads of their own, as plug-ins
+    # processed on `pool` would otherwise wait on one another.
+    instance_pool = ThreadPool(workers) if any(
+        Plugin.__instanceEnabled__ and Plugin.parallel and
+        Plugin.parallel != "process" for Plugin, _ in steps) else None
+
+    def produce(Plugin, instances):
+        if not Plugin.__instanceEnabled__:
+            return [plugin.produce(Plugin, context)]
+
+        if Plugin.parallel:
+            return util._produce(Plugin, context, instances,
+                                 instance_pool, workers)
+
+        results = list()
+        for instance in instances:
+            if instance.data.get("publish") is False:
+                log.debug("%s was inactive, skipping.." % instance)
+                continue
+
+            results.append(plugin.produce(Plugin, context, instance))
+
+        return results
+
+    def process(index, isolated):
+        Plugin, instances = steps[index]
+
+        try:
+            # Instances changed since planning are matched anew,
+            # as are those of plug-ins planned without any.
+            if Plugin.__instanceEnabled__ and (
+                    instances is None or not plan.is_current(context)):
+                instances = logic.instances_by_plugin(context, Plugin)
+
+            if isolated:
+                with plugin._isolated():
+                    results = produce(Plugin, instances)
+            else:
+                results = produce(Plugin, instances)
+
+        except Exception as error:
+            completed.put((index, None, error))
+
+        else:
+            completed.put((index, results, None))
+
+    def start(index):
+        running.add(index)
+
+        if is_declared(steps[index][0]):
+            pool.apply_async(process, (index, True))
+
+        else:
+            # Nothing runs alongside plug-ins without declarations,
+            # and so they are processed here, as they would serially.
+            process(index, False)
+
+    try:
+        while True:
+            for index in list(pending):
+                if index >= limit:
+                    break
+
+                if not required[index].issubset(finished):
+                    continue
+
+                Plugin, _ = steps[index]
+
+                # Consider every preceding plug-in yet to finish as failed
+                unfinished = set(
+                    steps[other][0].order for other in range(index)
+                    if other not in finished
+                )
+
+                state["nextOrder"] = Plugin.order
+                message = test(
+                    nextOrder=Plugin.order,
+                    ordersWithError=state["ordersWithError"] | unfinished
+                )
+
+                if message:
+                    if not unfinished:
+                        log.debug("Stopped due to %s" % message)
+                        limit = index
+                        break
+
+                    # Wait for preceding plug-ins to finish
+                    continue
+
+                pending.remove(index)
+                start(index)
+
+            if not running:
+                break
+
+            index, results, error = completed.get()
+            running.remove(index)
+
+            if error is not None:
+                raise error
+
+            finished[index] = results
+
+            for result in results:
+                if result["error"] is not None:
+                    state["ordersWithError"].add(result["plugin"].order)
+
+            while committed in finished and committed < limit:
+                for result in finished[committed]:
+                    yield plugin.commit(result, context)
+
+                committed += 1
+
+        # Plug-ins following a failed test may have finished ahead
+        # of those preceding it, and are discarded along with those
+        # that never started.
+        for index in sorted(finished):
+            if index >= limit:
+                log.debug("Discarded results of %s" % steps[index][0])
+                continue
+
+            if index >= committed:
+                for result in finished[index]:
+                    yield plugin.commit(result, context)
+
+    finally:
+        if instance_pool is not None:
+            instance_pool.close()
+            instance_pool.join()
@@ -0,0 +1,207 @@
+"""Destinations of results
+
+Every result is written to each sink of the context it is committed
+to, see :attr:`pyblish.plugin.Context.sinks`, as it is produced. Sinks
+are any object with a `write(result)` and `close()` method.
+
+Results are otherwise also appended to `context.data["results"]`,
+growing for as long as the context lives. A bounded :class:`Ring`
+or a :class:`Summary` may be kept there instead, see
+:func:`pyblish.util.publish`.
+
+Example:
+    >>> from pyblish import api, util
+    >>> class Collect(api.ContextPlugin):
+    ...     def process(self, context):
+    ...         pass
+    >>> summary = Summary()
+    >>> context = util.publish(plugins=[Collect], results=summary)
+    >>> context.data["results"]
+    Summary(processed=1, succeeded=1, failed=0)
+
+"""
+
+import json
+import logging
+import threading
+import collections
+
+log = logging.getLogger("pyblish.sinks")
+
+
+def serialise(result):
+    """Return JSON-compatible equivalent of `result`
+
+    Example:
+        >>> from pyblish import api, plugin
+        >>> class Validate(api.ContextPlugin):
+        ...     def process(self, context):
+        ...         self.log.info("Validating")
+        >>> result = plugin.process(Validate, api.Context())
+        >>> serialised = serialise(result)
+        >>> serialised["plugin"], serialised["success"]
+        ('Validate', True)
+        >>> serialised["records"][0]["message"]
+        'Validating'
+
+    """
+
+    instance = result["instance"]
+    error = result["error"]
+    action = result.get("action")
+
+    serialised = {
+        "plugin": result["plugin"].__name__,
+        "order": getattr(result["plugin"], "order", None),
+        "instance": getattr(instance, "name", None),
+        "action": getattr(action, "__name__", action),
+        "success": result["success"],
+        "error": None,
+        "records": list(
+            {
+                "name": record.name,
+                "level": record.levelname,
+                "message": _message(record),
+                "created": record.created,
+            }
+            for record in result["records"]
+        ),
+        "duration": result["duration"],
+        "processTime": result.get("processTime"),
+        "threadTime": result.get("threadTime"),
+        "memory": result.get("memory"),
+    }
+
+    if error is not None:
+        traceback = getattr(error, "traceback", None)
+
+        serialised["error"] = {
+            "type": type(error).__name__,
+            "message": str(error),
+            "traceback": list(traceback) if traceback else None,
+            "stack": getattr(error, "stack", None),
+        }
+
+    return serialised
+
+
+def _message(record):
+    try:
+        return record.getMessage()
+    except Exception:
+        return str(record.msg)
+
+
+class JsonLines(object):
+    """Append each result to a file, as a line of JSON
+
+    The file is opened on the first result and appended to, such that
+    results of consecutive publishes may be written to the same file.
+    Each line is flushed as it is written, and so survives a crash of
+    the host.
+
+    Arguments:
+        path (str): Absolute path to file
+
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+
+    def write(self, result):
+        line = json.dumps(serialise(result), default=str)
+
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a")
+
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class Ring(collections.deque):
+    """Keep only the last `maxlen` results
+
+    Read like the list of `context.data["results"]`, except older
+    results are discarded as new ones are appended.
+
+    """
+
+    def __init__(self, maxlen):
+        super(Ring, self).__init__(maxlen=maxlen)
+
+    def write(self, result):
+        self.append(result)
+
+    def close(self):
+        pass
+
+
+class Summary(object):
+    """Keep counts of results, in place of the results themselves
+
+    Counts are kept overall, and per plug-in in `plugins` along with
+    its total duration and time spent computing. Errors are kept as
+    messages, not as the exceptions themselves. Iterating over a
+    summary yields no results.
+
+    """
+
+    def __init__(self):
+        self.processed = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.duration = 0.0
+        self.plugins = dict()
+        self.errors = list()
+
+    def __iter__(self):
+        return iter(())
+
+    def __len__(self):
+        return 0
+
+    def __repr__(self):
+        return "Summary(processed=%d, succeeded=%d, failed=%d)" % (
+            self.processed, self.succeeded, self.failed)
+
+    def append(self, result):
+        name = result["plugin"].__name__
+        plugin = self.plugins.setdefault(name, {
+            "processed": 0,
+            "failed": 0,
+            "duration": 0.0,
+            "processTime": 0.0,
+            "threadTime": 0.0,
+        })
+
+        duration = result["duration"] or 0.0
+        plugin["processTime"] += result.get("processTime") or 0.0
+        plugin["threadTime"] += result.get("threadTime") or 0.0
+
+        self.processed += 1
+        self.duration += duration
+        plugin["processed"] += 1
+        plugin["duration"] += duration
+
+        if result["success"]:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+            plugin["failed"] += 1
+
+        if result["error"] is not None:
+            self.errors.append("%s: %s" % (name, result["error"]))
+
+    write = append
+
+    def close(self):
+        pass
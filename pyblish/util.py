@@ -5,14 +5,27 @@ from __future__ import absolute_import
 # Standard library
 import logging
 import warnings
+from multiprocessing.pool import ThreadPool
 
 # Local library
-from . import api, logic, plugin, lib
+from . import api, logic, plugin, lib, processes, scheduler
+
+try:
+    # Python 3.5+
+    from .coroutines import publish as publish_async
+except SyntaxError:
+    publish_async = None
 
 log = logging.getLogger("pyblish.util")
 
 
-def publish(context=None, plugins=None, targets=None):
+def publish(context=None,
+            plugins=None,
+            targets=None,
+            registry=None,
+            workers=None,
+            sinks=None,
+            results=None):
     """Publish everything
 
     This function will process all available plugins of the
@@ -25,6 +38,22 @@ def publish(context=None, plugins=None, targets=None):
         plugins (list, optional): Plug-ins to include,
             defaults to results of discover()
         targets (list, optional): Targets to include for publish session.
+        registry (Registry, optional): Snapshot of registrations,
+            providing plug-ins in place of discover() along with
+            targets in addition to `targets`, used as-is
+        workers (int, optional): Number of threads with which to process
+            the instances of plug-ins with `parallel = True` concurrently,
+            or of processes for plug-ins with `parallel = "process"`.
+            Results are added to the context in order of instances, once
+            every instance of the plug-in has been processed. Plug-ins
+            declaring what they read and write are processed alongside
+            each other on these threads, see :mod:`pyblish.scheduler`.
+        sinks (list, optional): Destinations to which to write each
+            result as it is produced, closed once publishing finishes,
+            see :mod:`pyblish.sinks`
+        results (object, optional): Container in which to keep results
+            in memory, in place of a list in context.data["results"],
+            such as a bounded :class:`pyblish.sinks.Ring`
 
     Usage:
         >> context = plugin.Context()
@@ -33,78 +62,198 @@ def publish(context=None, plugins=None, targets=None):
 
     """
 
-    # Include "default" target when no targets are requested.
-    if targets is None:
-        targets = ["default"]
+    with _Session(context, plugins, targets, registry,
+                  sinks, results) as session:
+        context = session.context
+        pool = ThreadPool(workers) if workers and workers > 1 else None
 
-    # Must check against None, as objects be emptys
-    context = api.Context() if context is None else context
-    plugins = api.discover() if plugins is None else plugins
+        # Schedule by declarations of plug-ins, where there are any
+        scheduled = pool is not None and any(
+            scheduler.is_declared(p) for p in session.plugins)
 
-    # Register targets
-    for target in targets:
-        api.register_target(target)
+        try:
+            # First pass, collection
+            if scheduled:
+                processed = scheduler.run(session.collectors, context, pool,
+                                          registry=session.registry,
+                                          workers=workers,
+                                          targets=session.compatible)
+            else:
+                batches = logic.batches(session.collectors, context,
+                                        registry=session.registry,
+                                        targets=session.compatible)
+                processed = _process(batches, context, pool, workers)
+
+            for result in processed:
+                pass
+
+            # Exclude plug-ins that do not have at
+            # least one compatible instance.
+            steps = session.plan()
+
+            # Second pass, the remainder
+            if scheduled:
+                processed = scheduler.run(steps, context, pool,
+                                          session.state,
+                                          registry=session.registry,
+                                          workers=workers)
+            else:
+                batches = logic.batches(steps, context, session.state)
+                processed = _process(batches, context, pool, workers)
+
+            for result in processed:
+                session.note(result)
+
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
 
-    # Do not consider inactive plug-ins
-    plugins = list(p for p in plugins if p.active)
-    collectors = list(p for p in plugins if lib.inrange(
-        number=p.order,
-        base=api.CollectorOrder)
-    )
+    return context
+
+
+class _Session(object):
+    """Setup and teardown of a publish, see :func:`publish`
+
+    Shared amongst ways of publishing, such that each need only
+    process the collectors followed by the steps of :meth:`plan`.
+    Targets are registered and sinks added to the context whilst
+    publishing, and "published" is emitted once it finishes.
+
+    """
+
+    def __init__(self, context=None, plugins=None, targets=None,
+                 registry=None, sinks=None, results=None):
 
-    # First pass, collection
-    for Plugin, instance in logic.Iterator(collectors, context):
-        plugin.process(Plugin, context, instance)
+        # Include "default" target when no targets are requested.
+        if targets is None:
+            targets = ["default"]
 
-    # Exclude collectors from further processing
-    plugins = list(p for p in plugins if p not in collectors)
+        # Must check against None, as objects be emptys
+        context = api.Context() if context is None else context
 
-    # Exclude plug-ins that do not have at
-    # least one compatible instance.
-    for Plugin in list(plugins):
-        if Plugin.__instanceEnabled__:
-            if not logic.instances_by_plugin(context, Plugin):
-                plugins.remove(Plugin)
+        # Plug-ins of a registry are compatible with its targets
+        # and those requested, without creating another registry.
+        compatible = None
 
-    # Mutable state, used in Iterator
-    state = {
-        "nextOrder": None,
-        "ordersWithError": set()
-    }
+        if registry is not None:
+            plugins = registry.plugins if plugins is None else plugins
+            compatible = registry.targets + tuple(
+                t for t in targets if t not in registry.targets)
 
-    # Second pass, the remainder
-    for Plugin, instance in logic.Iterator(plugins, context, state):
+        plugins = api.discover() if plugins is None else plugins
+
+        # Do not consider inactive plug-ins
+        plugins = list(p for p in plugins if p.active)
+        collectors = list(p for p in plugins if lib.inrange(
+            number=p.order,
+            base=api.CollectorOrder)
+        )
+
+        if results is not None:
+            context.data["results"] = results
+
+        self.context = context
+        self.plugins = plugins
+        self.collectors = collectors
+        self.targets = targets
+        self.compatible = compatible
+        self.registry = registry
+        self.sinks = list(sinks or [])
+
+        # Mutable state, used in Iterator
+        self.state = {
+            "nextOrder": None,
+            "ordersWithError": set()
+        }
+
+    def __enter__(self):
+        for target in self.targets:
+            api.register_target(target)
+
+        self.context.sinks.extend(self.sinks)
+        return self
+
+    def __exit__(self, type, value, tb):
         try:
-            result = plugin.process(Plugin, context, instance)
+            for sink in self.sinks:
+                self.context.sinks.remove(sink)
+                sink.close()
 
-        except StopIteration:  # End of items
-            raise
+            if type is None:
+                api.emit("published", context=self.context)
 
-        except:  # This is unexpected, most likely a bug
-            log.error("An exception occurred.\n")
-            raise
+        finally:
+            for target in self.targets:
+                api.deregister_target(target)
 
-        else:
-            # Make note of the order at which the
-            # potential error error occured.
-            if result["error"]:
-                state["ordersWithError"].add(Plugin.order)
+    def plan(self):
+        """Return plan of plug-ins following collection"""
+
+        # Exclude collectors from further processing
+        collected = set(self.collectors)
+        plugins = list(p for p in self.plugins if p not in collected)
 
-        if isinstance(result, Exception):
-            log.error("An unexpected error happened: %s" % result)
-            break
+        return logic.plan(plugins, self.context, registry=self.registry,
+                          targets=self.compatible)
 
+    def note(self, result):
+        """Make note of the order at which `result` failed, if it did"""
         error = result["error"]
         if error is not None:
+            self.state["ordersWithError"].add(result["plugin"].order)
             print(error)
 
-    api.emit("published", context=context)
 
-    # Deregister targets
-    for target in targets:
-        api.deregister_target(target)
+def _process(batches, context, pool=None, workers=None):
+    """Yield a result per instance of each batch, in order
 
-    return context
+    Instances of parallel plug-ins are produced concurrently on `pool`,
+    or on a pool of `workers` processes, and committed in order once
+    all of them have been processed.
+
+    """
+
+    for Plugin, instances in batches:
+        if instances is None:
+            yield plugin.process(Plugin, context)
+            continue
+
+        if pool is not None and Plugin.parallel:
+            for result in _produce(Plugin, context, instances,
+                                   pool, workers):
+                yield plugin.commit(result, context)
+
+        else:
+            for instance in instances:
+                if instance.data.get("publish") is False:
+                    log.debug("%s was inactive, skipping.." % instance)
+                    continue
+
+                yield plugin.process(Plugin, context, instance)
+
+
+def _produce(Plugin, context, instances, pool, workers=None):
+    """Return a result per instance of parallel `Plugin`, uncommitted
+
+    Instances are produced concurrently on `pool`, or on a pool
+    of `workers` processes for plug-ins with `parallel = "process"`,
+    and returned in order. Instances not to be published are skipped.
+
+    """
+
+    instances = list(
+        instance for instance in instances
+        if instance.data.get("publish") is not False
+    )
+
+    if Plugin.parallel == "process":
+        return processes.produce(Plugin, context, instances, workers)
+
+    return pool.map(
+        lambda instance: plugin.produce(Plugin, context, instance),
+        instances
+    )
 
 
 def collect(context=None, plugins=None, targets=["default"]):
@@ -14,5 +14,6 @@ warnings.warn = mock.MagicMock()
 
 if __name__ == '__main__':
     argv = sys.argv[:]
-    argv.extend(['--exclude=vendor', '--with-doctest', '--verbose'])
+    argv.extend(['--exclude=vendor', '--with-doctest', '--verbose',
+                 r'--ignore-files=^\.|^_|^setup\.py$|^coroutines\.py$'])
     nose.main(argv=argv)
@@ -45,6 +45,8 @@ def teardown():
     pyblish.api.deregister_all_plugins()
     pyblish.api.deregister_all_hosts()
     pyblish.api.deregister_test()
+    pyblish.api.deregister_retention()
+    pyblish.api.deregister_profiling()
     pyblish.api.__init__()
 
 
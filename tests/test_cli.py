@@ -83,6 +83,48 @@ def test_publishing():
     assert count["#"] == 111, count
 
 
+@with_setup(lib.setup_empty, lib.teardown)
+def test_publishing_results():
+    """Results may be written to a file"""
+
+    import json
+
+    class Collector(pyblish.api.ContextPlugin):
+        order = pyblish.api.CollectorOrder
+
+        def process(self, context):
+            self.log.warning("Running")
+
+    pyblish.api.register_plugin(Collector)
+
+    path = os.path.join(self.tempdir, "results.jsonl")
+
+    runner = CliRunner()
+    result = runner.invoke(pyblish.cli.main,
+                           ["publish", "--results", path, "--keep", "0"])
+    print(result.output)
+
+    with open(path) as f:
+        lines = [json.loads(line) for line in f]
+
+    assert_equals([line["plugin"] for line in lines], ["Collector"])
+    assert_equals(lines[0]["records"][0]["message"], "Running")
+    assert_equals(len(context().data["results"]), 0)
+
+    # Errors are reported regardless of results kept
+    class Validator(pyblish.api.ContextPlugin):
+        order = pyblish.api.ValidatorOrder
+
+        def process(self, context):
+            assert False, "Failed"
+
+    pyblish.api.register_plugin(Validator)
+
+    result = runner.invoke(pyblish.cli.main, ["publish", "--keep", "0"])
+    assert "There were errors." in result.output, result.output
+    assert "Validator: Failed" in result.output, result.output
+
+
 @with_setup(lib.setup, lib.teardown)
 def test_environment_host_registration():
     """Host registration from PYBLISH_HOSTS works"""
@@ -199,3 +241,28 @@ if __name__ == '__main__':
     assert_equals(result.output.splitlines()[-1].rstrip(),
                   "Data passed successfully")
     assert_equals(result.exit_code, 0)
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_profile_discovery():
+    """Discovery may be profiled from the cli"""
+
+    with lib.tempdir() as plugins:
+        with open(os.path.join(plugins, "collect_slow.py"), "w") as f:
+            f.write("""
+import pyblish.api
+
+class CollectSlow(pyblish.api.ContextPlugin):
+    pass
+""")
+
+        with open(os.path.join(plugins, "broken.py"), "w") as f:
+            f.write("raise ImportError('Missing dependency')")
+
+        runner = CliRunner()
+        result = runner.invoke(pyblish.cli.main, [
+            "--plugin-path", plugins, "--plugins", "--profile-discovery"])
+
+        assert "Slowest files:" in result.output, result.output
+        assert "collect_slow.py" in result.output, result.output
+        assert "Missing dependency" in result.output, result.output
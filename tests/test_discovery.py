@@ -0,0 +1,668 @@
+import os
+import gc
+import errno
+import sys
+import time
+import logging
+
+import pyblish.api
+import pyblish.plugin
+import pyblish.discovery
+import pyblish.util
+from pyblish.vendor import mock
+from nose.tools import (
+    with_setup,
+    assert_equals,
+)
+from nose.plugins.skip import SkipTest
+
+from . import lib
+
+
+def _write(directory, fname, source):
+    path = os.path.join(directory, fname)
+    with open(path, "w") as f:
+        f.write(source)
+    return path
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_discovery_cache_metadata():
+    """Discovered files are described in the persistent cache"""
+
+    with lib.tempdir() as cache:
+        with lib.tempdir() as plugins:
+            os.environ[pyblish.discovery.CACHE_ENV] = cache
+
+            try:
+                path = _write(plugins, "collect_something.py", """
+import pyblish.api
+
+class CollectSomething(pyblish.api.ContextPlugin):
+    order = pyblish.api.CollectorOrder
+    families = ["myFamily"]
+""")
+                pyblish.api.register_plugin_path(plugins)
+                names = [p.__name__ for p in pyblish.api.discover()]
+                assert_equals(names, ["CollectSomething"])
+
+                manifest = pyblish.discovery.Manifest(cache)
+                stamp = pyblish.discovery.stamp(os.stat(path))
+                metadata = manifest.get(path, stamp)
+
+                assert_equals(len(metadata), 1)
+                metadata = dict((m["name"], m) for m in metadata)
+                assert_equals(metadata["CollectSomething"]["families"],
+                              ["myFamily"])
+                assert_equals(metadata["CollectSomething"]["valid"], True)
+
+            finally:
+                os.environ.pop(pyblish.discovery.CACHE_ENV)
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_discovery_cache_skips_unchanged_files():
+    """Unchanged files without plug-ins are not executed again"""
+
+    with lib.tempdir() as cache:
+        with lib.tempdir() as plugins:
+            os.environ[pyblish.discovery.CACHE_ENV] = cache
+            counter = os.path.join(plugins, "counter.txt")
+
+            try:
+                # Helper module without plug-ins, that counts its executions
+                path = _write(plugins, "helper.py", """
+with open(%r, "a") as f:
+    f.write("x")
+""" % counter)
+
+                pyblish.api.register_plugin_path(plugins)
+                pyblish.api.discover()
+                pyblish.api.discover()
+
+                with open(counter) as f:
+                    assert_equals(f.read(), "x")
+
+                # Changes are picked up
+                with open(path, "a") as f:
+                    f.write("\n\n")
+
+                pyblish.api.discover()
+
+                with open(counter) as f:
+                    assert_equals(f.read(), "xx")
+
+            finally:
+                os.environ.pop(pyblish.discovery.CACHE_ENV)
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_compiled_plugins_are_cached():
+    """Plug-ins are compiled once and their code cached on disk"""
+
+    with lib.tempdir() as cache:
+        with lib.tempdir() as plugins:
+            os.environ[pyblish.discovery.CACHE_ENV] = cache
+
+            try:
+                path = _write(plugins, "validate_something.py", """
+import pyblish.api
+
+class ValidateSomething(pyblish.api.InstancePlugin):
+    order = pyblish.api.ValidatorOrder
+""")
+                stamp = pyblish.discovery.stamp(os.stat(path))
+
+                code = pyblish.discovery.compile_file(path, stamp)
+                assert_equals(code.co_filename, path)
+                bytecode = os.listdir(os.path.join(cache, "bytecode"))
+                assert_equals(len(bytecode), 1)
+
+                # Subsequent compilations are served from memory..
+                assert pyblish.discovery.compile_file(path, stamp) is code
+
+                # ..or disk, in a new process
+                pyblish.discovery._compiled.clear()
+                cached = pyblish.discovery.compile_file(path, stamp)
+                assert_equals(cached, code)
+
+                # Discovery makes use of compiled code
+                pyblish.api.register_plugin_path(plugins)
+                plugin = pyblish.api.discover()[0]
+                assert_equals(plugin.__name__, "ValidateSomething")
+
+            finally:
+                os.environ.pop(pyblish.discovery.CACHE_ENV)
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_compiled_plugins_of_non_ascii_paths():
+    """Plug-ins of paths beyond ASCII are cached"""
+
+    name = u"pl\u00fcg-ins"
+
+    if sys.version_info[0] == 2:
+        # Paths are bytes, as given by the file system
+        name = name.encode("utf-8")
+
+    with lib.tempdir() as cache:
+        with lib.tempdir() as root:
+            os.environ[pyblish.discovery.CACHE_ENV] = cache
+
+            try:
+                plugins = os.path.join(root, name)
+                os.mkdir(plugins)
+
+                _write(plugins, "collect_something.py", """
+import pyblish.api
+
+class CollectSomething(pyblish.api.ContextPlugin):
+    pass
+""")
+
+                pyblish.api.register_plugin_path(plugins)
+                discovered = pyblish.api.discover()
+                assert_equals([p.__name__ for p in discovered],
+                              ["CollectSomething"])
+
+                bytecode = os.listdir(os.path.join(cache, "bytecode"))
+                assert_equals(len(bytecode), 1)
+
+            finally:
+                os.environ.pop(pyblish.discovery.CACHE_ENV)
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_compiled_plugins_are_invalidated():
+    """Changes to a plug-in invalidates its compiled code"""
+
+    with lib.tempdir() as plugins:
+        path = _write(plugins, "collect_a.py", "A = 1\n")
+        stamp = pyblish.discovery.stamp(os.stat(path))
+        code = pyblish.discovery.compile_file(path, stamp)
+
+        _write(plugins, "collect_a.py", "A = 100\n")
+        stamp = pyblish.discovery.stamp(os.stat(path))
+        changed = pyblish.discovery.compile_file(path, stamp)
+
+        assert changed is not code
+        namespace = dict()
+        exec(changed, namespace)
+        assert_equals(namespace["A"], 100)
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_concurrent_discovery():
+    """Concurrent discovery yields identical results to serial discovery"""
+
+    with lib.tempdir() as first:
+        with lib.tempdir() as second:
+            for index in range(20):
+                _write(first, "plugin_%02d.py" % index, """
+import pyblish.api
+
+class Plugin%02d(pyblish.api.ContextPlugin):
+    order = %d
+""" % (index, index % 3))
+
+            # Duplicates in later paths are ignored
+            _write(second, "duplicate.py", """
+import pyblish.api
+
+class Plugin00(pyblish.api.ContextPlugin):
+    label = "Duplicate"
+""")
+
+            _write(first, "broken.py", "this is not python")
+
+            paths = [first, second]
+            serial = pyblish.plugin.discover(paths=paths)
+            concurrent = pyblish.plugin.discover(paths=paths, workers=8)
+
+            assert_equals([p.__name__ for p in serial],
+                          [p.__name__ for p in concurrent])
+            assert_equals(len(concurrent), 20)
+
+            plugin = next(p for p in concurrent if p.__name__ == "Plugin00")
+            assert_equals(plugin.label, None)
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_incremental_discovery():
+    """Only added, changed and removed files are considered"""
+
+    template = """
+import pyblish.api
+
+with open(%(counter)r, "a") as f:
+    f.write("x")
+
+class %(name)s(pyblish.api.ContextPlugin):
+    label = %(label)r
+"""
+
+    deltas = list()
+
+    def on_changed(added, changed, removed):
+        deltas.append((
+            [p.__name__ for p in added],
+            [p.__name__ for p in changed],
+            [p.__name__ for p in removed],
+        ))
+
+    pyblish.api.register_callback("pluginsChanged", on_changed)
+
+    with lib.tempdir() as plugins:
+        with lib.tempdir() as temp:
+            counter = os.path.join(temp, "counter.txt")
+
+            def write(fname, name, label=None):
+                return _write(plugins, fname, template % {
+                    "counter": counter, "name": name, "label": label})
+
+            def count():
+                with open(counter) as f:
+                    return len(f.read())
+
+            write("a.py", "PluginA")
+            path = write("b.py", "PluginB")
+
+            discoverer = pyblish.api.Discoverer(paths=[plugins])
+            names = [p.__name__ for p in discoverer.discover()]
+
+            assert_equals(sorted(names), ["PluginA", "PluginB"])
+            assert_equals(count(), 2)
+            assert_equals(deltas, [(["PluginA", "PluginB"], [], [])])
+
+            # Nothing has changed
+            discoverer.discover()
+            assert_equals(count(), 2)
+            assert_equals(len(deltas), 1)
+
+            # Touching a file does not cause it to be executed
+            os.utime(path, (0, 0))
+            discoverer.discover()
+            assert_equals(count(), 2)
+
+            write("b.py", "PluginB", label="Changed")
+            write("c.py", "PluginC")
+            os.remove(os.path.join(plugins, "a.py"))
+
+            discovered = discoverer.discover()
+            assert_equals(count(), 4)
+            assert_equals(deltas[-1], (["PluginC"], ["PluginB"], ["PluginA"]))
+
+            plugin = next(p for p in discovered if p.__name__ == "PluginB")
+            assert_equals(plugin.label, "Changed")
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_incompatible_hosts_are_not_executed():
+    """Files without plug-ins for registered hosts are not executed"""
+
+    with lib.tempdir() as cache:
+        with lib.tempdir() as plugins:
+            os.environ[pyblish.discovery.CACHE_ENV] = cache
+            counter = os.path.join(cache, "counter.txt")
+
+            try:
+                _write(plugins, "collect_houdini.py", """
+import pyblish.api
+
+with open(%r, "a") as f:
+    f.write("x")
+
+class CollectHoudini(pyblish.api.ContextPlugin):
+    hosts = ["houdini"]
+""" % counter)
+
+                pyblish.api.register_host("maya")
+                pyblish.api.register_plugin_path(plugins)
+
+                assert_equals(pyblish.api.discover(), [])
+                assert_equals(pyblish.api.discover(), [])
+
+                with open(counter) as f:
+                    assert_equals(f.read(), "x")
+
+                pyblish.api.register_host("houdini")
+                names = [p.__name__ for p in pyblish.api.discover()]
+                assert_equals(names, ["CollectHoudini"])
+
+            finally:
+                os.environ.pop(pyblish.discovery.CACHE_ENV)
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_manifest():
+    """Plug-ins may be listed without executing their modules"""
+
+    with lib.tempdir() as cache:
+        with lib.tempdir() as plugins:
+            os.environ[pyblish.discovery.CACHE_ENV] = cache
+            counter = os.path.join(cache, "counter.txt")
+
+            try:
+                path = _write(plugins, "validate_maya.py", """
+import pyblish.api
+
+with open(%r, "a") as f:
+    f.write("x")
+
+class ValidateMaya(pyblish.api.InstancePlugin):
+    order = pyblish.api.ValidatorOrder
+    hosts = ["maya"]
+    targets = ["farm"]
+""" % counter)
+
+                pyblish.api.register_host("maya")
+                pyblish.api.register_plugin_path(plugins)
+
+                manifest = pyblish.api.manifest()
+                assert_equals(manifest, pyblish.api.manifest())
+
+                with open(counter) as f:
+                    assert_equals(f.read(), "x")
+
+                assert_equals(len(manifest), 1)
+                assert_equals(manifest[0]["name"], "ValidateMaya")
+                assert_equals(manifest[0]["file"], path)
+                assert_equals(manifest[0]["targets"], ["farm"])
+                assert_equals(manifest[0]["order"], 1)
+
+                pyblish.api.deregister_host("maya")
+                assert_equals(pyblish.api.manifest(), [])
+
+            finally:
+                os.environ.pop(pyblish.discovery.CACHE_ENV)
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_cached_discovery():
+    """Cached discovery is reused until registrations change"""
+
+    with lib.tempdir() as plugins:
+        counter = os.path.join(plugins, "counter.txt")
+        _write(plugins, "collect_a.py", """
+import pyblish.api
+
+with open(%r, "a") as f:
+    f.write("x")
+
+class CollectA(pyblish.api.ContextPlugin):
+    pass
+""" % counter)
+
+        def count():
+            with open(counter) as f:
+                return len(f.read())
+
+        pyblish.api.register_plugin_path(plugins)
+
+        first = pyblish.api.discover(cached=True)
+        second = pyblish.api.discover(cached=True)
+        assert_equals(count(), 1)
+        assert_equals(first, second)
+        assert first is not second
+
+        # Registrations invalidate previous results
+        generation = pyblish.plugin.generation()
+        pyblish.api.register_host("maya")
+        assert pyblish.plugin.generation() > generation
+
+        pyblish.api.discover(cached=True)
+        assert_equals(count(), 2)
+
+        # Targets do not, as they are registered on every publish
+        generation = pyblish.plugin.generation()
+        pyblish.api.register_target("studio")
+        pyblish.util.publish(plugins=[], targets=["other"])
+        pyblish.api.deregister_target("studio")
+        assert_equals(pyblish.plugin.generation(), generation)
+
+        pyblish.api.discover(cached=True)
+        assert_equals(count(), 2)
+
+        # Uncached discovery always rescans
+        pyblish.api.discover()
+        assert_equals(count(), 3)
+
+        # And updates the cached result
+        third = pyblish.api.discover(cached=True)
+        assert_equals(count(), 3)
+        assert third[0] is not first[0]
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_repeated_discovery_memory():
+    """Memory remains flat across repeated discovery"""
+
+    try:
+        import tracemalloc
+    except ImportError:
+        raise SkipTest("tracemalloc requires Python 3.4+")
+
+    with lib.tempdir() as plugins:
+        class RegisteredPlugin(pyblish.api.ContextPlugin):
+            pass
+
+        pyblish.api.register_plugin(RegisteredPlugin)
+        pyblish.api.register_plugin_path(plugins)
+
+        def cycle(index):
+            # Plug-ins are renamed on every cycle, as
+            # is common during their development.
+            for fname in os.listdir(plugins):
+                os.remove(os.path.join(plugins, fname))
+
+            _write(plugins, "collect_%d.py" % index, """
+import pyblish.api
+
+class Collect(pyblish.api.ContextPlugin):
+    pass
+""")
+            pyblish.api.discover()
+
+        for index in range(10):
+            cycle(index)
+
+        # Records and warnings kept by the test runner, see
+        # run_testsuite.py, are not memory held by discovery.
+        log = logging.getLogger("pyblish")
+        level = log.level
+        log.setLevel(logging.WARNING)
+
+        gc.collect()
+        tracemalloc.start()
+
+        try:
+            with mock.patch("warnings.warn", lambda *args, **kwargs: None):
+                before = tracemalloc.get_traced_memory()[0]
+
+                for index in range(1000):
+                    cycle(index)
+
+                gc.collect()
+                after = tracemalloc.get_traced_memory()[0]
+
+        finally:
+            tracemalloc.stop()
+            log.setLevel(level)
+
+        # A module per cycle amounts to megabytes
+        growth = after - before
+        assert growth < 256 * 1024, "Grew by %d bytes" % growth
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_discovery_report():
+    """Discovery may be profiled per file"""
+
+    with lib.tempdir() as plugins:
+        fast = _write(plugins, "collect_fast.py", """
+import pyblish.api
+
+class CollectFast(pyblish.api.ContextPlugin):
+    pass
+""")
+        slow = _write(plugins, "collect_slow.py", """
+import time
+import pyblish.api
+time.sleep(0.1)
+
+class CollectSlow(pyblish.api.ContextPlugin):
+    pass
+""")
+        helper = _write(plugins, "helper.py", "")
+        broken = _write(plugins, "broken.py", """
+import time
+time.sleep(0.1)
+raise ValueError('Broken')
+""")
+        duplicate = _write(plugins, "duplicate.py", """
+import pyblish.api
+
+class CollectFast(pyblish.api.ContextPlugin):
+    pass
+""")
+
+        report = dict()
+        pyblish.plugin.discover(paths=[plugins], report=report)
+
+        timings = dict((t["path"], t) for t in report["files"])
+        assert_equals(len(timings), 5)
+        assert timings[slow]["exec"] >= 0.1, timings[slow]
+        assert timings[slow]["total"] > timings[fast]["total"]
+        assert timings[broken]["exec"] >= 0.1, timings[broken]
+
+        skipped = dict((s["path"], s) for s in report["skipped"])
+        assert_equals(sorted(skipped), sorted([helper, broken, duplicate]))
+        assert_equals(skipped[broken]["reason"], "Broken")
+        assert_equals(skipped[duplicate]["plugin"], "CollectFast")
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_bundles():
+    """Bundles are discovered like the directory they were packed from"""
+
+    with lib.tempdir() as plugins:
+        with lib.tempdir() as temp:
+            for index in range(3):
+                _write(plugins, "collect_%d.py" % index, """
+import pyblish.api
+
+class Collect%d(pyblish.api.ContextPlugin):
+    order = %d
+""" % (index, -index))
+
+            _write(plugins, "validate_duplicate.py", """
+import pyblish.api
+
+class Collect0(pyblish.api.ContextPlugin):
+    label = "Duplicate"
+""")
+
+            bundle = os.path.join(temp, "plugins.zip")
+            packed = pyblish.discovery.pack(plugins, bundle)
+            assert_equals(len(packed), 4)
+
+            loose = pyblish.plugin.discover(paths=[plugins])
+
+            pyblish.api.register_plugin_path(bundle)
+            bundled = pyblish.api.discover()
+
+            assert_equals([p.__name__ for p in loose],
+                          [p.__name__ for p in bundled])
+
+            plugin = next(p for p in bundled if p.__name__ == "Collect0")
+            assert_equals(plugin.label, None)
+            assert_equals(plugin.__module__,
+                          os.path.join(bundle, "collect_0.py"))
+            assert_equals(sys.modules[plugin.__module__].__file__,
+                          plugin.__module__)
+
+            # Other versions of Python fall back to source
+            magic = pyblish.discovery.MAGIC_NUMBER
+            pyblish.discovery.MAGIC_NUMBER = b"\x00\x00\x00\x00"
+            pyblish.discovery._compiled.clear()
+
+            try:
+                os.utime(bundle, (0, 0))  # Force a re-read
+                fallback = pyblish.api.discover()
+            finally:
+                pyblish.discovery.MAGIC_NUMBER = magic
+
+            assert_equals([p.__name__ for p in bundled],
+                          [p.__name__ for p in fallback])
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_unavailable_paths():
+    """Paths that fail to list in time are skipped"""
+
+    unavailable = list()
+    reasons = list()
+
+    def on_unavailable(path, reason):
+        unavailable.append(path)
+        reasons.append(reason)
+
+    pyblish.api.register_callback("pluginPathUnavailable", on_unavailable)
+
+    with lib.tempdir() as stale:
+        with lib.tempdir() as plugins:
+            _write(plugins, "collect_a.py", """
+import pyblish.api
+
+class CollectA(pyblish.api.ContextPlugin):
+    pass
+""")
+
+            scanned = list()
+            scandir = pyblish.discovery._scandir
+            scan_directory = pyblish.discovery._scan_directory
+            timeout = pyblish.discovery.PATH_TIMEOUT
+
+            def _scan_directory(path):
+                scanned.append(path)
+                if path == stale:
+                    time.sleep(1)
+                return scan_directory(path)
+
+            pyblish.discovery._scan_directory = _scan_directory
+            pyblish.discovery.PATH_TIMEOUT = 0.1
+
+            try:
+                start = time.time()
+                discovered = pyblish.plugin.discover(paths=[stale, plugins])
+                assert time.time() - start < 1
+
+                assert_equals([p.__name__ for p in discovered], ["CollectA"])
+                assert_equals(unavailable, [stale])
+
+                # Unavailable paths are not tried again, for a while
+                pyblish.plugin.discover(paths=[stale])
+                assert_equals(scanned.count(stale), 1)
+
+                # Paths that do not exist are not reported
+                pyblish.plugin.discover(
+                    paths=[os.path.join(plugins, "missing")])
+                assert_equals(unavailable, [stale])
+
+                # Failures are told apart from timeouts
+                def _broken_scandir(path):
+                    raise OSError(errno.EIO, "Broken")
+
+                pyblish.discovery._scandir = _broken_scandir
+                pyblish.plugin.discover(paths=[plugins])
+
+                assert_equals(unavailable, [stale, plugins])
+                assert "timed out" in reasons[0], reasons
+                assert "Broken" in reasons[1], reasons
+                assert plugins in pyblish.discovery._unavailable
+
+            finally:
+                pyblish.discovery._scandir = scandir
+                pyblish.discovery._scan_directory = scan_directory
+                pyblish.discovery.PATH_TIMEOUT = timeout
+                pyblish.discovery._unavailable.clear()
@@ -10,6 +10,7 @@ from nose.tools import (
     with_setup,
     assert_equals,
 )
+from nose.plugins.skip import SkipTest
 
 
 @contextlib.contextmanager
@@ -185,3 +186,395 @@ def test_plugins_by_families():
 
     assert logic.plugins_by_families(
         [ClassD, ClassE, ClassF], ["a", "b", "c"]) == [ClassD, ClassE]
+
+
+def test_instances_by_plugin_follows_changes():
+    """Matching reflects changes to families and membership"""
+
+    class MyPlugin(api.InstancePlugin):
+        families = ["b"]
+
+    context = api.Context()
+    instance_a = context.create_instance("A", families=["a"])
+    instance_b = context.create_instance("B", families=["b"])
+
+    def match():
+        return [i.name for i in logic.instances_by_plugin(context, MyPlugin)]
+
+    assert_equals(match(), ["B"])
+
+    instance_a.data["families"] = ["b"]
+    assert_equals(match(), ["A", "B"])
+
+    instance_b.data.pop("families")
+    assert_equals(match(), ["A"])
+
+    instance_b.data["family"] = "b"
+    assert_equals(match(), ["A", "B"])
+
+    context.remove(instance_a)
+    assert_equals(match(), ["B"])
+
+    context.insert(0, instance_a)
+    assert_equals(match(), ["A", "B"])
+
+    context.reverse()
+    assert_equals(match(), ["B", "A"])
+
+    instance_a.data["families"].remove("b")
+    assert_equals(match(), ["B"])
+
+    instance_a.data["families"].append("b")
+    assert_equals(match(), ["B", "A"])
+
+    instance_a.data["families"][0] = "c"
+    assert_equals(match(), ["B"])
+
+    instance_a.data["families"][0] = "b"
+    assert_equals(match(), ["B", "A"])
+
+    del instance_a.data["families"]
+    assert_equals(match(), ["B"])
+
+    instance_a.data.update(families=["b"])
+    assert_equals(match(), ["B", "A"])
+
+    instance_b.data.pop("family")
+    instance_b.data.setdefault("families", ["b"])
+    assert_equals(match(), ["B", "A"])
+
+    instance_a.data.clear()
+    assert_equals(match(), ["B"])
+
+    instance_a.data.setdefault("families", [])
+    assert_equals(match(), ["B"])
+
+    instance_a.data.setdefault("families", []).append("b")
+    assert_equals(match(), ["B", "A"])
+
+    instance_a.data["families"] += ["c"]
+    instance_a.data["families"][:] = ["c"]
+    assert_equals(match(), ["B"])
+
+    instance_a.data["families"].extend(["b"])
+    assert_equals(match(), ["B", "A"])
+
+    context[0:1] = []
+    assert_equals(match(), ["A"])
+
+    del context[:]
+    assert_equals(match(), [])
+
+
+def test_instances_by_plugin_in_place_changes():
+    """Families modified in-place during processing are matched"""
+
+    class CollectFamily(api.InstancePlugin):
+        order = api.CollectorOrder + 0.1
+
+        def process(self, instance):
+            instance.data["families"].append("b")
+
+    class MyPlugin(api.InstancePlugin):
+        families = ["b"]
+
+    context = api.Context()
+    context.create_instance("A", families=["a"])
+
+    util.collect(context, plugins=[CollectFamily])
+
+    instances = logic.instances_by_plugin(context, MyPlugin)
+    assert_equals(list(i.name for i in instances), ["A"])
+
+
+def test_instances_by_plugin_index_equivalence():
+    """Indexed matching equals matching a plain list of instances"""
+
+    context = api.Context()
+    for index, families in enumerate(([], ["a"], ["b"], ["a", "b"],
+                                      ["a", "b", "c"], ["c"])):
+        instance = context.create_instance(str(index), families=families)
+
+    # Without a `family` altogether
+    instance.data.pop("family")
+
+    for match in (api.Intersection, api.Subset, api.Exact):
+        for families in (["a"], ["a", "b"], ["c"], ["default"],
+                         ["default", "a"], ["x"], []):
+            MyPlugin = type("MyPlugin", (api.InstancePlugin,), {
+                "families": families,
+                "match": match
+            })
+
+            algorithm = logic._algorithms[match]
+            expected = [
+                instance for instance in context
+                if algorithm(families, instance.data["families"] + (
+                    [instance.data["family"]]
+                    if "family" in instance.data else []))
+            ]
+
+            assert_equals(
+                logic.instances_by_plugin(context, MyPlugin), expected)
+
+
+def test_instances_by_plugin_vectorized():
+    """Matching by way of NumPy equals matching by sets"""
+
+    if logic._numpy() is None:
+        raise SkipTest("NumPy not available")
+
+    context = api.Context()
+    for index, families in enumerate(([], ["a"], ["b"], ["a", "b"],
+                                      ["a", "b", "c"], ["c"]) * 3):
+        instance = context.create_instance(str(index), families=families)
+        if index % 2:
+            instance.data.pop("family")
+
+    index = logic.FamilyIndex(context)
+
+    for match in (api.Intersection, api.Subset, api.Exact):
+        for families in (["a"], ["a", "b"], ["c"], ["default"],
+                         ["default", "a"], ["x"], ["a", "x"], []):
+            expected = index.match(families, match)
+            actual = [context[position]
+                      for position in index.match_bits(set(families), match)]
+
+            assert_equals(actual, expected)
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_registry():
+    """Registry snapshots registrations and indexes its plug-ins"""
+
+    class MayaPlugin(api.ContextPlugin):
+        hosts = ["maya"]
+        order = 1
+
+    class AnyPlugin(api.ContextPlugin):
+        order = 0
+
+    class StudioPlugin(api.ContextPlugin):
+        targets = ["studio"]
+
+    api.register_host("maya")
+    api.register_target("studio")
+
+    registry = api.Registry([MayaPlugin, AnyPlugin, StudioPlugin])
+
+    assert "maya" in registry.hosts
+    assert_equals(registry.targets, ("studio",))
+    assert registry.is_current()
+
+    assert_equals(registry.plugins_by_host("maya"),
+                  [MayaPlugin, AnyPlugin, StudioPlugin])
+    assert_equals(registry.plugins_by_host("houdini"),
+                  [AnyPlugin, StudioPlugin])
+
+    assert_equals(registry.plugins_by_targets(), [StudioPlugin])
+    assert_equals(registry.plugins_by_targets(targets=["default"]),
+                  logic.plugins_by_targets(registry.plugins, ["default"]))
+
+    assert_equals([order for order, _ in registry.by_order()], [-1, 0, 1])
+
+    # Changes to registration is not reflected in a snapshot
+    api.register_target("other")
+    assert registry.is_current()
+    assert_equals(registry.targets, ("studio",))
+
+    api.register_host("houdini")
+    assert not registry.is_current()
+    assert_equals(registry.hosts, ("maya",))
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_registry_threads():
+    """Registry may be queried from many threads at once"""
+
+    import threading
+
+    plugins = [
+        type("Plugin%d" % index, (api.ContextPlugin,), {
+            "hosts": ["host%d" % (index % 5)],
+            "targets": ["target%d" % (index % 3)],
+        })
+        for index in range(50)
+    ]
+
+    registry = api.Registry(plugins, hosts=["host0"], targets=["target0"])
+
+    # Indexed on creation, rather than on first query
+    assert ("target0",) in registry._compatible
+    assert "host0" in registry._by_host
+
+    results = list()
+
+    def query():
+        results.append([
+            registry.plugins_by_host("host%d" % (index % 5)) +
+            registry.plugins_by_targets(targets=["target%d" % (index % 3)])
+            for index in range(20)
+        ])
+
+    threads = [threading.Thread(target=query) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert_equals(len(results), 8)
+    for result in results:
+        assert_equals(result, results[0])
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_publish_with_registry():
+    """util.publish takes plug-ins and targets from a registry"""
+
+    count = {"#": 0}
+
+    class MyPlugin(api.ContextPlugin):
+        targets = ["studio"]
+
+        def process(self, context):
+            count["#"] += 1
+
+    class MyOtherPlugin(api.ContextPlugin):
+        def process(self, context):
+            count["#"] += 10
+
+    api.register_target("studio")
+    registry = api.Registry([MyPlugin, MyOtherPlugin])
+    api.deregister_target("studio")
+
+    util.publish(registry=registry)
+    assert_equals(count["#"], 11)
+
+    count["#"] = 0
+    util.publish(registry=registry, targets=["other"])
+    assert_equals(count["#"], 1)
+
+    # The registry is used as-is, and remains current
+    assert registry.is_current()
+    assert_equals(registry.targets, ("studio",))
+    assert_equals(sorted(registry._compatible),
+                  [("studio",), ("studio", "default"), ("studio", "other")])
+
+    util.publish(registry=registry)
+    assert_equals(len(registry._compatible), 3)
+
+
+def test_family_patterns():
+    """Families of plug-ins may be wildcard patterns"""
+
+    context = api.Context()
+    context.create_instance("A", family="model.high")
+    context.create_instance("B", family="model.low", families=["bakedMesh"])
+    context.create_instance("C", family="rig", families=["skinnedMesh"])
+    context.create_instance("D", family="modelling")
+
+    def match(families, match=api.Intersection):
+        MyPlugin = type("MyPlugin", (api.InstancePlugin,), {
+            "families": families,
+            "match": match
+        })
+
+        instances = logic.instances_by_plugin(context, MyPlugin)
+        names = [i.name for i in instances]
+
+        # Matching against a single instance agrees with the index
+        for instance in context:
+            plugins = logic.plugins_by_instance([MyPlugin], instance)
+            assert_equals(bool(plugins), instance.name in names)
+
+        return names
+
+    assert_equals(match(["model.*"]), ["A", "B"])
+    assert_equals(match(["*Mesh"]), ["B", "C"])
+    assert_equals(match(["model.*", "rig"]), ["A", "B", "C"])
+    assert_equals(match(["model.?igh"]), ["A"])
+    assert_equals(match(["anim.*"]), [])
+
+    assert_equals(match(["model.*", "*Mesh"], api.Subset), ["B"])
+    assert_equals(match(["model.*", "*Mesh", "rig"], api.Subset), [])
+
+    assert_equals(match(["model.*"], api.Exact), ["A"])
+    assert_equals(match(["model.*", "*Mesh"], api.Exact), ["B"])
+    assert_equals(match(["rig", "*Mesh"], api.Exact), ["C"])
+
+
+def test_host_patterns():
+    """Hosts of plug-ins may be wildcard patterns"""
+
+    class MayaPlugin(api.ContextPlugin):
+        hosts = ["maya*"]
+
+    class HoudiniPlugin(api.ContextPlugin):
+        hosts = ["houdini"]
+
+    plugins = [MayaPlugin, HoudiniPlugin]
+
+    assert_equals(logic.plugins_by_host(plugins, "mayapy"), [MayaPlugin])
+    assert_equals(logic.plugins_by_host(plugins, "houdini"), [HoudiniPlugin])
+    assert_equals(logic.plugins_by_host(plugins, "nuke"), [])
+
+    registry = api.Registry(plugins, hosts=["mayabatch"], targets=[])
+    assert_equals(registry.plugins_by_host("mayabatch"), [MayaPlugin])
+    assert registry.host_is_compatible(MayaPlugin)
+    assert not registry.host_is_compatible(HoudiniPlugin)
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_plan():
+    """Plans exclude empty steps and mark order boundaries"""
+
+    import json
+
+    class ValidateModel(api.InstancePlugin):
+        order = api.ValidatorOrder
+        families = ["model"]
+
+    class ValidateRig(api.InstancePlugin):
+        order = api.ValidatorOrder
+        families = ["rig"]
+
+    class ValidateContext(api.ContextPlugin):
+        order = api.ValidatorOrder
+
+    class ExtractModel(api.InstancePlugin):
+        order = api.ExtractorOrder
+        families = ["model"]
+
+    class Inactive(api.ContextPlugin):
+        order = api.ExtractorOrder
+        active = False
+
+    context = api.Context()
+    context.create_instance("A", family="model")
+    context.create_instance("B", family="model", publish=False)
+
+    plugins = [ValidateModel, ValidateRig, ValidateContext,
+               ExtractModel, Inactive]
+    steps = logic.plan(plugins, context)
+
+    assert_equals([step["plugin"] for step in steps],
+                  [ValidateModel, ValidateContext, ExtractModel])
+    assert_equals([step["boundary"] for step in steps], [True, False, True])
+    assert_equals(steps.size(), 3)
+
+    serialized = json.loads(json.dumps(steps.serialize()))
+    assert_equals(serialized[0]["plugin"]["name"], "ValidateModel")
+    assert_equals([i["name"] for i in serialized[0]["instances"]],
+                  ["A", "B"])
+    assert_equals(serialized[1]["instances"], None)
+
+    # Whether to publish is determined when processed
+    context[0].data["publish"] = False
+    context[1].data["publish"] = True
+
+    pairs = list(logic.Iterator(steps, context))
+    assert_equals([(p, getattr(i, "name", None)) for p, i in pairs], [
+        (ValidateModel, "B"),
+        (ValidateContext, None),
+        (ExtractModel, "B"),
+    ])
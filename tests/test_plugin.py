@@ -752,6 +752,175 @@ def test_logging_solely_from_pyblish():
             assert record.name.startswith("pyblish")
 
 
+@with_setup(lib.setup_empty, lib.teardown)
+def test_logging_leaves_root_untouched():
+    """Records are captured without altering the level of the root logger"""
+
+    import logging
+    import threading
+
+    levels = list()
+
+    class Collect(pyblish.api.ContextPlugin):
+        def process(self, context):
+            levels.append(logging.getLogger().level)
+            self.log.info("Collecting")
+
+    class ValidateAction(pyblish.api.Action):
+        def process(self, context, plugin):
+            self.log.info("Repairing")
+
+    class Validate(pyblish.api.ContextPlugin):
+        actions = [ValidateAction]
+
+        def process(self, context):
+            # Records of other threads go to the plug-in processed
+            thread = threading.Thread(target=self.log.info, args=["Thread"])
+            thread.start()
+            thread.join()
+
+    root = logging.getLogger()
+    level = root.level
+    handlers = list(root.handlers)
+
+    context = pyblish.util.publish(plugins=[Collect, Validate])
+    collected, validated = context.data["results"]
+
+    assert_equals(levels, [level])
+    assert_equals(root.handlers, handlers)
+    assert_equals([r.getMessage() for r in collected["records"]],
+                  ["Collecting"])
+    assert_equals([r.getMessage() for r in validated["records"]],
+                  ["Thread"])
+
+    result = pyblish.plugin.process(
+        Validate, context, action=ValidateAction.id)
+    assert_equals([r.getMessage() for r in result["records"]],
+                  ["Repairing"])
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_logging_survives_setup_log():
+    """Records are captured after handlers of pyblish are reset"""
+
+    import pyblish.lib
+
+    class Collect(pyblish.api.ContextPlugin):
+        def process(self, context):
+            self.log.info("Collecting")
+
+    context = pyblish.api.Context()
+
+    result = pyblish.plugin.process(Collect, context)
+    assert_equals(len(result["records"]), 1)
+
+    pyblish.lib.setup_log()
+
+    result = pyblish.plugin.process(Collect, context)
+    assert_equals(len(result["records"]), 1)
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_record_retention():
+    """Records are retained as per the registered policy"""
+
+    import gc
+    import logging
+    import weakref
+
+    class Scene(object):
+        def __str__(self):
+            return "scene"
+
+    class Collect(pyblish.api.ContextPlugin):
+        def process(self, context):
+            scene = Scene()
+            context.data["scene"] = weakref.ref(scene)
+
+            self.log.debug("Debugging %s", scene)
+            for index in range(5):
+                self.log.info("Collecting %s #%d", scene, index)
+
+    pyblish.api.register_retention(logging.INFO, limit=3, compact=True)
+
+    context = pyblish.util.publish(plugins=[Collect])
+    records = context.data["results"][0]["records"]
+
+    # Only the last three records above DEBUG
+    assert_equals([r.getMessage() for r in records],
+                  ["Collecting scene #2",
+                   "Collecting scene #3",
+                   "Collecting scene #4"])
+    assert_equals(records[0].levelname, "INFO")
+    assert_equals(records[0].args, None)
+
+    # Compact records are formatted like any other
+    formatter = logging.Formatter("%(asctime)s %(levelname)s %(message)s")
+    assert formatter.format(records[0]).endswith("INFO Collecting scene #2")
+
+    # Arguments are not kept alive
+    gc.collect()
+    assert context.data["scene"]() is None
+
+    # Loggers no longer make records below the level
+    assert not Collect.log.isEnabledFor(logging.DEBUG)
+
+    pyblish.api.deregister_retention()
+    assert Collect.log.isEnabledFor(logging.DEBUG)
+
+    context = pyblish.util.publish(plugins=[Collect])
+    records = context.data["results"][0]["records"]
+    assert_equals(len(records), 6)
+    assert isinstance(records[0], logging.LogRecord)
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_error_retention():
+    """Errors keep their stack, but not their frames"""
+
+    import gc
+    import sys
+    import weakref
+
+    class Query(object):
+        pass
+
+    def query(context):
+        scene = Query()
+        context.data["query"] = weakref.ref(scene)
+        raise ValueError("Bad scene")
+
+    class Validate(pyblish.api.ContextPlugin):
+        def process(self, context):
+            try:
+                query(context)
+            except ValueError:
+                raise TypeError("Invalid")
+
+    context = pyblish.util.publish(plugins=[Validate])
+    error = context.data["results"][0]["error"]
+
+    assert_equals(str(error), "Invalid")
+    assert_equals(error.traceback[2], "process")
+
+    if sys.version_info[0] > 2:
+        assert "Raised from ValueError: Bad scene" in error.stack[-1]
+        assert error.__traceback__ is None
+        assert error.__context__ is None
+
+        gc.collect()
+        assert context.data["query"]() is None
+
+        # Frames are kept whilst debugging
+        pyblish.api.register_retention(depth=1, debug=True)
+        context = pyblish.util.publish(plugins=[Validate])
+        error = context.data["results"][0]["error"]
+
+        assert error.__traceback__ is not None
+        assert_equals(len(error.stack), 2)
+        assert context.data["query"]() is not None
+
+
 @with_setup(lib.setup_empty, lib.teardown)
 def test_running_for_all_targets():
     """Run for all targets when family is "default"."""
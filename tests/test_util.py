@@ -4,8 +4,10 @@ from . import lib
 
 from pyblish import api, util
 from nose.tools import (
-    with_setup
+    with_setup,
+    assert_equals,
 )
+from nose.plugins.skip import SkipTest
 
 
 def test_convenience_plugins_argument():
@@ -342,3 +344,703 @@ def test_publishing_integrators():
     util.integrate(targets=["custom"])
 
     assert count["#"] == 1, count
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_instances_changed_after_collection():
+    """Instances created or re-tagged following collection are processed"""
+
+    class Collect(api.ContextPlugin):
+        order = api.CollectorOrder
+
+        def process(self, context):
+            context.create_instance("A", family="a")
+            context.create_instance("B", family="b")
+            context.create_instance("C", family="c", families=[])
+
+    class ExtractB(api.InstancePlugin):
+        order = api.ExtractorOrder
+        families = ["b"]
+
+        def process(self, instance):
+            instance.data["families"] = ["x"]
+            instance.context.create_instance("X", family="x")
+
+    class ExtractC(api.InstancePlugin):
+        order = api.ExtractorOrder
+        families = ["c"]
+
+        def process(self, instance):
+            instance.data["families"].append("x")
+
+    integrated = list()
+
+    class IntegrateX(api.InstancePlugin):
+        order = api.IntegratorOrder
+        families = ["x"]
+
+        def process(self, instance):
+            integrated.append(instance.name)
+
+    plugins = [Collect, ExtractB, ExtractC, IntegrateX]
+
+    util.publish(plugins=plugins)
+    assert_equals(integrated, ["B", "C", "X"])
+
+    # Alike when scheduled by declarations
+    del integrated[:]
+    IntegrateX.reads = ["x"]
+    util.publish(plugins=plugins, workers=2)
+    assert_equals(integrated, ["B", "C", "X"])
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_parallel_publish():
+    """Instances of parallel plug-ins are processed concurrently"""
+
+    import threading
+
+    barrier = {"count": 0, "event": threading.Event()}
+    lock = threading.Lock()
+
+    class Collect(api.ContextPlugin):
+        order = api.CollectorOrder
+
+        def process(self, context):
+            for name in ("A", "B", "C", "D"):
+                context.create_instance(name, family="file")
+
+    class Validate(api.InstancePlugin):
+        order = api.ValidatorOrder
+        families = ["file"]
+        parallel = True
+
+        def process(self, instance):
+            self.log.info(instance.name)
+
+            # Every instance waits on the others, which only
+            # succeeds provided they are processed concurrently
+            with lock:
+                barrier["count"] += 1
+                if barrier["count"] == 4:
+                    barrier["event"].set()
+
+            assert barrier["event"].wait(5), "Not processed concurrently"
+            assert instance.name != "C", "C failed"
+
+    class Extract(api.ContextPlugin):
+        order = api.ExtractorOrder
+
+        def process(self, context):
+            context.data["extracted"] = True
+
+    context = util.publish(plugins=[Collect, Validate, Extract], workers=4)
+
+    results = context.data["results"]
+    assert_equals([r["plugin"] for r in results],
+                  [Collect, Validate, Validate, Validate, Validate])
+    assert_equals([r["instance"].name for r in results[1:]],
+                  ["A", "B", "C", "D"])
+
+    # Records are kept apart
+    for result in results[1:]:
+        messages = [r.getMessage() for r in result["records"]]
+        assert_equals(messages, [result["instance"].name])
+
+    # Failed validation halts publishing as usual
+    assert_equals([r["success"] for r in results[1:]],
+                  [True, True, False, True])
+    assert "extracted" not in context.data
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_process_parallel_publish():
+    """Instances of plug-ins may be processed in other processes"""
+
+    import shutil
+    import tempfile
+
+    tempdir = tempfile.mkdtemp()
+
+    try:
+        with open(os.path.join(tempdir, "extract.py"), "w") as f:
+            f.write("""\
+import os
+import pyblish.api
+
+
+class Extract(pyblish.api.InstancePlugin):
+    order = pyblish.api.ExtractorOrder
+    parallel = "process"
+
+    def process(self, instance):
+        self.log.info("Extracting %s" % instance.name)
+        instance.data["pid"] = os.getpid()
+        instance.data["squares"] = [n ** 2 for n in instance.data["numbers"]]
+        instance.data.pop("temporary")
+        assert instance.name != "C", "C failed"
+""")
+
+        Extract, = [plugin for plugin in api.discover(paths=[tempdir])
+                    if plugin.__module__.startswith(tempdir)]
+
+        class Collect(api.ContextPlugin):
+            order = api.CollectorOrder
+
+            def process(self, context):
+                for index, name in enumerate("ABCD"):
+                    instance = context.create_instance(name)
+                    instance.data["numbers"] = list(range(index))
+                    instance.data["temporary"] = True
+
+                    # Not picklable, and so left in this process
+                    instance.data["callback"] = lambda: None
+
+        context = util.publish(plugins=[Collect, Extract], workers=2)
+
+        results = context.data["results"][1:]
+        assert_equals([r["instance"].name for r in results],
+                      ["A", "B", "C", "D"])
+        assert_equals([r["success"] for r in results],
+                      [True, True, False, True])
+        assert_equals(results[0]["records"][0].getMessage(), "Extracting A")
+        assert "C failed" in str(results[2]["error"])
+
+        for instance in context:
+            assert "callback" in instance.data
+            assert instance.data["pid"] != os.getpid()
+
+        assert_equals(context[3].data["squares"], [0, 1, 4])
+        assert "temporary" not in context[3].data
+
+    finally:
+        shutil.rmtree(tempdir)
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_process_parallel_merge():
+    """Only data changed in other processes is merged back"""
+
+    import shutil
+    import tempfile
+
+    tempdir = tempfile.mkdtemp()
+
+    try:
+        with open(os.path.join(tempdir, "extract.py"), "w") as f:
+            f.write("""\
+import pyblish.api
+
+
+class Extract(pyblish.api.InstancePlugin):
+    order = pyblish.api.ExtractorOrder
+    parallel = "process"
+
+    def process(self, instance):
+        context = instance.context
+        context.data["extracted"] = True
+
+        if "conflicting" in context.data:
+            context.data["conflicting"] = instance.name
+""")
+
+        Extract, = [plugin for plugin in api.discover(paths=[tempdir])
+                    if plugin.__module__.startswith(tempdir)]
+
+        tags = set("tag%d" % index for index in range(20))
+
+        context = api.Context()
+        context.data["tags"] = tags
+        for name in "AB":
+            instance = context.create_instance(name)
+            instance.data["tags"] = set(tags)
+
+        instance_tags = list(instance.data["tags"] for instance in context)
+
+        context = util.publish(context, plugins=[Extract], workers=2)
+
+        # Untouched data keeps its identity
+        assert context.data["tags"] is tags
+        for instance, tags in zip(context, instance_tags):
+            assert instance.data["tags"] is tags
+
+        # Equal changes are merged..
+        assert context.data["extracted"]
+        assert all(r["success"] for r in context.data["results"])
+
+        # ..whereas differing changes are not
+        context = api.Context()
+        context.data["conflicting"] = None
+        for name in "AB":
+            context.create_instance(name)
+
+        context = util.publish(context, plugins=[Extract], workers=2)
+
+        assert_equals(context.data["conflicting"], None)
+        assert context.data["extracted"]
+
+        for result in context.data["results"]:
+            assert not result["success"]
+            assert "conflicting" in str(result["error"])
+
+    finally:
+        shutil.rmtree(tempdir)
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_scheduled_publish():
+    """Plug-ins declaring what they read and write run alongside each other"""
+
+    import threading
+
+    barrier = {"count": 0, "event": threading.Event(), "timeout": 5}
+    lock = threading.Lock()
+
+    def wait():
+        with lock:
+            barrier["count"] += 1
+            if barrier["count"] == 2:
+                barrier["event"].set()
+
+        assert barrier["event"].wait(barrier["timeout"]), (
+            "Not processed concurrently")
+
+    class CollectScene(api.ContextPlugin):
+        order = api.CollectorOrder
+        writes = ["scene"]
+
+        def process(self, context):
+            wait()
+            context.data["scene"] = "scene.ma"
+
+    class CollectUser(api.ContextPlugin):
+        order = api.CollectorOrder + 0.1
+        writes = ["user"]
+
+        def process(self, context):
+            wait()
+            context.data["user"] = "marcus"
+
+    class CollectInstances(api.ContextPlugin):
+        order = api.CollectorOrder + 0.2
+        reads = ["scene"]
+        writes = ["instances"]
+
+        def process(self, context):
+            context.create_instance(context.data["scene"], family="file")
+
+    class Validate(api.InstancePlugin):
+        order = api.ValidatorOrder
+        reads = ["user"]
+
+        def process(self, instance):
+            assert instance.context.data["user"] == "marcus"
+
+    class ValidateFailure(api.ContextPlugin):
+        order = api.ValidatorOrder
+        reads = []
+
+        def process(self, context):
+            assert False, "Failed"
+
+    class Extract(api.ContextPlugin):
+        order = api.ExtractorOrder
+        writes = ["extracted"]
+
+        def process(self, context):
+            context.data["extracted"] = True
+
+    plugins = [CollectScene, CollectUser, CollectInstances,
+               Validate, ValidateFailure, Extract]
+    context = util.publish(plugins=plugins, workers=4)
+
+    # Results are in order, regardless of when they were produced
+    results = context.data["results"]
+    assert_equals([r["plugin"] for r in results],
+                  [CollectScene, CollectUser, CollectInstances,
+                   Validate, ValidateFailure])
+    assert_equals([r["success"] for r in results],
+                  [True, True, True, True, False])
+
+    # Extraction waits on validation, despite not sharing data
+    assert "extracted" not in context.data
+
+    # Plug-ins without declarations are processed on this thread
+    class CollectThread(api.ContextPlugin):
+        order = api.CollectorOrder + 0.3
+
+        def process(self, context):
+            context.data["thread"] = threading.current_thread()
+
+    context = util.publish(plugins=[CollectUser, CollectThread], workers=4)
+    assert context.data["thread"] is threading.current_thread()
+
+    # Instances of parallel plug-ins are processed alongside each other
+    class CollectPair(api.ContextPlugin):
+        order = api.CollectorOrder
+        writes = ["instances"]
+
+        def process(self, context):
+            context.create_instance("A", family="pair")
+            context.create_instance("B", family="pair")
+
+    class ValidatePair(api.InstancePlugin):
+        order = api.ValidatorOrder
+        families = ["pair"]
+        parallel = True
+        reads = []
+
+        def process(self, instance):
+            wait()
+
+    barrier["count"] = 0
+    barrier["event"].clear()
+
+    context = util.publish(plugins=[CollectPair, ValidatePair], workers=4)
+    assert_equals([r["success"] for r in context.data["results"]],
+                  [True, True, True])
+
+    # Without declarations, plug-ins are processed in order
+    del CollectScene.writes, CollectUser.writes
+    barrier["count"] = 0
+    barrier["timeout"] = 0.5
+    barrier["event"].clear()
+
+    context = util.publish(plugins=[CollectScene, CollectUser], workers=4)
+    assert_equals([r["success"] for r in context.data["results"]],
+                  [False, True])
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_publish_async():
+    """Coroutines are processed alongside each other on an event loop"""
+
+    if util.publish_async is None:
+        raise SkipTest("Requires Python 3.5+")
+
+    import asyncio
+    import pyblish.plugin
+
+    namespace = {}
+    exec("""\
+import asyncio
+from pyblish import api
+
+running = {"now": 0, "peak": 0}
+
+
+class Collect(api.ContextPlugin):
+    order = api.CollectorOrder
+
+    def process(self, context):
+        for name in ("A", "B", "C", "D"):
+            context.create_instance(name, family="file")
+
+
+class Validate(api.InstancePlugin):
+    order = api.ValidatorOrder
+
+    async def process(self, instance):
+        self.log.info(instance.name)
+
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0.01)
+        running["now"] -= 1
+
+        self.log.info(instance.name)
+
+        assert instance.name != "C", "C failed"
+
+
+class Integrate(api.InstancePlugin):
+    order = api.IntegratorOrder
+
+    async def process(self, instance):
+        pass
+""", namespace)
+
+    Collect = namespace["Collect"]
+    Validate = namespace["Validate"]
+    Integrate = namespace["Integrate"]
+
+    processed = list()
+
+    def on_processed(result):
+        processed.append(result)
+
+    api.register_callback("pluginProcessed", on_processed)
+
+    try:
+        loop = asyncio.new_event_loop()
+        context = loop.run_until_complete(util.publish_async(
+            plugins=[Collect, Validate, Integrate],
+            concurrency={api.ValidatorOrder: 2}))
+        loop.close()
+
+    finally:
+        api.deregister_callback("pluginProcessed", on_processed)
+
+    # Validation is limited to two instances at a time
+    assert_equals(namespace["running"]["peak"], 2)
+
+    results = context.data["results"]
+    assert_equals(processed, results)
+    assert_equals([r["plugin"] for r in results],
+                  [Collect, Validate, Validate, Validate, Validate])
+    assert_equals([r["instance"].name for r in results[1:]],
+                  ["A", "B", "C", "D"])
+    assert_equals([r["success"] for r in results[1:]],
+                  [True, True, False, True])
+
+    # Records are kept apart, and not captured once published
+    for result in results[1:]:
+        messages = [r.getMessage() for r in result["records"]]
+        assert_equals(messages, [result["instance"].name] * 2)
+
+    assert pyblish.plugin._current() is None
+
+    # Targets are deregistered, and results kept as requested
+    from pyblish import sinks
+    assert_equals(api.registered_targets(), [])
+
+    summary = sinks.Summary()
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(util.publish_async(
+        plugins=[Collect, Validate], results=summary))
+    loop.close()
+
+    assert_equals((summary.processed, summary.failed), (5, 1))
+
+    # Coroutines are also processed synchronously
+    context = util.publish(plugins=[Collect, Validate])
+    assert_equals([r["success"] for r in context.data["results"][1:]],
+                  [True, True, False, True])
+
+    # Including from within a running loop, such as that of a host
+    outcome = dict()
+
+    def publish():
+        outcome["context"] = util.publish(plugins=[Collect, Validate])
+
+    loop = asyncio.new_event_loop()
+    loop.call_soon(publish)
+    loop.run_until_complete(asyncio.sleep(0.01))
+    loop.close()
+
+    results = outcome["context"].data["results"]
+    assert_equals([r["success"] for r in results[1:]],
+                  [True, True, False, True])
+    assert_equals([r.getMessage() for r in results[1]["records"]],
+                  ["A", "A"])
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_publish_sinks():
+    """Results are streamed to sinks, and kept in a bounded ring"""
+
+    import json
+    import shutil
+    import tempfile
+
+    from pyblish import sinks
+
+    class Collect(api.ContextPlugin):
+        order = api.CollectorOrder
+
+        def process(self, context):
+            for name in ("A", "B", "C"):
+                context.create_instance(name)
+
+    class Validate(api.InstancePlugin):
+        order = api.ValidatorOrder
+
+        def process(self, instance):
+            self.log.info("Validating %s", instance.name)
+            assert instance.name != "B", "B failed"
+
+    tempdir = tempfile.mkdtemp()
+
+    try:
+        path = os.path.join(tempdir, "results.jsonl")
+        summary = sinks.Summary()
+
+        context = util.publish(plugins=[Collect, Validate],
+                               sinks=[sinks.JsonLines(path), summary],
+                               results=sinks.Ring(2))
+
+        # Only the latest results are kept in memory
+        assert_equals([r["instance"].name for r in context.data["results"]],
+                      ["B", "C"])
+
+        # Sinks are detached once published
+        assert_equals(context.sinks, [])
+
+        with open(path) as f:
+            lines = [json.loads(line) for line in f]
+
+        assert_equals([line["plugin"] for line in lines],
+                      ["Collect", "Validate", "Validate", "Validate"])
+        assert_equals([line["instance"] for line in lines],
+                      [None, "A", "B", "C"])
+        assert_equals(lines[2]["error"]["message"], "B failed")
+        assert_equals(lines[2]["records"][0]["message"], "Validating B")
+
+        assert_equals(summary.processed, 4)
+        assert_equals(summary.failed, 1)
+        assert_equals(summary.plugins["Validate"]["processed"], 3)
+
+    finally:
+        shutil.rmtree(tempdir)
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_result_store():
+    """Results are indexed by plug-in, instance, order and failure"""
+
+    import pyblish.plugin
+
+    class Repair(api.Action):
+        on = "failed"
+
+    class Inspect(api.Action):
+        def process(self, context, plugin):
+            assert False, "Inspect failed"
+
+    class Collect(api.ContextPlugin):
+        order = api.CollectorOrder
+
+        def process(self, context):
+            for name in ("A", "B"):
+                context.create_instance(name)
+
+    class Validate(api.InstancePlugin):
+        order = api.ValidatorOrder
+        actions = [Repair]
+
+        def process(self, instance):
+            assert instance.name != "B", "B failed"
+
+    class ValidateOther(api.ContextPlugin):
+        order = api.ValidatorOrder
+        actions = [Repair, Inspect]
+
+    context = util.publish(plugins=[Collect, Validate, ValidateOther])
+    results = context.data["results"]
+    A, B = context
+
+    assert_equals(len(results), 4)
+    assert_equals(results.by_plugin(Validate), results[1:3])
+    assert_equals(results.by_instance(B), [results[2]])
+    assert_equals(results.by_instance(None), [results[0], results[3]])
+    assert_equals(results.by_order(api.ValidatorOrder), results[1:])
+    assert_equals(results.failed(), [results[2]])
+
+    assert_equals(results.state(Validate),
+                  {"processed": 2, "failed": 1, "succeeded": 1})
+    assert results.is_available(Repair, Validate)
+    assert not results.is_available(Repair, ValidateOther)
+
+    # Results of actions are kept apart from their plug-in
+    pyblish.plugin.process(ValidateOther, context, action=Inspect.id)
+    assert_equals(results.actions(ValidateOther), [results[4]])
+    assert_equals(results.by_plugin(ValidateOther), [results[3]])
+    assert_equals(results.failed(), [results[2]])
+    assert not results.has_failed(ValidateOther)
+    assert not results.is_available(Repair, ValidateOther)
+
+    # Indexes follow changes other than appending
+    collected = results[0]
+    del results[2]
+    assert not results.has_failed()
+    assert_equals(results.by_plugin(Validate), [results[1]])
+
+    results[1:] = []
+    assert_equals(results.by_plugin(Validate), [])
+
+    results *= 0
+    assert_equals(results.by_plugin(Collect), [])
+
+    results.append(collected)
+    results.clear()
+    assert_equals(results.by_instance(None), [])
+
+
+@with_setup(lib.setup_empty, lib.teardown)
+def test_resource_usage():
+    """Results account for wall time, time computing and memory"""
+
+    import sys
+    import time
+
+    class Wait(api.ContextPlugin):
+        order = api.CollectorOrder
+
+        def process(self, context):
+            time.sleep(0.1)
+
+    class Compute(api.ContextPlugin):
+        order = api.ValidatorOrder
+
+        def process(self, context):
+            context.data["blob"] = list(range(10 ** 5))
+            context.data["sum"] = sum(n ** 2 for n in range(10 ** 5))
+
+    context = util.publish(plugins=[Wait, Compute])
+    waited, computed = context.data["results"]
+
+    assert waited["duration"] >= 100, waited["duration"]
+    assert computed["duration"] > 0
+
+    if sys.version_info >= (3, 7):
+        # A thread computes for no longer than it runs, give or
+        # take the resolution of its clock
+        resolution = time.get_clock_info("thread_time").resolution * 1000
+
+        for result in (waited, computed):
+            assert 0 <= result["threadTime"] <= \
+                result["duration"] + resolution, result
+            assert result["processTime"] >= 0, result
+
+    # Aggregated per plug-in, heaviest first
+    results = api.ResultStore()
+    results.append(dict(waited, duration=1.0))
+    results.append(dict(computed, duration=4.0))
+    results.append(dict(waited, duration=2.0))
+
+    assert_equals(results.usage(Wait)["duration"], 3.0)
+    assert_equals([plugin for plugin, _ in results.usages()],
+                  [Compute, Wait])
+
+    # Memory is measured once registered, whilst tracing
+    assert_equals(computed["memory"], None)
+
+    if sys.version_info >= (3, 9):
+        import tracemalloc
+
+        class ComputeParallel(Compute):
+            parallel = True
+
+        tracemalloc.start()
+
+        try:
+            context = util.publish(plugins=[Compute])
+            assert_equals(context.data["results"][0]["memory"], None)
+
+            api.register_profiling(memory=True)
+
+            # Independently of retention
+            api.register_retention(compact=True)
+            assert api.registered_profiling()["memory"]
+
+            context = util.publish(plugins=[Compute, ComputeParallel])
+        finally:
+            tracemalloc.stop()
+
+        computed, parallel = context.data["results"]
+
+        # A list of 10 ** 5 integers
+        assert computed["memory"] > 10 ** 5 * 8, computed["memory"]
+
+        # Parallel plug-ins would reset the peak of one another
+        assert_equals(parallel["memory"], None)